@@ -0,0 +1,93 @@
+"""Benchmark incremental rescans with a persistent `ScanCache`.
+
+Builds a synthetic tree (or uses `--root`), backdates its directories past
+the cache's racy window, and times a plain enumeration, a first run that
+fills the cache, and a warm run that replays it, including loading and
+saving the cache file. `--touch` directories are then modified to show that
+only they are rescanned::
+
+    python benchmarks/bench_cache.py --files 200000 --touch 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from path2map.scancache import ScanCache
+from path2map.traversal import TraversalOptions, iter_entries
+
+
+def _make_tree(root: Path, files: int, per_dir: int) -> list[Path]:
+    """Create `files` files, `per_dir` per leaf directory, two levels deep."""
+    leaves: list[Path] = []
+    created = 0
+    while created < files:
+        group = root / f"g{len(leaves) // per_dir:04d}"
+        leaf = group / f"d{len(leaves) % per_dir:04d}"
+        leaf.mkdir(parents=True)
+        leaves.append(leaf)
+        for index in range(min(per_dir, files - created)):
+            (leaf / f"file_{index:04d}.txt").touch()
+        created += per_dir
+    return leaves
+
+
+def _backdate(root: Path) -> None:
+    past = time.time_ns() - 3_600_000_000_000
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, ns=(past, past))
+
+
+def _timed_walk(root: Path, cache_path: Path | None) -> tuple[float, int, int]:
+    start = time.perf_counter()
+    cache = None if cache_path is None else ScanCache.load(cache_path)
+    count = sum(1 for _ in iter_entries(root, options=TraversalOptions(cache=cache)))
+    if cache is not None:
+        cache.save()
+    hits = 0 if cache is None else cache.hits
+    return time.perf_counter() - start, count, hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--per-dir", type=int, default=100)
+    parser.add_argument("--root", type=Path)
+    parser.add_argument("--touch", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        leaves: list[Path] = []
+        root = args.root
+        if root is None:
+            root = Path(tmp) / "tree"
+            root.mkdir()
+            leaves = _make_tree(root, args.files, args.per_dir)
+            _backdate(root)
+        cache_path = Path(tmp) / "scan.cache"
+
+        plain, count, _ = _timed_walk(root, None)
+        cold, _, _ = _timed_walk(root, cache_path)
+        warm, _, hits = _timed_walk(root, cache_path)
+        print(f"entries={count:,} directories cached={hits:,}")
+        print(f"no cache   {plain:8.3f} s")
+        print(f"cold cache {cold:8.3f} s")
+        print(f"warm cache {warm:8.3f} s  ({plain / warm:.1f}x faster)")
+
+        if leaves and args.touch:
+            step = max(1, len(leaves) // args.touch)
+            for leaf in leaves[::step][: args.touch]:
+                (leaf / "added.txt").touch()
+            changed, changed_count, hits = _timed_walk(root, cache_path)
+            print(
+                f"{args.touch} touched {changed:8.3f} s  "
+                f"(+{changed_count - count} entries, {hits:,} directories reused)"
+            )
+
+
+if __name__ == "__main__":
+    main()
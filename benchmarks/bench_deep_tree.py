@@ -0,0 +1,84 @@
+"""Benchmark traversal and rendering on deep, narrow synthetic trees.
+
+Builds a single chain of nested directories (one file per level) and reports
+the per-directory cost of traversal and of each tree renderer. Run it against
+two checkouts to compare implementations::
+
+    python benchmarks/bench_deep_tree.py --depth 800
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+from typing import Callable
+
+from path2map.model import TreeModel
+from path2map.render.html import render_html
+from path2map.render.json import render_json
+from path2map.render.text import TextRenderOptions, render_text
+from path2map.traversal import build_tree
+
+
+def _make_chain(root: Path, depth: int) -> None:
+    current = root
+    for _ in range(depth):
+        current = current / "d"
+        current.mkdir()
+        (current / "f.txt").write_text("x", encoding="utf-8")
+
+
+def _remove_chain(root: Path, depth: int) -> None:
+    # shutil.rmtree recurses per level; unwind the chain bottom-up instead.
+    for level in range(depth, 0, -1):
+        current = root.joinpath(*(["d"] * level))
+        (current / "f.txt").unlink()
+        current.rmdir()
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _run(root: Path, repeat: int) -> dict[str, float]:
+    model: TreeModel = build_tree(root)
+    return {
+        "traversal": _best_of(repeat, lambda: build_tree(root)),
+        "render_text": _best_of(
+            repeat,
+            lambda: render_text(model, options=TextRenderOptions(color="never")),
+        ),
+        "render_json": _best_of(repeat, lambda: render_json(model)),
+        "render_html": _best_of(repeat, lambda: render_html(model)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_chain(root, args.depth)
+        try:
+            timings = _run(root, args.repeat)
+        finally:
+            _remove_chain(root, args.depth)
+
+    print(f"depth={args.depth} directories={args.depth}")
+    for name, seconds in timings.items():
+        per_dir_us = seconds / args.depth * 1e6
+        print(f"{name:<12} {seconds * 1e3:9.2f} ms  {per_dir_us:8.2f} us/dir")
+
+
+if __name__ == "__main__":
+    main()
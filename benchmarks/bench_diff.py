@@ -0,0 +1,73 @@
+"""Benchmark Merkle tree diffs against the size of the change.
+
+Builds two synthetic object trees (no filesystem access) that differ in
+`--changes` files spread across the tree, then times hashing both trees
+and the comparison `diff_trees` runs on the digests separately. The
+comparison visits only the directories above changed files, so its time
+tracks `--changes`, not `--entries`::
+
+    python benchmarks/bench_diff.py --entries 1000000 --changes 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+from pathlib import Path
+import time
+from typing import Iterator
+
+from path2map.traversal import TraversedEntry, tree_from_entries
+from path2map.treediff import DiffStats, _diff_hashed, _hash_tree, _RecordFields
+
+
+def _entries(count: int, per_dir: int, changed: set[int]) -> Iterator[TraversedEntry]:
+    for index in range(count):
+        if index % per_dir == 0:
+            directory = f"dir{index // per_dir:06d}"
+            yield TraversedEntry(directory, directory, True, 1)
+        name = f"file_{index % per_dir:04d}.py"
+        size = index + 1 if index in changed else index
+        yield TraversedEntry(f"{directory}/{name}", name, False, 2, ".py", size=size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--per-dir", type=int, default=100)
+    parser.add_argument("--changes", type=int, default=100)
+    args = parser.parse_args()
+
+    step = max(1, args.entries // max(1, args.changes))
+    changed = set(range(0, args.entries, step)[: args.changes])
+    old, new = (
+        tree_from_entries(
+            scan_root=Path("/bench/root"),
+            entries=_entries(args.entries, args.per_dir, marked),
+            max_depth=None,
+        )
+        for marked in (set(), changed)
+    )
+
+    stats = DiffStats()
+    fields = _RecordFields(size=True, mtime=None, symlinks=True)
+    start = time.perf_counter()
+    old_hashed = _hash_tree(old.root, fields, stats)
+    new_hashed = _hash_tree(new.root, fields, stats)
+    hash_seconds = time.perf_counter() - start
+    # Settle the collection the digests would trigger during the comparison.
+    gc.collect()
+    start = time.perf_counter()
+    changes = _diff_hashed(old_hashed, new_hashed, fields, stats)
+    compare_seconds = time.perf_counter() - start
+
+    print(f"entries={args.entries:,} changes={len(changes):,}")
+    print(f"hash both trees {hash_seconds:8.3f} s  ({stats.hashed:,} nodes)")
+    print(
+        f"compare         {compare_seconds * 1e3:8.3f} ms  "
+        f"({stats.compared:,} node pairs visited)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark include filtering with ancestor retention as matches grow.
+
+Builds synthetic entry lists where every `.py` file matches `--filter
+'\\.py$'` and every module also holds a directory with no matches, the case
+that used to be checked against every match. Times
+`filter_entries_with_ancestors` at each size; a constant cost per entry
+across sizes shows linear scaling::
+
+    python benchmarks/bench_filter.py --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from path2map.filtering import FilterConfig, filter_entries_with_ancestors
+from path2map.ignore import PathEntry
+
+
+def _make_entries(files: int, per_dir: int) -> list[PathEntry]:
+    """Return preorder entries for `files` .py files, `per_dir` per directory."""
+    entries: list[PathEntry] = []
+    directories = (files + per_dir - 1) // per_dir
+    for index in range(directories):
+        group = f"pkg{index // per_dir:04d}"
+        if index % per_dir == 0:
+            entries.append(PathEntry(path=group, is_dir=True))
+        directory = f"{group}/mod{index % per_dir:04d}"
+        entries.append(PathEntry(path=directory, is_dir=True))
+        entries.append(PathEntry(path=f"{directory}/assets", is_dir=True))
+        entries.append(PathEntry(path=f"{directory}/assets/logo.png", is_dir=False))
+        count = min(per_dir, files - index * per_dir)
+        entries.extend(
+            PathEntry(path=f"{directory}/file_{item:04d}.py", is_dir=False)
+            for item in range(count)
+        )
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--per-dir", type=int, default=50)
+    args = parser.parse_args()
+
+    config = FilterConfig(filters=[r"\.py$"])
+    for size in args.sizes:
+        entries = _make_entries(size, args.per_dir)
+        start = time.perf_counter()
+        kept = filter_entries_with_ancestors(entries, config=config)
+        seconds = time.perf_counter() - start
+        per_entry_us = seconds / len(entries) * 1e6
+        print(
+            f"matches={size:>9} entries={len(entries):>9} kept={len(kept):>9}"
+            f"  {seconds:8.3f} s  {per_entry_us:6.2f} us/entry"
+        )
+
+
+if __name__ == "__main__":
+    main()
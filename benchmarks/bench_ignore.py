@@ -0,0 +1,81 @@
+"""Benchmark ignore-rule matching against a large `.p2mignore`.
+
+Generates `--rules` glob rules (with periodic negations) and times
+`IgnoreMatcher.matches` over `--paths` synthetic relative paths, next to the
+rule-by-rule reference `should_ignore_entry`::
+
+    python benchmarks/bench_ignore.py --rules 200 --paths 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from path2map.ignore import IgnoreMatcher, IgnoreRule, PathEntry, should_ignore_entry
+
+
+def _make_rules(count: int) -> list[IgnoreRule]:
+    shapes = ("*.tmp{0}", "cache{0}/", "/generated{0}/", "docs/*.draft{0}", "log{0}")
+    return [
+        IgnoreRule(
+            pattern=shapes[index % len(shapes)].format(index),
+            is_negation=index % 25 == 24,
+        )
+        for index in range(count)
+    ]
+
+
+def _make_paths(count: int, seed: int) -> list[tuple[str, bool]]:
+    rng = random.Random(seed)
+    names = ["src", "pkg", "build", "docs", "cache7", "tests", "a", "b", "log42"]
+    paths = []
+    for _ in range(count):
+        depth = rng.randint(1, 8)
+        parts = [rng.choice(names) for _ in range(depth - 1)]
+        is_dir = rng.random() < 0.2
+        parts.append(rng.choice(names) if is_dir else f"f{rng.randint(0, 99)}.py")
+        paths.append(("/".join(parts), is_dir))
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=200)
+    parser.add_argument("--paths", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rules = _make_rules(args.rules)
+    paths = _make_paths(args.paths, args.seed)
+    matcher = IgnoreMatcher(p2mignore_rules=rules)
+
+    start = time.perf_counter()
+    compiled = [matcher.matches(path, is_dir) for path, is_dir in paths]
+    matcher_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = [
+        should_ignore_entry(
+            PathEntry(path=path, is_dir=is_dir),
+            use_default_ignores=True,
+            p2mignore_rules=rules,
+            cli_ignore_patterns=[],
+        )
+        for path, is_dir in paths
+    ]
+    reference_seconds = time.perf_counter() - start
+
+    assert compiled == reference
+    print(f"rules={args.rules} paths={args.paths} ignored={sum(compiled)}")
+    for name, seconds in (
+        ("IgnoreMatcher", matcher_seconds),
+        ("should_ignore_entry", reference_seconds),
+    ):
+        per_path_us = seconds / args.paths * 1e6
+        print(f"{name:<20} {seconds:8.3f} s  {per_path_us:8.2f} us/path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark indexed path lookups against linear preorder scans.
+
+Builds a synthetic tree in memory (no filesystem access), then times path
+lookups done by scanning `iter_preorder` against `TreeModel.find`, including
+the one-off index build, plus prefix queries and subtree extraction::
+
+    python benchmarks/bench_index.py --entries 1000000 --lookups 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import random
+import time
+
+from path2map.model import TreeModel
+from path2map.traversal import TraversedEntry, tree_from_entries
+
+
+def _build(count: int, per_dir: int) -> TreeModel:
+    entries: list[TraversedEntry] = []
+    for index in range(count):
+        if index % per_dir == 0:
+            directory = f"dir{index // per_dir:05d}"
+            entries.append(TraversedEntry(directory, directory, True, 1))
+        name = f"file_{index:07d}.py"
+        entries.append(
+            TraversedEntry(f"{directory}/{name}", name, False, 2, ".py", size=index)
+        )
+    return tree_from_entries(
+        scan_root=Path("/bench/root"), entries=entries, max_depth=None
+    )
+
+
+def _report(label: str, seconds: float, queries: int) -> None:
+    print(f"{label:<14} {seconds:9.4f} s  {seconds / queries * 1e6:12.2f} us/query")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--per-dir", type=int, default=100)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--scans", type=int, default=5)
+    args = parser.parse_args()
+
+    model = _build(args.entries, args.per_dir)
+    rng = random.Random(0)
+    targets = [
+        f"dir{index // args.per_dir:05d}/file_{index:07d}.py"
+        for index in (rng.randrange(args.entries) for _ in range(args.lookups))
+    ]
+
+    start = time.perf_counter()
+    for target in targets[: args.scans]:
+        next(node for node in model.iter_preorder() if node.path == target)
+    _report("linear scan", time.perf_counter() - start, args.scans)
+
+    start = time.perf_counter()
+    model.find(".")
+    _report("index build", time.perf_counter() - start, 1)
+
+    start = time.perf_counter()
+    for target in targets:
+        model.find(target)
+    _report("find", time.perf_counter() - start, len(targets))
+
+    prefixes = [target.rpartition("/")[0] + "/" for target in targets]
+    start = time.perf_counter()
+    for prefix in prefixes:
+        model.paths_with_prefix(prefix)
+    _report("prefix", time.perf_counter() - start, len(prefixes))
+
+    start = time.perf_counter()
+    for prefix in prefixes:
+        model.subtree(prefix)
+    _report("subtree", time.perf_counter() - start, len(prefixes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the deferred metadata stage with and without stat prefetch.
+
+Enumerates `--directory` (or a synthetic tree of `--files` files), then
+attaches size and mtime with one thread and with `--stat-workers` threads.
+Stat latency dominates on network mounts, so point it at one to see the
+prefetch pay off::
+
+    python benchmarks/bench_metadata.py --directory /mnt/nfs/project --stat-workers 16
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+from path2map.traversal import (
+    MetadataStats,
+    TraversedEntry,
+    attach_metadata,
+    iter_entries,
+)
+
+
+def _make_tree(root: Path, files: int, per_dir: int) -> None:
+    for index in range(files):
+        directory = root / f"d{index // per_dir:05d}"
+        directory.mkdir(exist_ok=True)
+        (directory / f"file_{index:06d}.txt").write_bytes(b"x" * (index % 97))
+
+
+def _run(
+    root: Path, entries: list[TraversedEntry], workers: int
+) -> tuple[float, MetadataStats]:
+    stats = MetadataStats()
+    start = time.perf_counter()
+    for _ in attach_metadata(root, entries, workers=workers, stats=stats):
+        pass
+    return time.perf_counter() - start, stats
+
+
+def _report(label: str, seconds: float, stats: MetadataStats) -> None:
+    print(
+        f"{label:<12} {seconds:8.3f} s  {stats.files / seconds:12,.0f} files/s  "
+        f"stat {stats.stat_seconds:8.3f} s  saved {stats.saved_seconds:8.3f} s"
+    )
+
+
+def _measure(root: Path, stat_workers: int) -> None:
+    entries = list(iter_entries(root))
+    print(f"entries={len(entries)}")
+    _report("sequential", *_run(root, entries, 1))
+    _report(f"workers={stat_workers}", *_run(root, entries, stat_workers))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--directory", type=Path)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--per-dir", type=int, default=100)
+    parser.add_argument("--stat-workers", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.directory is not None:
+        _measure(args.directory, args.stat_workers)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        root.mkdir()
+        _make_tree(root, args.files, args.per_dir)
+        try:
+            _measure(root, args.stat_workers)
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
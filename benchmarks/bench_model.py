@@ -0,0 +1,107 @@
+"""Benchmark memory and build time of the object and columnar tree models.
+
+Feeds pre-built synthetic traversal records (no filesystem access) into each model
+builder and reports the memory the finished tree retains, measured with
+tracemalloc, plus build and render-walk times. The `validated` row builds
+the object model with per-node debug checks enabled::
+
+    python benchmarks/bench_model.py --entries 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+from path2map.columnar import columnar_tree_from_entries
+from path2map.model import TreeView
+from path2map.timefmt import ns_from_datetime
+from path2map.traversal import TraversedEntry, tree_from_entries
+
+_SCAN_ROOT = Path("/bench/root")
+
+
+def _entries(count: int, per_dir: int, depth: int) -> Iterator[TraversedEntry]:
+    """Yield preorder records: `depth` nested directory levels, files at leaves."""
+    mtime_ns = ns_from_datetime(datetime(2026, 1, 2, 3, 4, 5))
+    emitted = 0
+    previous: list[str] = []
+    leaf = 0
+    while emitted < count:
+        parts = [
+            f"dir{leaf // per_dir ** (depth - 1 - level) % per_dir:03d}"
+            for level in range(depth)
+        ]
+        # Open every directory level that differs from the previous leaf.
+        for level in range(depth):
+            if parts[: level + 1] != previous[: level + 1]:
+                yield TraversedEntry(
+                    "/".join(parts[: level + 1]), parts[level], True, level + 1
+                )
+                emitted += 1
+        prefix = "/".join(parts)
+        for index in range(min(per_dir, max(count - emitted, 0))):
+            name = f"file_{index:04d}.py"
+            yield TraversedEntry(
+                f"{prefix}/{name}",
+                name,
+                False,
+                depth + 1,
+                ".py",
+                size=index,
+                mtime_ns=mtime_ns,
+            )
+            emitted += 1
+        previous = parts
+        leaf += 1
+
+
+def _measure(
+    label: str,
+    build: Callable[..., TreeView],
+    entries: list[TraversedEntry],
+) -> None:
+    # Timed without tracing, whose per-allocation hooks dwarf the build.
+    start = time.perf_counter()
+    model = build(scan_root=_SCAN_ROOT, entries=entries, max_depth=None)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    nodes = sum(1 for _ in model.iter_preorder())
+    walk_seconds = time.perf_counter() - start
+    del model
+
+    tracemalloc.start()
+    model = build(scan_root=_SCAN_ROOT, entries=entries, max_depth=None)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Held until measured so its memory counts as retained.
+    del model
+    print(
+        f"{label:<9} nodes={nodes:>9,}  retained {retained / 2**20:8.1f} MiB  "
+        f"({retained / nodes:5.0f} B/node)  build {build_seconds:6.2f} s  "
+        f"walk {walk_seconds:6.2f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--per-dir", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=3)
+    args = parser.parse_args()
+
+    # Records are materialized up front so builds are timed on their own.
+    entries = list(_entries(args.entries, args.per_dir, args.depth))
+    _measure("validated", partial(tree_from_entries, validate=True), entries)
+    _measure("objects", tree_from_entries, entries)
+    _measure("columnar", columnar_tree_from_entries, entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Micro-benchmark repeated regex values: per-pattern, combined and bulk.
+
+Times `--patterns` filter-style regexes over `--paths` synthetic relative
+paths three ways: `any(p.search(path))` per path, one combined alternation
+per path (`PatternSet.search`), and one scan of a newline-joined buffer
+(`PatternSet.search_many`)::
+
+    python benchmarks/bench_patterns.py --patterns 30 --paths 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from typing import Any, Callable
+
+from path2map.patterns import PatternSet
+
+_FAMILIES = {
+    # Extension filters, as build scripts typically pass them.
+    "suffix": (r"\.ext{0}$",),
+    # A mix including `^`-anchored values, which defeat prefix scanning.
+    "mixed": (
+        r"\.ext{0}$",
+        r"^module{0}/",
+        r"/test_{0}_",
+        r"build{0}",
+        r"^docs/v{0}\.",
+    ),
+}
+
+
+def _make_patterns(family: str, count: int) -> list[str]:
+    shapes = _FAMILIES[family]
+    return [shapes[index % len(shapes)].format(index) for index in range(count)]
+
+
+def _make_paths(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    names = ["src", "pkg", "module3", "docs", "tests", "core", "util", "build12"]
+    return [
+        "/".join(rng.choice(names) for _ in range(rng.randint(0, 6)))
+        + f"/file_{rng.randint(0, 999)}.ext{rng.randint(0, 60)}"
+        for _ in range(count)
+    ]
+
+
+def _time(func: Callable[..., list[bool]], *args: Any) -> tuple[float, list[bool]]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def _search_each(compiled: list[re.Pattern[str]], paths: list[str]) -> list[bool]:
+    return [any(pattern.search(path) for pattern in compiled) for path in paths]
+
+
+def _search_set(pattern_set: PatternSet, paths: list[str]) -> list[bool]:
+    return [pattern_set.search(path) for path in paths]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patterns", type=int, default=30)
+    parser.add_argument("--paths", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = _make_paths(args.paths, args.seed)
+    print(f"patterns={args.patterns} paths={args.paths}")
+    for family in _FAMILIES:
+        compiled = [
+            re.compile(value) for value in _make_patterns(family, args.patterns)
+        ]
+        pattern_set = PatternSet(tuple(compiled))
+        timings = {
+            "any(search)": _time(_search_each, compiled, paths),
+            "PatternSet.search": _time(_search_set, pattern_set, paths),
+            "search_many": _time(pattern_set.search_many, paths),
+        }
+
+        expected = timings["any(search)"][1]
+        assert all(result == expected for _, result in timings.values())
+        print(f"[{family}] matched={sum(expected)}")
+        for name, (seconds, _) in timings.items():
+            per_path_us = seconds / args.paths * 1e6
+            print(f"  {name:<18} {seconds:8.3f} s  {per_path_us:6.2f} us/path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark per-entry overhead of the selection stage on traversal records.
+
+Feeds synthetic in-memory `TraversedEntry` records (no filesystem access)
+through the ignore hook and the include filter, so the numbers isolate the
+pipeline's own cost per entry::
+
+    python benchmarks/bench_pipeline.py --entries 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from path2map.filtering import compile_filter_patterns
+from path2map.ignore import IgnoreMatcher, IgnoreRule
+from path2map.patterns import PatternSet
+from path2map.selection import SelectionStage
+from path2map.traversal import TraversedEntry
+
+_P2MIGNORE = [
+    "*.pyc",
+    "*.log",
+    "coverage/",
+    "/docs/_build/",
+    "tmp*/",
+    "!keep.log",
+    "*.egg-info/",
+    "docs/*.draft",
+]
+
+
+def _make_entries(count: int) -> list[TraversedEntry]:
+    """Return preorder records: groups of packages holding 50 files each."""
+    entries: list[TraversedEntry] = []
+    group = 0
+    while len(entries) < count:
+        top = f"pkg{group:04d}"
+        entries.append(TraversedEntry(top, top, True, 1))
+        for module in range(20):
+            name = f"mod{module:02d}"
+            directory = f"{top}/{name}"
+            entries.append(TraversedEntry(directory, name, True, 2))
+            for index in range(50):
+                suffix = (".py", ".txt", ".log", ".md")[index % 4]
+                file_name = f"file_{index:02d}{suffix}"
+                entries.append(
+                    TraversedEntry(
+                        f"{directory}/{file_name}", file_name, False, 3, suffix
+                    )
+                )
+        group += 1
+    return entries[:count]
+
+
+def _per_entry_ns(entries: list[TraversedEntry], func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / len(entries) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=500_000)
+    args = parser.parse_args()
+
+    entries = _make_entries(args.entries)
+    rules = [
+        IgnoreRule(pattern=line.lstrip("!"), is_negation=line.startswith("!"))
+        for line in _P2MIGNORE
+    ]
+    stage = SelectionStage(
+        ignore=IgnoreMatcher(p2mignore_rules=rules),
+        filters=PatternSet(tuple(compile_filter_patterns([r"\.py$", r"^pkg0001/"]))),
+    )
+
+    def ignore_and_filter() -> list[TraversedEntry]:
+        exclude = stage.exclude
+        survivors = (e for e in entries if not exclude(e.path, e.is_dir))
+        return list(stage.select(survivors))
+
+    timings = {
+        "iterate only": _per_entry_ns(entries, lambda: list(entries)),
+        "ignore (exclude)": _per_entry_ns(
+            entries, lambda: [stage.exclude(e.path, e.is_dir) for e in entries]
+        ),
+        "filter (select)": _per_entry_ns(entries, lambda: list(stage.select(entries))),
+        "ignore + filter": _per_entry_ns(entries, ignore_and_filter),
+    }
+
+    print(f"entries={len(entries)} p2mignore_rules={len(rules)} filters=2")
+    for name, nanoseconds in timings.items():
+        print(f"{name:<18} {nanoseconds:8.0f} ns/entry")
+
+
+if __name__ == "__main__":
+    main()
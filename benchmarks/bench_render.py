@@ -0,0 +1,95 @@
+"""Benchmark renderer throughput on a synthetic tree with size and mtime details.
+
+Builds an in-memory tree (no filesystem access) whose files carry sizes and
+modification times, then times each renderer. Timestamp formatting dominates
+detail-heavy output, so compare runs across `--time-format` precisions::
+
+    python benchmarks/bench_render.py --entries 200000 --time-format "%Y-%m-%d %H:%M"
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+from pathlib import Path
+import time
+from typing import Callable
+
+from path2map.model import TreeView
+from path2map.render.csv import CsvRenderOptions, render_csv
+from path2map.render.json import JsonRenderOptions, render_json
+from path2map.render.text import TextRenderOptions, render_text
+from path2map.timefmt import ns_from_datetime
+from path2map.traversal import TraversedEntry, tree_from_entries
+
+
+def _build(count: int, per_dir: int) -> TreeView:
+    base_ns = ns_from_datetime(datetime(2026, 1, 2, 3, 4, 5))
+    entries: list[TraversedEntry] = []
+    for index in range(count):
+        if index % per_dir == 0:
+            directory = f"dir{index // per_dir:05d}"
+            entries.append(TraversedEntry(directory, directory, True, 1))
+        name = f"file_{index:06d}.py"
+        entries.append(
+            TraversedEntry(
+                f"{directory}/{name}",
+                name,
+                False,
+                2,
+                ".py",
+                size=index,
+                # Spread over roughly a month, as in a real source tree.
+                mtime_ns=base_ns + index * 13_000_000_007,
+            )
+        )
+    return tree_from_entries(
+        scan_root=Path("/bench/root"), entries=entries, max_depth=None
+    )
+
+
+def _time(label: str, render: Callable[[], str], files: int) -> None:
+    start = time.perf_counter()
+    render()
+    seconds = time.perf_counter() - start
+    print(f"{label:<6} {seconds:8.3f} s  {files / seconds:12,.0f} files/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--per-dir", type=int, default=100)
+    parser.add_argument("--time-format", default="%Y-%m-%d %H:%M")
+    args = parser.parse_args()
+
+    model = _build(args.entries, args.per_dir)
+    details = "size,mtime"
+    time_format = args.time_format
+    _time(
+        "text",
+        lambda: render_text(
+            model,
+            options=TextRenderOptions(
+                color="never", details=details, time_format=time_format
+            ),
+        ),
+        args.entries,
+    )
+    _time(
+        "json",
+        lambda: render_json(
+            model, options=JsonRenderOptions(details=details, time_format=time_format)
+        ),
+        args.entries,
+    )
+    _time(
+        "csv",
+        lambda: render_csv(
+            model, options=CsvRenderOptions(details=details, time_format=time_format)
+        ),
+        args.entries,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark binary snapshot size and reload time against JSON output.
+
+Builds a synthetic columnar tree (no filesystem access), saves it with
+`write_snapshot`, and reports the snapshot and JSON sizes along with the
+time `read_snapshot` takes to bring the tree back. It then maps the file with
+`open_snapshot` and times a path lookup and a walk pruned to one directory,
+which read only that directory's nodes. The run fails if the reload takes
+longer than `--read-budget` seconds per million nodes::
+
+    python benchmarks/bench_snapshot.py --entries 2000000
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+from typing import Iterator
+
+from path2map.columnar import columnar_tree_from_entries
+from path2map.render.json import JsonRenderOptions, render_json
+from path2map.filtering import compile_descend_predicate
+from path2map.snapshot import (
+    iter_snapshot_entries,
+    open_snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+from path2map.traversal import TraversedEntry
+
+
+def _entries(count: int, per_dir: int) -> Iterator[TraversedEntry]:
+    mtime_ns = 1_767_000_000_000_000_000
+    for index in range(count):
+        if index % per_dir == 0:
+            directory = f"dir{index // per_dir:06d}"
+            yield TraversedEntry(directory, directory, True, 1)
+        name = f"file_{index % per_dir:04d}.py"
+        yield TraversedEntry(
+            f"{directory}/{name}",
+            name,
+            False,
+            2,
+            ".py",
+            size=index,
+            mtime_ns=mtime_ns + index,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2_000_000)
+    parser.add_argument("--per-dir", type=int, default=100)
+    parser.add_argument("--skip-json", action="store_true")
+    parser.add_argument(
+        "--read-budget",
+        type=float,
+        default=0.3,
+        help="maximum read_snapshot seconds per million nodes",
+    )
+    args = parser.parse_args()
+
+    model = columnar_tree_from_entries(
+        scan_root=Path("/bench/root"),
+        entries=_entries(args.entries, args.per_dir),
+        max_depth=None,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "scan.p2m"
+        start = time.perf_counter()
+        write_snapshot(model, target)
+        write_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = read_snapshot(target)
+        read_seconds = time.perf_counter() - start
+        size = target.stat().st_size
+
+        start = time.perf_counter()
+        view = open_snapshot(target)
+        open_seconds = time.perf_counter() - start
+        middle = f"dir{args.entries // args.per_dir // 2:06d}"
+        start = time.perf_counter()
+        view.find(f"{middle}/file_0000.py")
+        find_seconds = time.perf_counter() - start
+        descend = compile_descend_predicate([f"^{middle}/"])
+        start = time.perf_counter()
+        visited = sum(1 for _ in iter_snapshot_entries(view, descend=descend))
+        walk_seconds = time.perf_counter() - start
+        view.close()
+
+    print(f"nodes={len(loaded):,}")
+    print(
+        f"snapshot {size / 2**20:9.1f} MiB  write {write_seconds:6.3f} s  "
+        f"read {read_seconds:6.3f} s"
+    )
+    print(
+        f"mapped   open {open_seconds * 1e3:8.3f} ms  find "
+        f"{find_seconds * 1e3:8.3f} ms  pruned walk {walk_seconds:6.3f} s "
+        f"({visited:,} entries)"
+    )
+    budget = args.read_budget * len(loaded) / 1e6
+    assert (
+        read_seconds <= budget
+    ), f"read_snapshot took {read_seconds:.3f} s, budget {budget:.3f} s"
+    if not args.skip_json:
+        text = render_json(model, options=JsonRenderOptions(details="size,mtime"))
+        json_size = len(text.encode("utf-8"))
+        print(
+            f"json     {json_size / 2**20:9.1f} MiB  "
+            f"({size / json_size:.1%} of JSON)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark raw traversal throughput on a wide synthetic tree.
+
+Builds a tree of `--files` empty files spread over nested directories and
+reports entries per second for a full enumeration. Run it against two
+checkouts to compare implementations::
+
+    python benchmarks/bench_traversal.py --files 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import shutil
+import tempfile
+import time
+
+from path2map.traversal import enumerate_entries
+
+
+def _make_tree(root: Path, files: int, per_dir: int) -> int:
+    """Create `files` files, `per_dir` per leaf directory, two levels deep."""
+    directories = 0
+    created = 0
+    while created < files:
+        group = root / f"g{directories // per_dir:04d}"
+        leaf = group / f"d{directories % per_dir:04d}"
+        leaf.mkdir(parents=True)
+        directories += 1
+        for index in range(min(per_dir, files - created)):
+            (leaf / f"file_{index:04d}.txt").touch()
+        created += per_dir
+    return directories
+
+
+def _best_of(repeat: int, root: Path) -> tuple[float, int]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(enumerate_entries(root)[1])
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--per-dir", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        root.mkdir()
+        _make_tree(root, args.files, args.per_dir)
+        try:
+            seconds, count = _best_of(args.repeat, root)
+        finally:
+            shutil.rmtree(root)
+
+    print(f"files={args.files} entries={count}")
+    print(f"traversal {seconds:9.3f} s  {count / seconds:12,.0f} entries/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,34 @@
 from __future__ import annotations
 
 import argparse
+from datetime import datetime
+from pathlib import Path
+import sys
 from typing import Sequence
 
 from path2map import __version__
+from path2map.filtering import parse_size, parse_time_threshold
+from path2map.model import TreeView
 from path2map.output import OutputOptions, route_output
-from path2map.pipeline import PipelineOptions, build_logical_tree
+from path2map.pipeline import (
+    PipelineOptions,
+    build_columnar_tree,
+    build_logical_tree,
+)
 from path2map.render.csv import CsvRenderOptions, render_csv
+from path2map.render.diff import (
+    DiffRenderOptions,
+    render_diff_csv,
+    render_diff_json,
+    render_diff_text,
+)
 from path2map.render.html import HtmlRenderOptions, render_html
 from path2map.render.json import JsonRenderOptions, render_json
 from path2map.render.markdown import render_markdown
 from path2map.render.text import TextRenderOptions, render_text
+from path2map.snapshot import is_snapshot, write_snapshot
+from path2map.traversal import MetadataStats
+from path2map.treediff import diff_trees
 
 _HELP_EPILOG = """Examples:
   path2map --directory .
@@ -20,6 +38,17 @@ _HELP_EPILOG = """Examples:
   path2map --directory . --filter "\\.py$" --ignore "^build/"
   path2map --directory . --type json --output tree.json
   path2map --directory . --type md --output tree.md --stdout
+  path2map --directory . --save-snapshot scan.p2m
+  path2map --directory . --cache ../scan.cache
+  path2map --from-snapshot scan.p2m --filter "^src/"
+  path2map --from tree.json --type html --folders-only
+  path2map diff release-1.0.p2m . --details size
+"""
+
+_DIFF_HELP_EPILOG = """Examples:
+  path2map diff old-checkout new-checkout
+  path2map diff release-1.0.p2m . --details size,mtime
+  path2map diff before.json after.json --type csv --output drift.csv
 """
 
 
@@ -29,6 +58,30 @@ class _HelpFormatter(
     """Formatter that preserves epilog layout and shows argument defaults."""
 
 
+def _size_argument(value: str) -> int:
+    try:
+        return parse_size(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def _positive_int_argument(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _time_argument(value: str) -> datetime:
+    try:
+        return parse_time_threshold(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
 def build_parser() -> argparse.ArgumentParser:
     """Create the CLI argument parser."""
     parser = argparse.ArgumentParser(
@@ -45,6 +98,27 @@ def build_parser() -> argparse.ArgumentParser:
         default=".",
         help="Root directory to scan.",
     )
+    parser.add_argument(
+        "--from",
+        dest="source",
+        metavar="PATH",
+        help=(
+            "Render a saved snapshot or a path2map JSON or CSV export instead "
+            "of scanning --directory. Ignore rules, filters, --max-depth, and "
+            "--details apply in memory; JSON and CSV mtimes are read with "
+            "--time-format. .p2mignore is read from the snapshot's scan root, "
+            "or from --directory for JSON and CSV exports, which do not "
+            "record where they were scanned."
+        ),
+    )
+    parser.add_argument(
+        "--from-snapshot",
+        metavar="PATH",
+        help=(
+            "Render a snapshot saved with --save-snapshot instead of scanning "
+            "--directory. Ignore rules, filters, and --max-depth still apply."
+        ),
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -58,6 +132,14 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Also print rendered output to stdout when writing to --output.",
     )
+    parser.add_argument(
+        "--save-snapshot",
+        metavar="PATH",
+        help=(
+            "Also save the scanned tree as a binary snapshot that can be "
+            "reloaded without rescanning."
+        ),
+    )
     parser.add_argument(
         "-D",
         "--max-depth",
@@ -74,6 +156,59 @@ def build_parser() -> argparse.ArgumentParser:
         choices=("skip", "show", "follow"),
         help="Symlink behavior: skip links, show links, or follow links.",
     )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int_argument,
+        default=1,
+        help=(
+            "Number of threads used to scan directories concurrently. "
+            "Output order is unchanged."
+        ),
+    )
+    parser.add_argument(
+        "--worker-mode",
+        choices=("thread", "process"),
+        default="thread",
+        help=(
+            "How --workers parallelize scanning: threads overlap directory "
+            "reads; processes scan whole subtrees in parallel."
+        ),
+    )
+    parser.add_argument(
+        "--stat-workers",
+        type=_positive_int_argument,
+        default=1,
+        help=(
+            "Number of threads issuing stat calls for --details metadata. "
+            "Output order is unchanged."
+        ),
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help=(
+            "Report scan statistics on stderr, such as the time spent on "
+            "--details stat calls and how much of it --stat-workers saved."
+        ),
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help=(
+            "Keep directory listings in this file and reuse them on later runs "
+            "for directories whose mtime is unchanged. File details are always "
+            "read fresh."
+        ),
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help=(
+            "Hold the scanned tree in compact parallel arrays, lowering memory "
+            "on multi-million-entry scans."
+        ),
+    )
     parser.add_argument(
         "-i",
         "--ignore",
@@ -86,6 +221,32 @@ def build_parser() -> argparse.ArgumentParser:
         default=[],
         help="Regex include filter (repeatable; OR logic). Ancestors are retained.",
     )
+    parser.add_argument(
+        "--min-size",
+        type=_size_argument,
+        help="Only include files at least this large (e.g. 100M, 20MB, 1.5GiB).",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=_size_argument,
+        help="Only include files at most this large.",
+    )
+    parser.add_argument(
+        "--newer-than",
+        type=_time_argument,
+        help=(
+            "Only include files modified within this age (e.g. 12h, 7d, 2w) "
+            "or since this ISO date."
+        ),
+    )
+    parser.add_argument(
+        "--older-than",
+        type=_time_argument,
+        help=(
+            "Only include files not modified within this age (e.g. 180d) "
+            "or before this ISO date."
+        ),
+    )
     parser.add_argument(
         "-f",
         "--folders-only",
@@ -158,12 +319,103 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def build_diff_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for `path2map diff`."""
+    parser = argparse.ArgumentParser(
+        prog="path2map diff",
+        description=(
+            "Compare two directories, snapshots, or JSON/CSV exports and list "
+            "the entries added, removed, or modified between them."
+        ),
+        epilog=_DIFF_HELP_EPILOG,
+        formatter_class=_HelpFormatter,
+    )
+    parser.add_argument("old", help="Directory or saved tree to compare from.")
+    parser.add_argument("new", help="Directory or saved tree to compare to.")
+    parser.add_argument(
+        "--details",
+        choices=("none", "size", "mtime", "size,mtime"),
+        default="none",
+        help="File metadata that counts as a modification and is shown.",
+    )
+    parser.add_argument(
+        "--time-format",
+        default="%Y-%m-%d %H:%M",
+        help="strftime format for rendered mtimes and for reading JSON/CSV inputs.",
+    )
+    parser.add_argument(
+        "--size-format",
+        choices=("binary", "decimal"),
+        default="binary",
+        help="Size units in text output.",
+    )
+    parser.add_argument(
+        "-D",
+        "--max-depth",
+        type=int,
+        help="Compare only entries up to this depth.",
+    )
+    parser.add_argument(
+        "-i",
+        "--ignore",
+        help="Regex exclusion applied to both trees.",
+    )
+    parser.add_argument(
+        "-F",
+        "--filter",
+        action="append",
+        default=[],
+        help="Regex include filter applied to both trees (repeatable).",
+    )
+    parser.add_argument(
+        "-t",
+        "--type",
+        choices=("text", "json", "csv"),
+        default="text",
+        help="Output format.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Output file path or output directory.",
+    )
+    parser.add_argument(
+        "--stdout",
+        action="store_true",
+        help="Also print the diff to stdout when writing to --output.",
+    )
+    parser.add_argument(
+        "--exit-code",
+        action="store_true",
+        help="Exit with status 1 when the trees differ.",
+    )
+    return parser
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     """Run the CLI and return a process exit code."""
+    arguments = list(sys.argv[1:] if argv is None else argv)
+    if arguments[:1] == ["diff"]:
+        return _diff_main(arguments[1:])
+
     parser = build_parser()
-    args = parser.parse_args(argv)
+    args = parser.parse_args(arguments)
+    if args.source is not None and args.from_snapshot is not None:
+        parser.error("--from and --from-snapshot cannot be combined")
+    from_file = args.source is not None or args.from_snapshot is not None
+    if from_file and any(
+        bound is not None
+        for bound in (args.min_size, args.max_size, args.newer_than, args.older_than)
+    ):
+        parser.error("size and time filters require a directory scan")
+    if from_file and args.cache is not None:
+        parser.error("--cache requires a directory scan")
+    if args.cache is not None and args.workers > 1 and args.worker_mode == "process":
+        parser.error("--cache cannot be combined with --worker-mode process")
 
-    model = build_logical_tree(
+    build = build_columnar_tree if args.columnar else build_logical_tree
+    stats = MetadataStats()
+    model: TreeView = build(
         PipelineOptions(
             directory=args.directory,
             max_depth=args.max_depth,
@@ -171,9 +423,31 @@ def main(argv: Sequence[str] | None = None) -> int:
             symlinks=args.symlinks,
             cli_ignore=args.ignore,
             filters=args.filter,
+            min_size=args.min_size,
+            max_size=args.max_size,
+            newer_than=args.newer_than,
+            older_than=args.older_than,
             details=args.details,
-        )
+            workers=args.workers,
+            worker_mode=args.worker_mode,
+            stat_workers=args.stat_workers,
+            snapshot=args.from_snapshot,
+            source=args.source,
+            time_format=args.time_format,
+            cache=args.cache,
+        ),
+        stats=stats,
     )
+    if args.verbose and stats.files:
+        print(
+            f"stat: {stats.files} files, {stats.stat_seconds:.3f} s in stat calls, "
+            f"{stats.wait_seconds:.3f} s waited, "
+            f"{stats.saved_seconds:.3f} s saved by --stat-workers",
+            file=sys.stderr,
+        )
+
+    if args.save_snapshot is not None:
+        write_snapshot(model, args.save_snapshot)
 
     text_options = TextRenderOptions(
         folders_only=args.folders_only,
@@ -235,5 +509,68 @@ def main(argv: Sequence[str] | None = None) -> int:
     return 0
 
 
+def _diff_main(argv: Sequence[str]) -> int:
+    parser = build_diff_parser()
+    args = parser.parse_args(argv)
+    for path in (args.old, args.new):
+        if not Path(path).exists():
+            parser.error(f"no such file or directory: {path}")
+
+    old, new = (
+        build_logical_tree(
+            PipelineOptions(
+                directory=path if Path(path).is_dir() else ".",
+                source=None if Path(path).is_dir() else path,
+                # Snapshots read `.p2mignore` from their recorded scan root;
+                # exports record none, and the working directory's rules
+                # would otherwise apply to both sides.
+                p2mignore_enabled=Path(path).is_dir() or is_snapshot(path),
+                max_depth=args.max_depth,
+                cli_ignore=args.ignore,
+                filters=args.filter,
+                details=args.details,
+                time_format=args.time_format,
+            )
+        )
+        for path in (args.old, args.new)
+    )
+    # JSON and CSV exports drop symlink markers and keep mtimes only to the
+    # precision of --time-format, so records are compared at that fidelity.
+    with_export = any(
+        not Path(path).is_dir() and not is_snapshot(path)
+        for path in (args.old, args.new)
+    )
+    changes = diff_trees(
+        old,
+        new,
+        details=args.details,
+        compare_symlinks=not with_export,
+        mtime_format=args.time_format if with_export else None,
+    )
+
+    options = DiffRenderOptions(
+        details=args.details,
+        time_format=args.time_format,
+        size_format=args.size_format,
+    )
+    if args.type == "json":
+        rendered = render_diff_json(changes, options=options)
+    elif args.type == "csv":
+        rendered = render_diff_csv(changes, options=options)
+    else:
+        rendered = render_diff_text(changes, options=options)
+
+    route_output(
+        rendered,
+        options=OutputOptions(
+            output_type=args.type,
+            output_path=args.output,
+            stdout=args.stdout,
+        ),
+    )
+
+    return 1 if args.exit_code and changes else 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
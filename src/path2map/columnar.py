@@ -0,0 +1,369 @@
+"""Columnar, array-backed tree model for multi-million-node scans."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from path2map.model import NodeType, NodeView, TreeView
+from path2map.timefmt import datetime_from_ns, ns_from_datetime
+from path2map.traversal import TraversedEntry
+
+# Bits of `ColumnarTreeModel.flags`.
+_DIRECTORY = 1
+_SYMLINK = 2
+_SYMLINK_CYCLE = 4
+_HAS_SIZE = 8
+_HAS_MTIME = 16
+
+_NO_NODE = -1
+
+
+class ColumnarColumns:
+    """Read-only traversal over parallel node columns.
+
+    Subclasses provide the storage: `ColumnarTreeModel` keeps growable
+    arrays, while `path2map.snapshot.SnapshotView` exposes columns of a
+    memory-mapped file. Node views and preorder walks only index the
+    columns, so both backings share them.
+    """
+
+    __slots__ = ()
+
+    scan_root: str
+    max_depth: int | None
+    strings: Sequence[str]
+    parents: Sequence[int]
+    first_children: Sequence[int]
+    next_siblings: Sequence[int]
+    depths: Sequence[int]
+    name_ids: Sequence[int]
+    ext_ids: Sequence[int]
+    flags: Sequence[int]
+    sizes: Sequence[int]
+    mtimes_ns: Sequence[int]
+    symlink_targets: dict[int, str]
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    @property
+    def root(self) -> ColumnarNode:
+        """Return a view of the root node."""
+        return ColumnarNode(self, 0)
+
+    def node(self, index: int) -> ColumnarNode:
+        """Return a view of the node stored at `index`."""
+        if not 0 <= index < len(self.parents):
+            raise IndexError("node index out of range")
+        return ColumnarNode(self, index)
+
+    def iter_preorder(self) -> Iterator[ColumnarNode]:
+        """Yield node views in deterministic preorder based on child order."""
+        first_children = self.first_children
+        next_siblings = self.next_siblings
+        stack = [0]
+        while stack:
+            index = stack.pop()
+            yield ColumnarNode(self, index)
+            child = first_children[index]
+            siblings: list[int] = []
+            while child != _NO_NODE:
+                siblings.append(child)
+                child = next_siblings[child]
+            stack.extend(reversed(siblings))
+
+    def iter_preorder_paths(self) -> Iterator[tuple[ColumnarNode, str]]:
+        """Yield `(node, node.path)` in preorder, extending parent paths."""
+        first_children = self.first_children
+        next_siblings = self.next_siblings
+        strings = self.strings
+        name_ids = self.name_ids
+        stack: list[tuple[int, str]] = [(0, ".")]
+        while stack:
+            index, path = stack.pop()
+            yield ColumnarNode(self, index), path
+            prefix = "" if index == 0 else f"{path}/"
+            child = first_children[index]
+            children: list[tuple[int, str]] = []
+            while child != _NO_NODE:
+                children.append((child, prefix + strings[name_ids[child]]))
+                child = next_siblings[child]
+            stack.extend(reversed(children))
+
+    def path_of(self, index: int) -> str:
+        """Return the relative POSIX path of a node, built from its parents."""
+        if index == 0:
+            return "."
+        parts: list[str] = []
+        strings = self.strings
+        while index > 0:
+            parts.append(strings[self.name_ids[index]])
+            index = self.parents[index]
+        parts.reverse()
+        return "/".join(parts)
+
+
+@dataclass(slots=True, eq=False)
+class ColumnarTreeModel(ColumnarColumns):
+    """A logical tree stored as parallel arrays, one slot per node.
+
+    Node `0` is the root. Structure is kept as parent, first-child and
+    next-sibling indices; names and extensions are interned into string
+    tables and referenced by id. Sizes and mtimes (epoch nanoseconds) are
+    64-bit columns whose presence is recorded in the `flags` bitfield, and
+    paths are rebuilt from the parent chain on demand. Renderers see the
+    `TreeView` interface through `ColumnarNode` views created per access.
+    """
+
+    scan_root: str
+    max_depth: int | None = None
+    strings: list[str] = field(default_factory=list)
+    parents: array[int] = field(default_factory=lambda: array("i"))
+    first_children: array[int] = field(default_factory=lambda: array("i"))
+    next_siblings: array[int] = field(default_factory=lambda: array("i"))
+    depths: array[int] = field(default_factory=lambda: array("i"))
+    name_ids: array[int] = field(default_factory=lambda: array("i"))
+    ext_ids: array[int] = field(default_factory=lambda: array("i"))
+    flags: array[int] = field(default_factory=lambda: array("B"))
+    sizes: array[int] = field(default_factory=lambda: array("q"))
+    mtimes_ns: array[int] = field(default_factory=lambda: array("q"))
+    symlink_targets: dict[int, str] = field(default_factory=dict)
+    _string_ids: dict[str, int] = field(default_factory=dict, repr=False)
+    _last_children: array[int] = field(default_factory=lambda: array("i"), repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.parents:
+            self.append(
+                parent=_NO_NODE,
+                name=Path(self.scan_root).name,
+                is_dir=True,
+            )
+
+    def append(
+        self,
+        *,
+        parent: int,
+        name: str,
+        is_dir: bool,
+        ext: str = "",
+        size: int | None = None,
+        mtime: datetime | None = None,
+        is_symlink: bool = False,
+        symlink_target: str | None = None,
+        symlink_cycle: bool = False,
+        mtime_ns: int | None = None,
+    ) -> int:
+        """Add a node as the last child of `parent` and return its index."""
+        if mtime is not None:
+            mtime_ns = ns_from_datetime(mtime)
+        index = len(self.parents)
+        if parent == _NO_NODE:
+            if index:
+                raise ValueError("only the first node may be the root")
+            depth = 0
+        else:
+            if not 0 <= parent < index:
+                raise ValueError("parent must be an existing node")
+            if not self.flags[parent] & _DIRECTORY:
+                raise ValueError("file nodes cannot contain children")
+            depth = self.depths[parent] + 1
+
+        bits = _DIRECTORY if is_dir else 0
+        if is_symlink:
+            bits |= _SYMLINK
+        if symlink_cycle:
+            bits |= _SYMLINK_CYCLE
+        if size is not None:
+            bits |= _HAS_SIZE
+        if mtime_ns is not None:
+            bits |= _HAS_MTIME
+
+        if len(self._last_children) != index:
+            self._rebuild_last_children()
+        self.parents.append(parent)
+        self.first_children.append(_NO_NODE)
+        self.next_siblings.append(_NO_NODE)
+        self._last_children.append(_NO_NODE)
+        self.depths.append(depth)
+        self.name_ids.append(self._intern(name))
+        self.ext_ids.append(self._intern(ext))
+        self.flags.append(bits)
+        self.sizes.append(0 if size is None else size)
+        self.mtimes_ns.append(0 if mtime_ns is None else mtime_ns)
+        if symlink_target is not None:
+            self.symlink_targets[index] = symlink_target
+
+        if parent != _NO_NODE:
+            previous = self._last_children[parent]
+            if previous == _NO_NODE:
+                self.first_children[parent] = index
+            else:
+                self.next_siblings[previous] = index
+            self._last_children[parent] = index
+        return index
+
+    def _rebuild_last_children(self) -> None:
+        # Trees loaded from arrays arrive without this build-time index;
+        # siblings are appended in order, so the highest index is the last.
+        last_children = array("i", [_NO_NODE]) * len(self.parents)
+        for index in range(1, len(self.parents)):
+            last_children[self.parents[index]] = index
+        self._last_children = last_children
+
+    def _intern(self, text: str) -> int:
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self._string_ids[text] = string_id
+            self.strings.append(text)
+        return string_id
+
+
+class ColumnarNode:
+    """A `NodeView` over one slot of a columnar tree."""
+
+    __slots__ = ("_tree", "index")
+
+    def __init__(self, tree: ColumnarColumns, index: int) -> None:
+        self._tree = tree
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, ColumnarNode)
+            and other._tree is self._tree
+            and other.index == self.index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self._tree), self.index))
+
+    def __repr__(self) -> str:
+        return f"ColumnarNode(index={self.index}, path={self.path!r})"
+
+    @property
+    def path(self) -> str:
+        return self._tree.path_of(self.index)
+
+    @property
+    def name(self) -> str:
+        return self._tree.strings[self._tree.name_ids[self.index]]
+
+    @property
+    def type(self) -> NodeType:
+        return "directory" if self._tree.flags[self.index] & _DIRECTORY else "file"
+
+    @property
+    def depth(self) -> int:
+        return self._tree.depths[self.index]
+
+    @property
+    def ext(self) -> str:
+        return self._tree.strings[self._tree.ext_ids[self.index]]
+
+    @property
+    def children(self) -> list[ColumnarNode]:
+        tree = self._tree
+        children: list[ColumnarNode] = []
+        child = tree.first_children[self.index]
+        while child != _NO_NODE:
+            children.append(ColumnarNode(tree, child))
+            child = tree.next_siblings[child]
+        return children
+
+    @property
+    def size(self) -> int | None:
+        if not self._tree.flags[self.index] & _HAS_SIZE:
+            return None
+        return self._tree.sizes[self.index]
+
+    @property
+    def mtime(self) -> datetime | None:
+        if not self._tree.flags[self.index] & _HAS_MTIME:
+            return None
+        return datetime_from_ns(self._tree.mtimes_ns[self.index])
+
+    @property
+    def mtime_ns(self) -> int | None:
+        if not self._tree.flags[self.index] & _HAS_MTIME:
+            return None
+        return self._tree.mtimes_ns[self.index]
+
+    @property
+    def is_symlink(self) -> bool:
+        return bool(self._tree.flags[self.index] & _SYMLINK)
+
+    @property
+    def symlink_target(self) -> str | None:
+        return self._tree.symlink_targets.get(self.index)
+
+    @property
+    def symlink_cycle(self) -> bool:
+        return bool(self._tree.flags[self.index] & _SYMLINK_CYCLE)
+
+
+def columnar_tree_from_entries(
+    *,
+    scan_root: Path,
+    entries: Iterable[TraversedEntry],
+    max_depth: int | None,
+    validate: bool = False,
+) -> ColumnarTreeModel:
+    """Construct a columnar tree from preorder entries.
+
+    Mirrors `traversal.tree_from_entries`: entries whose parent directory was
+    not emitted are dropped, and `validate=True` verifies that each entry's
+    depth follows its parent's.
+    """
+    tree = ColumnarTreeModel(scan_root=str(scan_root), max_depth=max_depth)
+    # Only directories can be parents, so only they need an index entry.
+    directories: dict[str, int] = {".": 0}
+    for entry in entries:
+        parent = directories.get(entry.path.rpartition("/")[0] or ".")
+        if parent is None:
+            continue
+        if validate and entry.depth != tree.depths[parent] + 1:
+            raise ValueError(f"entry depth must follow its parent: {entry.path}")
+        index = tree.append(
+            parent=parent,
+            name=entry.name,
+            is_dir=entry.is_dir,
+            ext="" if entry.is_dir else entry.ext,
+            size=None if entry.is_dir else entry.size,
+            mtime_ns=None if entry.is_dir else entry.mtime_ns,
+            is_symlink=entry.is_symlink,
+            symlink_target=entry.symlink_target,
+            symlink_cycle=entry.symlink_cycle,
+        )
+        if entry.is_dir:
+            directories[entry.path] = index
+    return tree
+
+
+def columnar_tree_from_model(model: TreeView) -> ColumnarTreeModel:
+    """Copy any `TreeView` into a columnar tree with identical preorder."""
+    tree = ColumnarTreeModel(scan_root=model.scan_root, max_depth=model.max_depth)
+    # The constructor named the root after `scan_root`; keep the model's name.
+    tree.name_ids[0] = tree._intern(model.root.name)
+    stack: list[tuple[NodeView, int]] = [
+        (child, 0) for child in reversed(model.root.children)
+    ]
+    while stack:
+        node, parent = stack.pop()
+        index = tree.append(
+            parent=parent,
+            name=node.name,
+            is_dir=node.type == "directory",
+            ext=node.ext,
+            size=node.size,
+            mtime_ns=node.mtime_ns,
+            is_symlink=node.is_symlink,
+            symlink_target=node.symlink_target,
+            symlink_cycle=node.symlink_cycle,
+        )
+        stack.extend((child, index) for child in reversed(node.children))
+    return tree
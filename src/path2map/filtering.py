@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import os
 import re
-from typing import Pattern
+from typing import Callable, Pattern
 
 from path2map.ignore import PathEntry, normalize_relative_path
+from path2map.patterns import PatternSet
 
 
 @dataclass(frozen=True)
@@ -16,11 +19,173 @@ class FilterConfig:
     filters: list[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class MetadataFilter:
+    """File size and modification-time bounds (all inclusive, all optional).
+
+    Applied to files only; directories are kept as ancestors of matching
+    files, as with regex filters.
+    """
+
+    min_size: int | None = None
+    max_size: int | None = None
+    newer_than: datetime | None = None
+    older_than: datetime | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("min_size", "max_size"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} must be >= 0")
+
+    def __bool__(self) -> bool:
+        return any(
+            bound is not None
+            for bound in (
+                self.min_size,
+                self.max_size,
+                self.newer_than,
+                self.older_than,
+            )
+        )
+
+    def matches(self, stat_result: os.stat_result) -> bool:
+        """Return whether a file's `lstat` result satisfies every bound."""
+        size = stat_result.st_size
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        mtime = stat_result.st_mtime
+        if self.newer_than is not None and mtime < self.newer_than.timestamp():
+            return False
+        if self.older_than is not None and mtime > self.older_than.timestamp():
+            return False
+        return True
+
+
+_SIZE_UNITS = {
+    "": 1,
+    "b": 1,
+    "k": 1024,
+    "kib": 1024,
+    "kb": 1000,
+    "m": 1024**2,
+    "mib": 1024**2,
+    "mb": 1000**2,
+    "g": 1024**3,
+    "gib": 1024**3,
+    "gb": 1000**3,
+    "t": 1024**4,
+    "tib": 1024**4,
+    "tb": 1000**4,
+}
+_AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_QUANTITY = re.compile(r"\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*", re.IGNORECASE)
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte count such as `512`, `100M`, `1.5GiB`, or `20MB`.
+
+    Bare and `iB` units are binary (1024-based); `KB`/`MB`/`GB`/`TB` are
+    decimal.
+    """
+    match = _QUANTITY.fullmatch(value)
+    unit = match.group(2).lower() if match else ""
+    if match is None or unit not in _SIZE_UNITS:
+        raise ValueError(f"invalid size: {value!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[unit])
+
+
+def parse_time_threshold(value: str, *, now: datetime | None = None) -> datetime:
+    """Parse an age such as `180d`, `12h`, or `2w`, or an ISO date/time.
+
+    Ages count back from `now` (default: the current local time); units are
+    s, m, h, d, and w.
+    """
+    match = _QUANTITY.fullmatch(value)
+    if match is not None and match.group(2).lower() in _AGE_UNITS:
+        seconds = float(match.group(1)) * _AGE_UNITS[match.group(2).lower()]
+        return (now or datetime.now()) - timedelta(seconds=seconds)
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"invalid age or date: {value!r}") from None
+
+
 def compile_filter_patterns(filter_values: list[str]) -> list[Pattern[str]]:
     """Compile all non-empty include filter regex values."""
     return [re.compile(value) for value in filter_values if value.strip()]
 
 
+def compile_descend_predicate(filter_values: list[str]) -> Callable[[str], bool] | None:
+    """Return a traversal pruning predicate implied by anchored filters.
+
+    When every filter is `^`-anchored with a literal prefix, a match must
+    start with one of those prefixes, so directories that cannot contain such
+    a path need not be scanned. Returns None when no pruning is possible.
+    """
+    prefixes: set[str] = set()
+    for value in filter_values:
+        if not value.strip():
+            continue
+        prefix = _anchored_literal_prefix(value)
+        if not prefix:
+            return None
+        prefixes.add(prefix)
+    if not prefixes:
+        return None
+    return _LiteralPrefixes(prefixes=tuple(sorted(prefixes))).may_contain_match
+
+
+@dataclass(frozen=True)
+class _LiteralPrefixes:
+    prefixes: tuple[str, ...]
+
+    def may_contain_match(self, directory: str) -> bool:
+        # Paths below `directory` start with `directory/`; they can start with
+        # a prefix only if one of the two strings extends the other.
+        base = f"{directory}/"
+        return any(
+            prefix.startswith(base) or base.startswith(prefix)
+            for prefix in self.prefixes
+        )
+
+
+_REGEX_SPECIAL = frozenset(".^$*+?{}[]|()\\")
+_OPTIONAL_QUANTIFIERS = frozenset("*?{")
+
+
+def _anchored_literal_prefix(value: str) -> str | None:
+    """Return the literal text every match of a `^` pattern starts with."""
+    # Alternation can escape the anchor and inline flags can change how the
+    # literal compares, so such patterns are never pruned on.
+    if not value.startswith("^") or "|" in value or "(?" in value:
+        return None
+
+    literal: list[str] = []
+    index = 1
+    while index < len(value):
+        char = value[index]
+        if char == "\\":
+            escaped = value[index + 1 : index + 2]
+            if not escaped or escaped.isalnum():
+                break
+            char, width = escaped, 2
+        elif char in _REGEX_SPECIAL:
+            if char == "+" and literal:
+                # `x+` still requires one `x`; stop after it.
+                break
+            if char in _OPTIONAL_QUANTIFIERS and literal:
+                literal.pop()
+            break
+        else:
+            width = 1
+        literal.append(char)
+        index += width
+    return "".join(literal)
+
+
 def filter_entries_with_ancestors(
     entries: list[PathEntry],
     *,
@@ -32,7 +197,7 @@ def filter_entries_with_ancestors(
     entries from consideration.
     """
     cfg = config or FilterConfig()
-    patterns = compile_filter_patterns(cfg.filters)
+    patterns = PatternSet(tuple(compile_filter_patterns(cfg.filters)))
     if not patterns:
         return list(entries)
 
@@ -40,35 +205,36 @@ def filter_entries_with_ancestors(
         _NormalizedEntry(entry=entry, path=normalize_relative_path(entry.path))
         for entry in entries
     ]
-    matched_paths = {
-        item.path
-        for item in normalized
-        if any(pattern.search(item.path) for pattern in patterns)
-    }
+    matches = patterns.search_many([item.path for item in normalized])
+    matched_paths = {item.path for item, matched in zip(normalized, matches) if matched}
     if not matched_paths:
         return []
 
-    kept: list[PathEntry] = []
-    for item in normalized:
-        if item.path in matched_paths:
-            kept.append(item.entry)
-            continue
+    ancestors = _ancestor_paths(matched_paths)
+    return [
+        item.entry
+        for item in normalized
+        if item.path in matched_paths or (item.entry.is_dir and item.path in ancestors)
+    ]
 
-        if item.entry.is_dir and any(
-            _is_ancestor(item.path, matched) for matched in matched_paths
-        ):
-            kept.append(item.entry)
 
-    return kept
+def _ancestor_paths(paths: set[str]) -> set[str]:
+    """Return every proper ancestor of `paths`, including `.`."""
+    ancestors: set[str] = set()
+    for path in paths:
+        if path == ".":
+            continue
+        # Walk up the parent chain; a parent already marked was reached from
+        # an earlier path, so its own ancestors are marked too.
+        while path != ".":
+            path = path.rpartition("/")[0] or "."
+            if path in ancestors:
+                break
+            ancestors.add(path)
+    return ancestors
 
 
 @dataclass(frozen=True)
 class _NormalizedEntry:
     entry: PathEntry
     path: str
-
-
-def _is_ancestor(path: str, descendant: str) -> bool:
-    if path == ".":
-        return descendant != "."
-    return descendant.startswith(f"{path}/")
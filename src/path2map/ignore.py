@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from fnmatch import fnmatch
+from dataclasses import dataclass, field
+from fnmatch import fnmatch, translate
+import os
 from pathlib import Path
 import re
 from typing import Pattern
 
+from path2map.patterns import PatternSet
+
 DEFAULT_IGNORE_PATTERNS: tuple[str, ...] = (
     ".git/",
     ".venv/",
@@ -19,6 +22,10 @@ DEFAULT_IGNORE_PATTERNS: tuple[str, ...] = (
     "build/",
 )
 
+_GLOB_CHARS = frozenset("*?[")
+# `fnmatch` compares through `os.path.normcase`, which folds case on Windows.
+_CASE_INSENSITIVE = os.path.normcase("A") == "a"
+
 
 @dataclass(frozen=True)
 class PathEntry:
@@ -46,34 +53,357 @@ class IgnoreConfig:
     cli_ignore: str | None = None
 
 
-def filter_ignored_entries(
-    entries: list[PathEntry],
+@dataclass(frozen=True)
+class IgnoreMatcher:
+    """Ignore stages 2-4 loaded once and evaluated per relative path.
+
+    Default patterns and `.p2mignore` rules are compiled on construction.
+    Rule matches on a directory's own path segments are inherited by its
+    descendants, so each lookup only tests the entry's final segment and full
+    path, and descendants of a settled directory are answered immediately.
+    One union of every rule screens entries first: when nothing matches them
+    locally, the parent directory's inherited decision applies as is.
+    """
+
+    use_default_ignores: bool = True
+    p2mignore_rules: list[IgnoreRule] = field(default_factory=list)
+    cli_ignore_patterns: list[Pattern[str]] = field(default_factory=list)
+    _default_runs: tuple[_RuleRun, ...] = field(init=False, repr=False, compare=False)
+    _p2mignore_runs: tuple[_RuleRun, ...] = field(init=False, repr=False, compare=False)
+    _states: dict[str, _DirectoryState] = field(init=False, repr=False, compare=False)
+    _any_rule: _RuleRun | None = field(init=False, repr=False, compare=False)
+    _cli_ignore: PatternSet = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        default_rules = (
+            [IgnoreRule(pattern=pattern) for pattern in DEFAULT_IGNORE_PATTERNS]
+            if self.use_default_ignores
+            else []
+        )
+        object.__setattr__(self, "_default_runs", _compile_rule_runs(default_rules))
+        object.__setattr__(
+            self, "_p2mignore_runs", _compile_rule_runs(self.p2mignore_rules)
+        )
+        object.__setattr__(self, "_states", {})
+        all_rules = [
+            IgnoreRule(pattern=rule.pattern)
+            for rule in [*default_rules, *self.p2mignore_rules]
+        ]
+        object.__setattr__(
+            self, "_any_rule", _compile_rule_run(all_rules) if all_rules else None
+        )
+        object.__setattr__(
+            self, "_cli_ignore", PatternSet(tuple(self.cli_ignore_patterns))
+        )
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        """Return whether a relative path is excluded by any ignore stage."""
+        rel_path = normalize_relative_path(rel_path)
+        parent, _, name = rel_path.rpartition("/")
+        default_mask, p2mignore_mask, descendants_ignored, inherited_ignored = (
+            self._directory_state(parent)
+        )
+        if descendants_ignored:
+            return True
+
+        if self._any_rule is not None and self._any_rule.matches_entry(
+            rel_path, name, is_dir
+        ):
+            if _last_matching_run_ignores(
+                self._default_runs, default_mask, rel_path, name, is_dir
+            ) or _last_matching_run_ignores(
+                self._p2mignore_runs, p2mignore_mask, rel_path, name, is_dir
+            ):
+                return True
+        elif inherited_ignored:
+            return True
+
+        return bool(self.cli_ignore_patterns) and self._cli_ignore.search(rel_path)
+
+    def _directory_state(self, directory: str) -> _DirectoryState:
+        """Return the inherited rule state for a normalized directory path."""
+        states = self._states
+        state = states.get(directory)
+        if state is not None:
+            return state
+
+        pending: list[str] = []
+        while directory and directory not in states:
+            pending.append(directory)
+            directory = directory.rpartition("/")[0]
+        state = states[directory] if directory else _ROOT_STATE
+
+        if len(states) + len(pending) > _STATE_CACHE_LIMIT:
+            states.clear()
+        for path in reversed(pending):
+            state = self._child_state(state, path)
+            states[path] = state
+        return state
+
+    def _child_state(self, parent: _DirectoryState, path: str) -> _DirectoryState:
+        default_mask, p2mignore_mask, descendants_ignored, _ = parent
+        if descendants_ignored:
+            return parent
+
+        name = path.rpartition("/")[2]
+        default_mask |= _inherited_mask(self._default_runs, path, name)
+        p2mignore_mask |= _inherited_mask(self._p2mignore_runs, path, name)
+        return (
+            default_mask,
+            p2mignore_mask,
+            _is_settled(self._default_runs, default_mask)
+            or _is_settled(self._p2mignore_runs, p2mignore_mask),
+            _mask_ignores(self._default_runs, default_mask)
+            or _mask_ignores(self._p2mignore_runs, p2mignore_mask),
+        )
+
+
+# (default run mask, .p2mignore run mask, every descendant ignored, children
+# ignored when no rule matches them locally). Bit `i` of a mask is set when
+# run `i` matches a segment of the directory's path, which then also matches
+# every path below it.
+_DirectoryState = tuple[int, int, bool, bool]
+_ROOT_STATE: _DirectoryState = (0, 0, False, False)
+# Bounds matcher memory on huge trees; evicted states are simply recomputed.
+_STATE_CACHE_LIMIT = 65536
+
+
+@dataclass(frozen=True)
+class _RuleRun:
+    """Consecutive rules of one polarity, compiled for bulk matching.
+
+    The four pattern shapes of `_matches_glob_pattern` each get a literal
+    set for wildcard-free patterns and one combined regex for the rest.
+    Segment globs of the form `*literal` and `literal*` are tested with
+    `str.endswith`/`str.startswith` instead of the regex.
+    """
+
+    is_negation: bool
+    segment_names: frozenset[str] = frozenset()
+    segment_suffixes: tuple[str, ...] = ()
+    segment_prefixes: tuple[str, ...] = ()
+    dir_names: frozenset[str] = frozenset()
+    dir_suffixes: tuple[str, ...] = ()
+    dir_prefixes_glob: tuple[str, ...] = ()
+    dir_prefixes: frozenset[str] = frozenset()
+    paths: frozenset[str] = frozenset()
+    segment_regex: Pattern[str] | None = None
+    dir_regex: Pattern[str] | None = None
+    path_regex: Pattern[str] | None = None
+
+    def matches_directory(self, rel_path: str, name: str) -> bool:
+        """Return whether a directory's own segment matches for descendants."""
+        # Literal dir-only paths compare exactly, without case folding.
+        if rel_path in self.dir_prefixes:
+            return True
+        if _CASE_INSENSITIVE:
+            name = name.lower()
+        return self._matches_segment(name) or self._matches_dir_segment(name)
+
+    def matches_entry(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        """Return whether the run matches an entry's final segment or path."""
+        # Inlined segment checks: this runs once per traversed entry.
+        if rel_path in self.dir_prefixes:
+            return True
+        if _CASE_INSENSITIVE:
+            rel_path = rel_path.lower()
+            name = name.lower()
+        if (
+            name in self.segment_names
+            or rel_path in self.paths
+            or name.endswith(self.segment_suffixes)
+            or name.startswith(self.segment_prefixes)
+        ):
+            return True
+        if self.segment_regex is not None and self.segment_regex.match(name):
+            return True
+        if self.path_regex is not None and self.path_regex.match(rel_path):
+            return True
+        return is_dir and self._matches_dir_segment(name)
+
+    def _matches_segment(self, name: str) -> bool:
+        if (
+            name in self.segment_names
+            or name.endswith(self.segment_suffixes)
+            or name.startswith(self.segment_prefixes)
+        ):
+            return True
+        return self.segment_regex is not None and bool(self.segment_regex.match(name))
+
+    def _matches_dir_segment(self, name: str) -> bool:
+        if (
+            name in self.dir_names
+            or name.endswith(self.dir_suffixes)
+            or name.startswith(self.dir_prefixes_glob)
+        ):
+            return True
+        return self.dir_regex is not None and bool(self.dir_regex.match(name))
+
+
+def _compile_rule_runs(rules: list[IgnoreRule]) -> tuple[_RuleRun, ...]:
+    """Group rules into same-polarity runs, preserving rule order."""
+    runs: list[_RuleRun] = []
+    start = 0
+    for index in range(1, len(rules) + 1):
+        if index == len(rules) or rules[index].is_negation != rules[start].is_negation:
+            runs.append(_compile_rule_run(rules[start:index]))
+            start = index
+    return tuple(runs)
+
+
+def _compile_rule_run(rules: list[IgnoreRule]) -> _RuleRun:
+    segment_names: set[str] = set()
+    dir_names: set[str] = set()
+    dir_prefixes: set[str] = set()
+    paths: set[str] = set()
+    segment_globs: list[str] = []
+    dir_globs: list[str] = []
+    path_globs: list[str] = []
+
+    for rule in rules:
+        anchored = rule.pattern.startswith("/")
+        cleaned = rule.pattern.lstrip("/")
+        dir_only = cleaned.endswith("/")
+        cleaned = cleaned.rstrip("/")
+        if not cleaned:
+            continue
+
+        if dir_only and ("/" in cleaned or anchored):
+            dir_prefixes.add(cleaned)
+            continue
+
+        if _CASE_INSENSITIVE:
+            cleaned = cleaned.lower()
+        is_glob = not _GLOB_CHARS.isdisjoint(cleaned)
+        if "/" in cleaned or anchored:
+            if is_glob:
+                path_globs.append(cleaned)
+            else:
+                paths.add(cleaned)
+        elif dir_only:
+            if is_glob:
+                dir_globs.append(cleaned)
+            else:
+                dir_names.add(cleaned)
+        elif is_glob:
+            segment_globs.append(cleaned)
+        else:
+            segment_names.add(cleaned)
+
+    segment_suffixes, segment_prefixes, segment_globs = _split_affix_globs(
+        segment_globs
+    )
+    dir_suffixes, dir_prefixes_glob, dir_globs = _split_affix_globs(dir_globs)
+    return _RuleRun(
+        is_negation=rules[0].is_negation,
+        segment_names=frozenset(segment_names),
+        segment_suffixes=segment_suffixes,
+        segment_prefixes=segment_prefixes,
+        dir_names=frozenset(dir_names),
+        dir_suffixes=dir_suffixes,
+        dir_prefixes_glob=dir_prefixes_glob,
+        dir_prefixes=frozenset(dir_prefixes),
+        paths=frozenset(paths),
+        segment_regex=_combine_globs(segment_globs),
+        dir_regex=_combine_globs(dir_globs),
+        path_regex=_combine_globs(path_globs),
+    )
+
+
+def _split_affix_globs(
+    globs: list[str],
+) -> tuple[tuple[str, ...], tuple[str, ...], list[str]]:
+    # `*literal` and `literal*` match a segment exactly when it ends or
+    # starts with the literal; everything else stays a regex.
+    suffixes: list[str] = []
+    prefixes: list[str] = []
+    remaining: list[str] = []
+    for glob in globs:
+        if glob.startswith("*") and _GLOB_CHARS.isdisjoint(glob[1:]):
+            suffixes.append(glob[1:])
+        elif glob.endswith("*") and _GLOB_CHARS.isdisjoint(glob[:-1]):
+            prefixes.append(glob[:-1])
+        else:
+            remaining.append(glob)
+    return tuple(suffixes), tuple(prefixes), remaining
+
+
+def _combine_globs(globs: list[str]) -> Pattern[str] | None:
+    if not globs:
+        return None
+    return re.compile(
+        "|".join(translate(glob) for glob in globs),
+        re.IGNORECASE if _CASE_INSENSITIVE else 0,
+    )
+
+
+def _inherited_mask(runs: tuple[_RuleRun, ...], rel_path: str, name: str) -> int:
+    mask = 0
+    for index, run in enumerate(runs):
+        if run.matches_directory(rel_path, name):
+            mask |= 1 << index
+    return mask
+
+
+def _mask_ignores(runs: tuple[_RuleRun, ...], mask: int) -> bool:
+    # With no local match, the last inherited run decides.
+    last = mask.bit_length() - 1
+    return last >= 0 and not runs[last].is_negation
+
+
+def _is_settled(runs: tuple[_RuleRun, ...], mask: int) -> bool:
+    # Descendants are ignored for good when the last inherited run ignores
+    # and no later negation run could re-include anything below.
+    if not _mask_ignores(runs, mask):
+        return False
+    last = mask.bit_length() - 1
+    return not any(run.is_negation for run in runs[last + 1 :])
+
+
+def _last_matching_run_ignores(
+    runs: tuple[_RuleRun, ...],
+    inherited_mask: int,
+    rel_path: str,
+    name: str,
+    is_dir: bool,
+) -> bool:
+    # The last matching rule decides; scanning runs from the end finds it
+    # without evaluating every earlier rule.
+    for index in range(len(runs) - 1, -1, -1):
+        run = runs[index]
+        if inherited_mask >> index & 1 or run.matches_entry(rel_path, name, is_dir):
+            return not run.is_negation
+    return False
+
+
+def load_ignore_matcher(
     *,
     scan_root: Path,
     config: IgnoreConfig | None = None,
-) -> list[PathEntry]:
-    """Filter candidate entries using defaults, `.p2mignore`, and CLI regex."""
+) -> IgnoreMatcher:
+    """Load `.p2mignore` and compile CLI patterns into a reusable matcher."""
     cfg = config or IgnoreConfig()
-
     p2m_rules = (
         load_p2mignore_rules(scan_root=scan_root, p2mignore_path=cfg.p2mignore_path)
         if cfg.p2mignore_enabled
         else []
     )
-    cli_patterns = compile_cli_ignore_patterns(cfg.cli_ignore)
-
-    filtered: list[PathEntry] = []
-    for entry in entries:
-        if should_ignore_entry(
-            entry,
-            use_default_ignores=cfg.use_default_ignores,
-            p2mignore_rules=p2m_rules,
-            cli_ignore_patterns=cli_patterns,
-        ):
-            continue
-        filtered.append(entry)
+    return IgnoreMatcher(
+        use_default_ignores=cfg.use_default_ignores,
+        p2mignore_rules=p2m_rules,
+        cli_ignore_patterns=compile_cli_ignore_patterns(cfg.cli_ignore),
+    )
+
 
-    return filtered
+def filter_ignored_entries(
+    entries: list[PathEntry],
+    *,
+    scan_root: Path,
+    config: IgnoreConfig | None = None,
+) -> list[PathEntry]:
+    """Filter candidate entries using defaults, `.p2mignore`, and CLI regex."""
+    matcher = load_ignore_matcher(scan_root=scan_root, config=config)
+    return [entry for entry in entries if not matcher.matches(entry.path, entry.is_dir)]
 
 
 def should_ignore_entry(
@@ -199,6 +529,9 @@ def _matches_glob_pattern(*, rel_path: str, is_dir: bool, pattern: str) -> bool:
 
 def normalize_relative_path(path: str) -> str:
     """Normalize incoming path text to POSIX-style relative form."""
+    if "\\" not in path and not path.startswith("./") and not path.endswith("/"):
+        # Traversal already produces this form; skip the rewrites.
+        return path
     normalized = path.replace("\\", "/")
     while normalized.startswith("./"):
         normalized = normalized[2:]
@@ -2,28 +2,160 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields
+from reprlib import recursive_repr
 from datetime import datetime
-from typing import Iterator, Literal
+import os
+from typing import Any, Iterator, Literal, Protocol, Sequence
+
+from path2map.timefmt import datetime_from_ns, ns_from_datetime
 
 NodeType = Literal["directory", "file"]
 
 
-@dataclass(slots=True)
-class TreeNode:
-    """A node in the logical filesystem tree."""
+class NodeView(Protocol):
+    """Read-only node interface renderers rely on.
+
+    `TreeNode` satisfies it directly; compact backings such as
+    `path2map.columnar` expose lightweight views with the same attributes.
+    """
+
+    @property
+    def path(self) -> str: ...
+
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def type(self) -> NodeType: ...
+
+    @property
+    def depth(self) -> int: ...
+
+    @property
+    def ext(self) -> str: ...
+
+    @property
+    def children(self) -> Sequence[NodeView]: ...
+
+    @property
+    def size(self) -> int | None: ...
+
+    @property
+    def mtime(self) -> datetime | None: ...
+
+    @property
+    def mtime_ns(self) -> int | None: ...
+
+    @property
+    def is_symlink(self) -> bool: ...
+
+    @property
+    def symlink_target(self) -> str | None: ...
+
+    @property
+    def symlink_cycle(self) -> bool: ...
+
+
+class TreeView(Protocol):
+    """Read-only tree interface accepted by every renderer."""
+
+    @property
+    def root(self) -> NodeView: ...
+
+    @property
+    def scan_root(self) -> str: ...
+
+    @property
+    def max_depth(self) -> int | None: ...
+
+    def iter_preorder(self) -> Iterator[NodeView]: ...
+
+    def iter_preorder_paths(self) -> Iterator[tuple[NodeView, str]]: ...
+
+
+class _LeafChildren(list):  # type: ignore[type-arg]
+    """The shared, always-empty `children` list of file nodes."""
+
+    __slots__ = ()
+
+    def _reject(self, *_args: object, **_kwargs: object) -> Any:
+        raise ValueError("file nodes cannot contain children")
+
+    append = extend = insert = __setitem__ = __iadd__ = _reject
+
+
+# One instance serves every file node, saving an empty list per file.
+_LEAF_CHILDREN: list[Any] = _LeafChildren()
+
+
+class _ParentLink:
+    """Holds a node's parent reference outside its dataclass fields.
+
+    Kept off the fields so `dataclasses.asdict` and `fields` see only the
+    downward `children` links, never the parent-children cycle.
+    """
+
+    __slots__ = ("parent",)
+
+    parent: TreeNode | None
+
+
+@dataclass(slots=True, init=False, repr=False, eq=False)
+class TreeNode(_ParentLink):
+    """A node in the logical filesystem tree.
+
+    A node created with a `parent` and no explicit `path` stores only its
+    name and derives `path` from the parent chain on access, so a tree does
+    not hold one full path string per node. Equality and `repr` use the
+    derived `path`, however it is stored.
+    """
 
-    path: str
     name: str
     type: NodeType
     depth: int
-    ext: str = ""
-    children: list["TreeNode"] = field(default_factory=list)
-    size: int | None = None
-    mtime: datetime | None = None
-    is_symlink: bool = False
-    symlink_target: str | None = None
-    symlink_cycle: bool = False
+    ext: str
+    children: list["TreeNode"]
+    size: int | None
+    mtime_ns: int | None
+    is_symlink: bool
+    symlink_target: str | None
+    symlink_cycle: bool
+    _path: str | None = field(repr=False, compare=False)
+
+    def __init__(
+        self,
+        path: str | None,
+        name: str,
+        type: NodeType,
+        depth: int,
+        ext: str = "",
+        children: list["TreeNode"] | None = None,
+        size: int | None = None,
+        mtime: datetime | None = None,
+        is_symlink: bool = False,
+        symlink_target: str | None = None,
+        symlink_cycle: bool = False,
+        parent: "TreeNode | None" = None,
+        mtime_ns: int | None = None,
+    ) -> None:
+        self._path = path
+        self.name = name
+        self.type = type
+        self.depth = depth
+        self.ext = ext
+        if children is None:
+            children = _LEAF_CHILDREN if type == "file" else []
+        self.children = children
+        self.size = size
+        self.mtime_ns = mtime_ns if mtime is None else ns_from_datetime(mtime)
+        self.is_symlink = is_symlink
+        self.symlink_target = symlink_target
+        self.symlink_cycle = symlink_cycle
+        # mypy does not see slots inherited by a slots dataclass.
+        self.parent = parent  # type: ignore[misc]
+        self.__post_init__()
 
     def __post_init__(self) -> None:
         """Validate invariants for node shape and metadata usage."""
@@ -33,17 +165,63 @@ class TreeNode:
         if self.type == "file" and self.children:
             raise ValueError("file nodes cannot contain children")
 
+        if self._path is None and self.parent is None:
+            raise ValueError("path is required for nodes without a parent")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TreeNode) or other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.path == other.path and all(
+            getattr(self, name) == getattr(other, name) for name in _COMPARED_FIELDS
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @recursive_repr()
+    def __repr__(self) -> str:
+        values = "".join(f", {name}={getattr(self, name)!r}" for name in _REPR_FIELDS)
+        return f"{self.__class__.__qualname__}(path={self.path!r}{values})"
+
+    @property
+    def path(self) -> str:
+        """Return the relative POSIX path, deriving it from parents if unset."""
+        if self._path is not None:
+            return self._path
+        names = [self.name]
+        ancestor = self.parent
+        while ancestor is not None and ancestor._path is None:
+            names.append(ancestor.name)
+            ancestor = ancestor.parent
+        if ancestor is not None and ancestor._path != ".":
+            names.append(ancestor._path or "")
+        names.reverse()
+        return "/".join(names)
+
+    @path.setter
+    def path(self, value: str) -> None:
+        self._path = value
+
+    @property
+    def mtime(self) -> datetime | None:
+        """Return the modification time as a local datetime, if known."""
+        return None if self.mtime_ns is None else datetime_from_ns(self.mtime_ns)
+
+    @mtime.setter
+    def mtime(self, value: datetime | None) -> None:
+        self.mtime_ns = None if value is None else ns_from_datetime(value)
+
     @classmethod
     def directory(
         cls,
         *,
-        path: str,
+        path: str | None = None,
         name: str,
         depth: int,
         children: list["TreeNode"] | None = None,
         is_symlink: bool = False,
         symlink_target: str | None = None,
         symlink_cycle: bool = False,
+        parent: "TreeNode | None" = None,
     ) -> "TreeNode":
         """Create a directory node."""
         return cls(
@@ -56,13 +234,14 @@ class TreeNode:
             is_symlink=is_symlink,
             symlink_target=symlink_target,
             symlink_cycle=symlink_cycle,
+            parent=parent,
         )
 
     @classmethod
     def file(
         cls,
         *,
-        path: str,
+        path: str | None = None,
         name: str,
         depth: int,
         ext: str = "",
@@ -71,6 +250,8 @@ class TreeNode:
         is_symlink: bool = False,
         symlink_target: str | None = None,
         symlink_cycle: bool = False,
+        parent: "TreeNode | None" = None,
+        mtime_ns: int | None = None,
     ) -> "TreeNode":
         """Create a file node."""
         return cls(
@@ -84,16 +265,140 @@ class TreeNode:
             is_symlink=is_symlink,
             symlink_target=symlink_target,
             symlink_cycle=symlink_cycle,
+            parent=parent,
+            mtime_ns=mtime_ns,
         )
 
 
+# `path` is compared and shown as derived, not as the stored `_path`.
+_COMPARED_FIELDS = tuple(item.name for item in fields(TreeNode) if item.compare)
+_REPR_FIELDS = tuple(item.name for item in fields(TreeNode) if item.repr)
+
+
+@dataclass(slots=True)
+class _PathIndex:
+    """Lookup tables over a `TreeModel`, built on the first query."""
+
+    nodes: dict[str, TreeNode]
+    sorted_paths: list[str]
+    children_by_name: dict[str, dict[str, TreeNode]] = field(default_factory=dict)
+
+
 @dataclass(slots=True)
 class TreeModel:
-    """Container for a full logical tree and scan-level metadata."""
+    """Container for a full logical tree and scan-level metadata.
+
+    Path queries (`find`, `child`, `paths_with_prefix`, `paths_between`, and
+    `subtree`) share an index built on first use in one preorder pass. The
+    index reflects the tree at that moment; call `clear_index` after
+    mutating nodes.
+    """
 
     root: TreeNode
     scan_root: str
     max_depth: int | None = None
+    _index: _PathIndex | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def find(self, path: str) -> TreeNode | None:
+        """Return the node at relative POSIX `path`, or `None` if absent."""
+        return self._path_index().nodes.get(_normalize_query(path))
+
+    def child(self, node: TreeNode, name: str) -> TreeNode | None:
+        """Return the child of `node` called `name`, or `None` if absent."""
+        by_path = self._path_index().children_by_name
+        # Keyed by path rather than `id`, which a freed node's successor
+        # could reuse.
+        children = by_path.get(node.path)
+        if children is None:
+            children = {child.name: child for child in node.children}
+            by_path[node.path] = children
+        return children.get(name)
+
+    def paths_with_prefix(self, prefix: str) -> list[str]:
+        """Return every path starting with `prefix`, in sorted order.
+
+        Use a trailing slash (`"src/"`) for a directory's descendants only.
+        """
+        paths = self._path_index().sorted_paths
+        # Paths with the prefix sort contiguously from its insertion point,
+        # so the first path past `start` without it ends the run.
+        start = bisect_left(paths, prefix)
+        stop = bisect_left(
+            paths, True, lo=start, key=lambda path: not path.startswith(prefix)
+        )
+        return paths[start:stop]
+
+    def paths_between(self, start: str, stop: str) -> list[str]:
+        """Return sorted paths `p` with `start <= p < stop`."""
+        paths = self._path_index().sorted_paths
+        low = bisect_left(paths, start)
+        return paths[low : bisect_left(paths, stop, lo=low)]
+
+    def subtree(self, path: str) -> "TreeModel":
+        """Return a copy of the directory at `path` as a standalone tree.
+
+        Copied nodes are rebased: the directory becomes the root (`"."`,
+        depth 0) and descendant paths and depths are relative to it.
+        """
+        node = self.find(path)
+        if node is None:
+            raise ValueError(f"path is not in the tree: {path}")
+        if node.type != "directory":
+            raise ValueError("subtree root must be a directory")
+
+        base_depth = node.depth
+        root = TreeNode.directory(
+            path=".",
+            name=node.name,
+            depth=0,
+            is_symlink=node.is_symlink,
+            symlink_target=node.symlink_target,
+            symlink_cycle=node.symlink_cycle,
+        )
+        stack: list[tuple[TreeNode, TreeNode]] = [
+            (child, root) for child in reversed(node.children)
+        ]
+        while stack:
+            source, parent = stack.pop()
+            copy = TreeNode(
+                None,
+                source.name,
+                source.type,
+                source.depth - base_depth,
+                ext=source.ext,
+                size=source.size,
+                mtime_ns=source.mtime_ns,
+                is_symlink=source.is_symlink,
+                symlink_target=source.symlink_target,
+                symlink_cycle=source.symlink_cycle,
+                parent=parent,
+            )
+            parent.children.append(copy)
+            stack.extend((child, copy) for child in reversed(source.children))
+
+        return TreeModel(
+            root=root,
+            scan_root=(
+                self.scan_root
+                if node is self.root
+                else os.path.join(self.scan_root, *node.path.split("/"))
+            ),
+            max_depth=(None if self.max_depth is None else self.max_depth - base_depth),
+        )
+
+    def clear_index(self) -> None:
+        """Drop the path index so the next query rebuilds it."""
+        self._index = None
+
+    def _path_index(self) -> _PathIndex:
+        index = self._index
+        if index is None:
+            nodes = {path: node for node, path in self.iter_preorder_paths()}
+            index = _PathIndex(nodes=nodes, sorted_paths=sorted(nodes))
+            self._index = index
+        return index
 
     def iter_preorder(self) -> Iterator[TreeNode]:
         """Yield nodes in deterministic preorder based on child order."""
@@ -102,3 +407,38 @@ class TreeModel:
             current = stack.pop()
             yield current
             stack.extend(reversed(current.children))
+
+    def iter_preorder_paths(self) -> Iterator[tuple[TreeNode, str]]:
+        """Yield `(node, node.path)` in preorder, deriving each path once.
+
+        Streaming extends the parent's path instead of walking every node's
+        parent chain, which keeps path-per-row renderers linear.
+        """
+        stack: list[tuple[TreeNode, str]] = [(self.root, self.root.path)]
+        while stack:
+            current, path = stack.pop()
+            yield current, path
+            children = current.children
+            if not children:
+                continue
+            prefix = "" if path == "." else f"{path}/"
+            stack.extend(
+                [
+                    (
+                        child,
+                        (
+                            prefix + child.name
+                            if child.parent is current and child._path is None
+                            else child.path
+                        ),
+                    )
+                    for child in children
+                ][::-1]
+            )
+
+
+def _normalize_query(path: str) -> str:
+    key = path.strip("/")
+    while key.startswith("./"):
+        key = key[2:]
+    return key or "."
@@ -0,0 +1,154 @@
+"""Combined matching for repeated `--filter` and `--ignore` regex values."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+import re
+from typing import Pattern, Sequence
+
+# Numbered backreferences and group conditionals would be renumbered by the
+# wrapping groups of a combined alternation.
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+# Constructs whose meaning depends on what lies outside a single path, so a
+# newline-joined buffer could change their result.
+_CONTEXT_SENSITIVE = re.compile(r"\\[AZ]|\(\?<?[=!]")
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+@dataclass(frozen=True)
+class PatternSet:
+    """Regexes searched as one alternation with `any(p.search(...))` results.
+
+    Plain matching uses non-capturing alternatives, which keep the regex
+    engine's literal-prefix scanning. `^`-anchored patterns form a separate
+    alternation tried only at the start of the text, since mixing them with
+    floating patterns would defeat both optimizations. Patterns that cannot
+    be combined safely (backreferences, conflicting inline flags, compiled
+    flags) fall back to one search per pattern.
+    """
+
+    patterns: tuple[Pattern[str], ...] = ()
+    _combined: bool = field(init=False, repr=False, compare=False)
+    _anchored: Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _floating: Pattern[str] | None = field(init=False, repr=False, compare=False)
+    _bulk: tuple[Pattern[str], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        anchored = floating = None
+        bulk: list[Pattern[str] | None] = []
+        combined = _combine(self.patterns, "(?:{pattern})") is not None
+        if combined:
+            starts = [
+                pattern for pattern in self.patterns if _is_start_anchored(pattern)
+            ]
+            anchored = _combine(starts, "(?:{pattern})", strip_anchor=True)
+            if anchored is None:
+                starts = []
+            floating = _combine(
+                [pattern for pattern in self.patterns if pattern not in starts],
+                "(?:{pattern})",
+            )
+            if not any(
+                _CONTEXT_SENSITIVE.search(pattern.pattern) for pattern in self.patterns
+            ):
+                bulk = [
+                    _combine(starts, "^(?:{pattern})", re.MULTILINE, strip_anchor=True),
+                    _combine(
+                        [pattern for pattern in self.patterns if pattern not in starts],
+                        "(?:{pattern})",
+                        re.MULTILINE,
+                    ),
+                ]
+        object.__setattr__(self, "_combined", combined)
+        object.__setattr__(self, "_anchored", anchored)
+        object.__setattr__(self, "_floating", floating)
+        object.__setattr__(
+            self, "_bulk", tuple(scan for scan in bulk if scan is not None)
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def search(self, text: str) -> bool:
+        """Return whether any pattern matches anywhere in `text`."""
+        if self._combined:
+            if self._anchored is not None and self._anchored.match(text):
+                return True
+            return (
+                self._floating is not None and self._floating.search(text) is not None
+            )
+        return any(pattern.search(text) for pattern in self.patterns)
+
+    def search_many(self, texts: Sequence[str]) -> list[bool]:
+        """Return `search(text)` for every text using bulk scans of a buffer.
+
+        Texts are joined with newlines and scanned once per alternation
+        (anchored, floating) in multiline mode; each match marks its line and
+        the scan resumes at the next line. A match that crosses a line
+        boundary is rechecked on its own line.
+        """
+        results = [False] * len(texts)
+        if not self.patterns or not texts:
+            return results
+        if not self._bulk or any("\n" in text for text in texts):
+            return [self.search(text) for text in texts]
+
+        buffer = "\n".join(texts)
+        starts: list[int] = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        for scan in self._bulk:
+            position = 0
+            while True:
+                match = scan.search(buffer, position)
+                if match is None:
+                    break
+                line = bisect_right(starts, match.start()) - 1
+                if match.end() <= starts[line] + len(texts[line]):
+                    results[line] = True
+                else:
+                    results[line] = self.search(texts[line])
+                if line + 1 == len(texts):
+                    break
+                position = starts[line + 1]
+        return results
+
+
+def _is_start_anchored(pattern: Pattern[str]) -> bool:
+    # Without alternation or inline groups, a leading `^` anchors every match
+    # at position 0, so the pattern can be tried with `match` alone.
+    source = pattern.pattern
+    return source.startswith("^") and "|" not in source and "(?" not in source
+
+
+def _combine(
+    patterns: Sequence[Pattern[str]],
+    template: str,
+    flags: int = 0,
+    *,
+    strip_anchor: bool = False,
+) -> Pattern[str] | None:
+    if not patterns:
+        return None
+    if any(
+        pattern.flags != _DEFAULT_FLAGS or _GROUP_REFERENCE.search(pattern.pattern)
+        for pattern in patterns
+    ):
+        return None
+    try:
+        return re.compile(
+            "|".join(
+                template.format(
+                    pattern=pattern.pattern[1:] if strip_anchor else pattern.pattern,
+                )
+                for pattern in patterns
+            ),
+            flags,
+        )
+    except re.error:
+        # e.g. inline global flags or duplicate group names across patterns.
+        return None
@@ -3,18 +3,44 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Literal, cast
+from typing import Callable, Iterator, Literal, cast
 
-from path2map.filtering import FilterConfig, filter_entries_with_ancestors
-from path2map.ignore import IgnoreConfig, PathEntry, filter_ignored_entries
+from path2map.columnar import ColumnarTreeModel, columnar_tree_from_entries
+from path2map.filtering import (
+    FilterConfig,
+    MetadataFilter,
+    compile_descend_predicate,
+)
+from path2map.ignore import IgnoreConfig
 from path2map.model import TreeModel
-from path2map.traversal import TraversalOptions, enumerate_entries, tree_from_entries
+from path2map.scancache import ScanCache
+from path2map.selection import SelectionStage, load_selection_stage
+from path2map.snapshot import iter_snapshot_entries, open_snapshot
+from path2map.sources import detect_source_format, prune_entries, read_export
+from path2map.traversal import (
+    MetadataStats,
+    TraversalOptions,
+    TraversedEntry,
+    attach_metadata,
+    iter_entries,
+    tree_from_entries,
+)
 
 
 @dataclass(frozen=True)
 class PipelineOptions:
-    """Options for the canonical logical-tree pipeline."""
+    """Options for the canonical logical-tree pipeline.
+
+    With `source` set, entries are read from a saved snapshot or a JSON or
+    CSV export (whose mtimes are parsed with `time_format`) instead of
+    scanning `directory`; ignore rules, filters, `max_depth`, and `details`
+    still apply. `snapshot` reads a snapshot the same way.
+
+    `cache` names a `ScanCache` file: unchanged directories are replayed from
+    it instead of rescanned, and it is rewritten once the scan completes.
+    """
 
     directory: str = "."
     max_depth: int | None = None
@@ -25,50 +51,193 @@ class PipelineOptions:
     p2mignore_path: str | None = None
     cli_ignore: str | None = None
     filters: list[str] = field(default_factory=list)
+    min_size: int | None = None
+    max_size: int | None = None
+    newer_than: datetime | None = None
+    older_than: datetime | None = None
     details: str = "none"
+    workers: int = 1
+    worker_mode: str = "thread"
+    stat_workers: int = 1
+    snapshot: str | None = None
+    source: str | None = None
+    time_format: str = "%Y-%m-%d %H:%M"
+    cache: str | None = None
 
 
-def build_logical_tree(options: PipelineOptions) -> TreeModel:
-    """Run the canonical pipeline and return the logical tree."""
-    symlink_mode = _resolve_symlink_mode(options.follow_symlinks, options.symlinks)
-    scan_root, entries, max_depth = enumerate_entries(
-        options.directory,
-        options=TraversalOptions(
-            max_depth=options.max_depth,
-            symlink_mode=symlink_mode,
-            collect_metadata=options.details != "none",
-        ),
+def build_logical_tree(
+    options: PipelineOptions, *, stats: MetadataStats | None = None
+) -> TreeModel:
+    """Run the canonical pipeline and return the logical tree.
+
+    `stats`, if given, is filled in with the time spent gathering `details`
+    metadata during a directory scan.
+    """
+    scan_root, entries, untrusted = _logical_entries(options, stats)
+    return tree_from_entries(
+        scan_root=scan_root,
+        entries=entries,
+        max_depth=options.max_depth,
+        validate=untrusted,
     )
 
-    path_entries = [
-        PathEntry(path=entry.path, is_dir=entry.is_dir) for entry in entries
-    ]
 
-    ignore_config = IgnoreConfig(
-        use_default_ignores=options.use_default_ignores,
-        p2mignore_enabled=options.p2mignore_enabled,
-        p2mignore_path=Path(options.p2mignore_path) if options.p2mignore_path else None,
-        cli_ignore=options.cli_ignore,
-    )
-    after_ignore = filter_ignored_entries(
-        path_entries,
+def build_columnar_tree(
+    options: PipelineOptions, *, stats: MetadataStats | None = None
+) -> ColumnarTreeModel:
+    """Run the canonical pipeline into the compact array-backed model."""
+    scan_root, entries, untrusted = _logical_entries(options, stats)
+    return columnar_tree_from_entries(
         scan_root=scan_root,
-        config=ignore_config,
+        entries=entries,
+        max_depth=options.max_depth,
+        validate=untrusted,
     )
 
-    after_filter = filter_entries_with_ancestors(
-        after_ignore,
-        config=FilterConfig(filters=options.filters),
+
+def iter_logical_entries(
+    options: PipelineOptions, *, stats: MetadataStats | None = None
+) -> Iterator[TraversedEntry]:
+    """Lazily yield the entries that survive the ignore and filter stages.
+
+    Entries arrive in the same deterministic preorder the logical tree uses,
+    without materializing the full scan. `stats` is filled in as entries are
+    consumed.
+    """
+    return _logical_entries(options, stats)[1]
+
+
+def _logical_entries(
+    options: PipelineOptions,
+    stats: MetadataStats | None = None,
+) -> tuple[Path, Iterator[TraversedEntry], bool]:
+    """Return the tree's scan root, its selected entries, and whether those
+    entries come from a JSON or CSV export and need validating."""
+    symlink_mode = _resolve_symlink_mode(options.follow_symlinks, options.symlinks)
+    if options.stat_workers < 1:
+        raise ValueError("stat_workers must be >= 1")
+    metadata_filter = MetadataFilter(
+        min_size=options.min_size,
+        max_size=options.max_size,
+        newer_than=options.newer_than,
+        older_than=options.older_than,
     )
 
-    kept_paths = {entry.path for entry in after_filter}
-    filtered_entries = [entry for entry in entries if entry.path in kept_paths]
+    if options.snapshot is not None and options.source is not None:
+        raise ValueError("snapshot and source cannot both be set")
+    source = options.snapshot if options.snapshot is not None else options.source
+    if source is not None and metadata_filter:
+        raise ValueError("size and time filters require a directory scan")
+    if source is not None and options.cache is not None:
+        raise ValueError("a scan cache requires a directory scan")
 
-    return tree_from_entries(
+    source_format = None if source is None else detect_source_format(source)
+    if options.snapshot is not None and source_format != "snapshot":
+        raise ValueError(f"not a path2map snapshot: {options.snapshot}")
+    if source_format == "snapshot":
+        with open_snapshot(cast(str, source)) as view:
+            scan_root = Path(view.scan_root)
+    else:
+        # Exports do not record where they were scanned, so `.p2mignore` is
+        # looked up in `directory` as for a scan.
+        scan_root = Path(options.directory).resolve()
+
+    # Ignore stages 2-4 run inside traversal so excluded directories are
+    # pruned before they are scanned; nothing below them can reach the tree.
+    selection = load_selection_stage(
         scan_root=scan_root,
-        entries=filtered_entries,
-        max_depth=max_depth,
+        ignore_config=IgnoreConfig(
+            use_default_ignores=options.use_default_ignores,
+            p2mignore_enabled=options.p2mignore_enabled,
+            p2mignore_path=(
+                Path(options.p2mignore_path) if options.p2mignore_path else None
+            ),
+            cli_ignore=options.cli_ignore,
+        ),
+        filter_config=FilterConfig(filters=options.filters),
+        files_only=bool(metadata_filter),
+    )
+    descend = compile_descend_predicate(options.filters)
+    if source_format == "snapshot":
+        return (
+            scan_root,
+            _iter_snapshot_entries(cast(str, source), options, selection, descend),
+            False,
+        )
+    if source_format is not None:
+        root_name, exported = read_export(
+            cast(str, source),
+            source_format=source_format,
+            time_format=options.time_format,
+            metadata=options.details != "none",
+        )
+        pruned = prune_entries(
+            exported,
+            max_depth=options.max_depth,
+            exclude=selection.exclude,
+            descend=descend,
+        )
+        # Exports may be hand-edited, unlike walker or snapshot output.
+        return Path(root_name), selection.select(pruned), True
+
+    cache = None if options.cache is None else ScanCache.load(options.cache)
+    entries = iter_entries(
+        options.directory,
+        options=TraversalOptions(
+            max_depth=options.max_depth,
+            symlink_mode=symlink_mode,
+            # Size and time bounds are checked from the stat the walk takes
+            # anyway, which then also supplies any requested details.
+            collect_metadata=bool(metadata_filter) and options.details != "none",
+            exclude=selection.exclude,
+            # Anchored literal filters also prune directories that cannot
+            # hold a match; ancestors of matches are always scanned.
+            descend=descend,
+            file_predicate=metadata_filter.matches if metadata_filter else None,
+            workers=options.workers,
+            worker_mode=_resolve_worker_mode(options.worker_mode),
+            cache=cache,
+        ),
     )
+    if cache is not None:
+        entries = _save_cache_when_done(entries, cache)
+    selected = selection.select(entries)
+    if options.details == "none":
+        return scan_root, selected, False
+    # Metadata is gathered only for entries that survived selection.
+    return (
+        scan_root,
+        attach_metadata(
+            options.directory, selected, workers=options.stat_workers, stats=stats
+        ),
+        False,
+    )
+
+
+def _iter_snapshot_entries(
+    path: str,
+    options: PipelineOptions,
+    selection: SelectionStage,
+    descend: Callable[[str], bool] | None,
+) -> Iterator[TraversedEntry]:
+    with open_snapshot(path) as view:
+        # Pruned subtrees are skipped by index, so their pages are never read.
+        entries = iter_snapshot_entries(
+            view,
+            max_depth=options.max_depth,
+            exclude=selection.exclude,
+            descend=descend,
+            metadata=options.details != "none",
+        )
+        yield from selection.select(entries)
+
+
+def _save_cache_when_done(
+    entries: Iterator[TraversedEntry], cache: ScanCache
+) -> Iterator[TraversedEntry]:
+    yield from entries
+    # Only a completed walk has listed every directory it will need next time.
+    cache.save()
 
 
 def _resolve_symlink_mode(
@@ -80,3 +249,9 @@ def _resolve_symlink_mode(
             raise ValueError("symlinks must be one of: skip, show, follow")
         return cast(Literal["skip", "show", "follow"], symlinks)
     return "follow" if follow_symlinks else "show"
+
+
+def _resolve_worker_mode(worker_mode: str) -> Literal["thread", "process"]:
+    if worker_mode not in {"thread", "process"}:
+        raise ValueError("worker_mode must be one of: thread, process")
+    return cast(Literal["thread", "process"], worker_mode)
@@ -0,0 +1,21 @@
+"""Formatting helpers shared by the renderers."""
+
+from __future__ import annotations
+
+
+def format_size(value: int, size_format: str) -> str:
+    """Return `value` bytes in `binary` (KiB) or `decimal` (KB) units."""
+    base = 1024 if size_format == "binary" else 1000
+    units = (
+        ("B", "KiB", "MiB", "GiB", "TiB")
+        if base == 1024
+        else ("B", "KB", "MB", "GB", "TB")
+    )
+    size = float(value)
+    for unit in units:
+        if size < base or unit == units[-1]:
+            if unit == "B":
+                return f"{int(size)} B"
+            return f"{size:.1f} {unit}"
+        size /= base
+    return f"{int(value)} B"
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
 import csv
 import io
 
-from path2map.model import TreeModel, TreeNode
+from path2map.model import NodeView, TreeView
+from path2map.timefmt import format_mtime
 
 
 @dataclass(frozen=True)
@@ -18,7 +18,7 @@ class CsvRenderOptions:
     time_format: str = "%Y-%m-%d %H:%M"
 
 
-def render_csv(model: TreeModel, *, options: CsvRenderOptions | None = None) -> str:
+def render_csv(model: TreeView, *, options: CsvRenderOptions | None = None) -> str:
     """Render the tree model into deterministic CSV rows."""
     opts = options or CsvRenderOptions()
 
@@ -26,10 +26,10 @@ def render_csv(model: TreeModel, *, options: CsvRenderOptions | None = None) ->
     writer = csv.writer(output, lineterminator="\n")
     writer.writerow(["path", "name", "type", "ext", "depth", "size", "mtime"])
 
-    for node in model.iter_preorder():
+    for node, path in model.iter_preorder_paths():
         writer.writerow(
             [
-                node.path,
+                path,
                 node.name,
                 node.type,
                 node.ext,
@@ -42,7 +42,7 @@ def render_csv(model: TreeModel, *, options: CsvRenderOptions | None = None) ->
     return output.getvalue().rstrip("\n")
 
 
-def _render_size(node: TreeNode, *, options: CsvRenderOptions) -> str:
+def _render_size(node: NodeView, *, options: CsvRenderOptions) -> str:
     if options.details not in {"size", "size,mtime"}:
         return ""
     if node.size is None:
@@ -50,13 +50,9 @@ def _render_size(node: TreeNode, *, options: CsvRenderOptions) -> str:
     return str(node.size)
 
 
-def _render_mtime(node: TreeNode, *, options: CsvRenderOptions) -> str:
+def _render_mtime(node: NodeView, *, options: CsvRenderOptions) -> str:
     if options.details not in {"mtime", "size,mtime"}:
         return ""
-    if node.mtime is None:
+    if node.mtime_ns is None:
         return ""
-    return _format_mtime(node.mtime, options.time_format)
-
-
-def _format_mtime(value: datetime, time_format: str) -> str:
-    return value.strftime(time_format)
+    return format_mtime(node.mtime_ns, options.time_format)
@@ -0,0 +1,141 @@
+"""Renderers for tree diffs."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import csv
+import io
+import json
+from typing import Any, Sequence
+
+from path2map.render.common import format_size
+from path2map.timefmt import format_mtime
+from path2map.treediff import TreeChange
+
+_MARKERS = {"added": "+", "removed": "-", "modified": "~"}
+
+
+@dataclass(frozen=True)
+class DiffRenderOptions:
+    """Options controlling diff metadata emission."""
+
+    details: str = "none"
+    time_format: str = "%Y-%m-%d %H:%M"
+    size_format: str = "binary"
+
+
+def render_diff_text(
+    changes: Sequence[TreeChange], *, options: DiffRenderOptions | None = None
+) -> str:
+    """Render one marked line per change, then a summary line.
+
+    Directories end in `/`; modifications show old and new values.
+    """
+    opts = options or DiffRenderOptions()
+    lines: list[str] = []
+    for change in changes:
+        line = f"{_MARKERS[change.change]} {change.path}"
+        if change.type == "directory":
+            line += "/"
+        details = _text_details(change, opts)
+        if details:
+            line += f" ({details})"
+        lines.append(line)
+    lines.append(_summary_line(changes))
+    return "\n".join(lines)
+
+
+def render_diff_json(
+    changes: Sequence[TreeChange], *, options: DiffRenderOptions | None = None
+) -> str:
+    """Render the changes and per-kind counts as deterministic JSON."""
+    opts = options or DiffRenderOptions()
+    include_size = opts.details in {"size", "size,mtime"}
+    include_mtime = opts.details in {"mtime", "size,mtime"}
+
+    items: list[dict[str, Any]] = []
+    for change in changes:
+        item: dict[str, Any] = {
+            "change": change.change,
+            "path": change.path,
+            "type": change.type,
+        }
+        if include_size:
+            item["old_size"] = change.old_size
+            item["new_size"] = change.new_size
+        if include_mtime:
+            item["old_mtime"] = _mtime_text(change.old_mtime_ns, opts) or None
+            item["new_mtime"] = _mtime_text(change.new_mtime_ns, opts) or None
+        items.append(item)
+    return json.dumps({"summary": _counts(changes), "changes": items}, indent=2)
+
+
+def render_diff_csv(
+    changes: Sequence[TreeChange], *, options: DiffRenderOptions | None = None
+) -> str:
+    """Render one CSV row per change."""
+    opts = options or DiffRenderOptions()
+    include_size = opts.details in {"size", "size,mtime"}
+    include_mtime = opts.details in {"mtime", "size,mtime"}
+
+    output = io.StringIO(newline="")
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(
+        ["change", "path", "type", "old_size", "new_size", "old_mtime", "new_mtime"]
+    )
+    for change in changes:
+        writer.writerow(
+            [
+                change.change,
+                change.path,
+                change.type,
+                _size_text(change.old_size) if include_size else "",
+                _size_text(change.new_size) if include_size else "",
+                _mtime_text(change.old_mtime_ns, opts) if include_mtime else "",
+                _mtime_text(change.new_mtime_ns, opts) if include_mtime else "",
+            ]
+        )
+    return output.getvalue().rstrip("\n")
+
+
+def _text_details(change: TreeChange, options: DiffRenderOptions) -> str:
+    if change.change != "modified":
+        return ""
+    parts: list[str] = []
+    if change.old_size != change.new_size:
+        parts.append(
+            f"size {_human_size(change.old_size, options)} -> "
+            f"{_human_size(change.new_size, options)}"
+        )
+    if change.old_mtime_ns != change.new_mtime_ns:
+        parts.append(
+            f"mtime {_mtime_text(change.old_mtime_ns, options) or '?'} -> "
+            f"{_mtime_text(change.new_mtime_ns, options) or '?'}"
+        )
+    return "; ".join(parts)
+
+
+def _summary_line(changes: Sequence[TreeChange]) -> str:
+    counts = _counts(changes)
+    return ", ".join(f"{count} {kind}" for kind, count in counts.items())
+
+
+def _counts(changes: Sequence[TreeChange]) -> dict[str, int]:
+    counts = dict.fromkeys(_MARKERS, 0)
+    for change in changes:
+        counts[change.change] += 1
+    return counts
+
+
+def _human_size(value: int | None, options: DiffRenderOptions) -> str:
+    return "?" if value is None else format_size(value, options.size_format)
+
+
+def _size_text(value: int | None) -> str:
+    return "" if value is None else str(value)
+
+
+def _mtime_text(mtime_ns: int | None, options: DiffRenderOptions) -> str:
+    if mtime_ns is None:
+        return ""
+    return format_mtime(mtime_ns, options.time_format)
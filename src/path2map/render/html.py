@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
 import html
+from typing import Sequence
 
-from path2map.model import TreeModel, TreeNode
+from path2map.model import NodeView, TreeView
+from path2map.render.common import format_size
+from path2map.timefmt import format_mtime
 
 
 @dataclass(frozen=True)
@@ -22,7 +24,7 @@ class HtmlRenderOptions:
     size_format: str = "binary"
 
 
-def render_html(model: TreeModel, *, options: HtmlRenderOptions | None = None) -> str:
+def render_html(model: TreeView, *, options: HtmlRenderOptions | None = None) -> str:
     """Render logical tree as a deterministic HTML document."""
     opts = options or HtmlRenderOptions()
     body = _render_node_list([model.root], options=opts, is_root=True)
@@ -51,37 +53,56 @@ def render_html(model: TreeModel, *, options: HtmlRenderOptions | None = None) -
 
 
 def _render_node_list(
-    nodes: list[TreeNode],
+    nodes: list[NodeView],
     *,
     options: HtmlRenderOptions,
     is_root: bool,
 ) -> str:
-    lines: list[str] = ['<ul class="tree">' if is_root else "<ul>"]
-    for node in nodes:
-        children = _visible_children(node, options=options)
-        label = html.escape(_format_label(node, is_root=is_root, options=options))
-
-        if children:
-            lines.append("  <li>")
-            lines.append(f'    <details open><summary class="node">{label}</summary>')
-            lines.append(
-                _indent(_render_node_list(children, options=options, is_root=False), 6)
-            )
-            lines.append("    </details>")
-            lines.append("  </li>")
-        else:
-            lines.append(f'  <li><span class="node">{label}</span></li>')
-
-    lines.append("</ul>")
+    lines: list[str] = []
+    # Explicit stack of pending nodes and closing tags, each with the base
+    # indentation of the <ul> it belongs to. Nested lists sit six spaces deeper
+    # than their parent list, as if each level were re-indented in turn.
+    stack: list[tuple[NodeView | str, int, bool]] = [("</ul>", 0, False)]
+    stack.extend((node, 0, is_root) for node in reversed(nodes))
+    _append_line(lines, '<ul class="tree">' if is_root else "<ul>", 0)
+    while stack:
+        item, indent, item_is_root = stack.pop()
+        if isinstance(item, str):
+            _append_line(lines, item, indent)
+            continue
+
+        children = _visible_children(item, options=options)
+        label = html.escape(_format_label(item, is_root=item_is_root, options=options))
+        if not children:
+            _append_line(lines, f'  <li><span class="node">{label}</span></li>', indent)
+            continue
+
+        _append_line(lines, "  <li>", indent)
+        _append_line(
+            lines, f'    <details open><summary class="node">{label}</summary>', indent
+        )
+        _append_line(lines, "<ul>", indent + 6)
+        stack.append(("  </li>", indent, False))
+        stack.append(("    </details>", indent, False))
+        stack.append(("</ul>", indent + 6, False))
+        stack.extend((child, indent + 6, False) for child in reversed(children))
+
     return "\n".join(lines)
 
 
-def _indent(text: str, spaces: int) -> str:
-    prefix = " " * spaces
-    return "\n".join(f"{prefix}{line}" for line in text.splitlines())
+def _append_line(lines: list[str], text: str, indent: int) -> None:
+    if not indent:
+        lines.append(text)
+        return
+    # Matches re-indenting nested markup line by line, including labels that
+    # contain line breaks.
+    prefix = " " * indent
+    lines.extend(f"{prefix}{line}" for line in text.splitlines())
 
 
-def _visible_children(node: TreeNode, *, options: HtmlRenderOptions) -> list[TreeNode]:
+def _visible_children(
+    node: NodeView, *, options: HtmlRenderOptions
+) -> Sequence[NodeView]:
     children = node.children
     if options.folders_only:
         children = [child for child in children if child.type == "directory"]
@@ -99,7 +120,7 @@ def _visible_children(node: TreeNode, *, options: HtmlRenderOptions) -> list[Tre
     return children
 
 
-def _format_label(node: TreeNode, *, is_root: bool, options: HtmlRenderOptions) -> str:
+def _format_label(node: NodeView, *, is_root: bool, options: HtmlRenderOptions) -> str:
     label = node.name if is_root else node.name
 
     if options.emojis:
@@ -124,36 +145,15 @@ def _format_label(node: TreeNode, *, is_root: bool, options: HtmlRenderOptions)
     return label
 
 
-def _format_details(node: TreeNode, *, options: HtmlRenderOptions) -> str:
+def _format_details(node: NodeView, *, options: HtmlRenderOptions) -> str:
     if options.details == "none":
         return ""
 
     values: list[str] = []
     if options.details in {"size", "size,mtime"} and node.size is not None:
-        values.append(_format_size(node.size, options.size_format))
+        values.append(format_size(node.size, options.size_format))
 
-    if options.details in {"mtime", "size,mtime"} and node.mtime is not None:
-        values.append(_format_mtime(node.mtime, options.time_format))
+    if options.details in {"mtime", "size,mtime"} and node.mtime_ns is not None:
+        values.append(format_mtime(node.mtime_ns, options.time_format))
 
     return ", ".join(values)
-
-
-def _format_mtime(value: datetime, time_format: str) -> str:
-    return value.strftime(time_format)
-
-
-def _format_size(value: int, size_format: str) -> str:
-    base = 1024 if size_format == "binary" else 1000
-    units = (
-        ("B", "KiB", "MiB", "GiB", "TiB")
-        if base == 1024
-        else ("B", "KB", "MB", "GB", "TB")
-    )
-    size = float(value)
-    for unit in units:
-        if size < base or unit == units[-1]:
-            if unit == "B":
-                return f"{int(size)} B"
-            return f"{size:.1f} {unit}"
-        size /= base
-    return f"{int(value)} B"
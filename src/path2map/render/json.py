@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
 import json
 
-from path2map.model import TreeModel, TreeNode
+from path2map.model import NodeView, TreeView
+from path2map.timefmt import format_mtime
+
+_INDENT = "  "
 
 
 @dataclass(frozen=True)
@@ -17,36 +19,63 @@ class JsonRenderOptions:
     time_format: str = "%Y-%m-%d %H:%M"
 
 
-def render_json(model: TreeModel, *, options: JsonRenderOptions | None = None) -> str:
+def render_json(model: TreeView, *, options: JsonRenderOptions | None = None) -> str:
     """Render the tree model to deterministic JSON text."""
     opts = options or JsonRenderOptions()
-    payload = _node_to_dict(model.root, options=opts)
-    return json.dumps(payload, indent=2, sort_keys=False)
-
-
-def _node_to_dict(node: TreeNode, *, options: JsonRenderOptions) -> dict[str, object]:
-    data: dict[str, object] = {
-        "path": node.path,
-        "name": node.name,
-        "type": node.type,
-        "ext": node.ext,
-        "depth": node.depth,
-        "children": [_node_to_dict(child, options=options) for child in node.children],
-    }
-
-    include_size = options.details in {"size", "size,mtime"}
-    include_mtime = options.details in {"mtime", "size,mtime"}
-
-    if include_size:
-        data["size"] = node.size
-
-    if include_mtime:
-        data["mtime"] = _format_mtime(node.mtime, options.time_format)
-
-    return data
-
-
-def _format_mtime(value: datetime | None, time_format: str) -> str | None:
-    if value is None:
-        return None
-    return value.strftime(time_format)
+    include_size = opts.details in {"size", "size,mtime"}
+    include_mtime = opts.details in {"mtime", "size,mtime"}
+    time_format = opts.time_format
+
+    # Written with an explicit stack instead of nested dicts and json.dumps,
+    # whose indented encoder recurses per tree level. The text is identical to
+    # json.dumps(nested, indent=2).
+    chunks: list[str] = []
+    # Items are either a (node, nesting level) pair to open, or literal text
+    # that closes a node once all of its children have been written.
+    stack: list[tuple[NodeView, int] | str] = [(model.root, 0)]
+    # Nodes are opened in preorder, so paths can be streamed alongside
+    # instead of derived per node.
+    paths = (path for _, path in model.iter_preorder_paths())
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            chunks.append(item)
+            continue
+
+        node, level = item
+        path = next(paths)
+        outer = _INDENT * (2 * level)
+        inner = outer + _INDENT
+        chunks.append(
+            f"{{\n"
+            f'{inner}"path": {json.dumps(path)},\n'
+            f'{inner}"name": {json.dumps(node.name)},\n'
+            f'{inner}"type": {json.dumps(node.type)},\n'
+            f'{inner}"ext": {json.dumps(node.ext)},\n'
+            f'{inner}"depth": {json.dumps(node.depth)},\n'
+            f'{inner}"children": '
+        )
+
+        closing = ""
+        if include_size:
+            closing += f',\n{inner}"size": {json.dumps(node.size)}'
+        if include_mtime:
+            mtime_ns = node.mtime_ns
+            mtime = None if mtime_ns is None else format_mtime(mtime_ns, time_format)
+            closing += f',\n{inner}"mtime": {json.dumps(mtime)}'
+        closing += f"\n{outer}}}"
+
+        children = node.children
+        if not children:
+            chunks.append("[]" + closing)
+            continue
+
+        child_indent = inner + _INDENT
+        chunks.append(f"[\n{child_indent}")
+        stack.append(f"\n{inner}]{closing}")
+        for index in range(len(children) - 1, -1, -1):
+            stack.append((children[index], level + 1))
+            if index:
+                stack.append(f",\n{child_indent}")
+
+    return "".join(chunks)
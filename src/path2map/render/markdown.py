@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from path2map.model import TreeModel
+from path2map.model import TreeView
 from path2map.render.text import TextRenderOptions, render_text
 
 
 def render_markdown(
-    model: TreeModel,
+    model: TreeView,
     *,
     options: TextRenderOptions | None = None,
 ) -> str:
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
 import re
 import sys
+from typing import Sequence
 
-from path2map.model import TreeModel, TreeNode
+from path2map.model import NodeView, TreeView
+from path2map.render.common import format_size
+from path2map.timefmt import format_mtime
 
 _ANSI_RESET = "\x1b[0m"
 _ANSI_DIRECTORY = "\x1b[1;34m"
@@ -85,21 +87,12 @@ class TextRenderOptions:
     details_style: str = "inline"
 
 
-def render_text(model: TreeModel, *, options: TextRenderOptions | None = None) -> str:
+def render_text(model: TreeView, *, options: TextRenderOptions | None = None) -> str:
     """Render a logical tree model to deterministic plain-text output."""
     opts = options or TextRenderOptions()
     use_color = _use_color(opts.color)
 
-    lines: list[_RenderLine] = []
-    _append_node_lines(
-        lines,
-        model.root,
-        prefix="",
-        is_last=True,
-        is_root=True,
-        options=opts,
-        use_color=use_color,
-    )
+    lines = _node_lines(model.root, options=opts, use_color=use_color)
 
     if opts.details_style == "columns":
         return _render_columns(lines)
@@ -107,48 +100,47 @@ def render_text(model: TreeModel, *, options: TextRenderOptions | None = None) -
     return "\n".join(line.inline_text for line in lines)
 
 
-def _append_node_lines(
-    lines: list[_RenderLine],
-    node: TreeNode,
+def _node_lines(
+    root: NodeView,
     *,
-    prefix: str,
-    is_last: bool,
-    is_root: bool,
     options: TextRenderOptions,
     use_color: bool,
-) -> None:
-    branch = "" if is_root else ("└── " if is_last else "├── ")
-    label = _format_label(node, is_root=is_root, options=options, use_color=use_color)
-    details_columns = _detail_columns(node, options=options)
-
-    inline = f"{prefix}{branch}{label}"
-    if options.details_style == "inline":
-        detail_items = [item for item in details_columns if item]
-        if detail_items:
-            inline = f"{inline} ({', '.join(detail_items)})"
-
-    lines.append(
-        _RenderLine(
-            inline_text=inline,
-            column_label=f"{prefix}{branch}{label}",
-            size_text=details_columns[0],
-            mtime_text=details_columns[1],
+) -> list[_RenderLine]:
+    lines: list[_RenderLine] = []
+    # Explicit (node, prefix, is_last, is_root) stack in place of recursion so
+    # arbitrarily deep trees render without hitting the recursion limit.
+    stack: list[tuple[NodeView, str, bool, bool]] = [(root, "", True, True)]
+    while stack:
+        node, prefix, is_last, is_root = stack.pop()
+        branch = "" if is_root else ("└── " if is_last else "├── ")
+        label = _format_label(
+            node, is_root=is_root, options=options, use_color=use_color
         )
-    )
-
-    next_prefix = "" if is_root else f"{prefix}{'    ' if is_last else '│   '}"
-    children = _visible_children(node, options=options)
-    for index, child in enumerate(children):
-        _append_node_lines(
-            lines,
-            child,
-            prefix=next_prefix,
-            is_last=index == len(children) - 1,
-            is_root=False,
-            options=options,
-            use_color=use_color,
+        details_columns = _detail_columns(node, options=options)
+
+        inline = f"{prefix}{branch}{label}"
+        if options.details_style == "inline":
+            detail_items = [item for item in details_columns if item]
+            if detail_items:
+                inline = f"{inline} ({', '.join(detail_items)})"
+
+        lines.append(
+            _RenderLine(
+                inline_text=inline,
+                column_label=f"{prefix}{branch}{label}",
+                size_text=details_columns[0],
+                mtime_text=details_columns[1],
+            )
         )
 
+        next_prefix = "" if is_root else f"{prefix}{'    ' if is_last else '│   '}"
+        children = _visible_children(node, options=options)
+        last_index = len(children) - 1
+        for index in range(last_index, -1, -1):
+            stack.append((children[index], next_prefix, index == last_index, False))
+
+    return lines
+
 
 def _render_columns(lines: list[_RenderLine]) -> str:
     label_width = max((_display_width(line.column_label) for line in lines), default=0)
@@ -163,7 +155,9 @@ def _render_columns(lines: list[_RenderLine]) -> str:
     return "\n".join(rendered)
 
 
-def _visible_children(node: TreeNode, *, options: TextRenderOptions) -> list[TreeNode]:
+def _visible_children(
+    node: NodeView, *, options: TextRenderOptions
+) -> Sequence[NodeView]:
     children = node.children
     if options.folders_only:
         children = [child for child in children if child.type == "directory"]
@@ -182,7 +176,7 @@ def _visible_children(node: TreeNode, *, options: TextRenderOptions) -> list[Tre
 
 
 def _format_label(
-    node: TreeNode,
+    node: NodeView,
     *,
     is_root: bool,
     options: TextRenderOptions,
@@ -214,7 +208,7 @@ def _format_label(
     return label
 
 
-def _detail_columns(node: TreeNode, *, options: TextRenderOptions) -> tuple[str, str]:
+def _detail_columns(node: NodeView, *, options: TextRenderOptions) -> tuple[str, str]:
     if options.details == "none":
         return "", ""
 
@@ -222,35 +216,14 @@ def _detail_columns(node: TreeNode, *, options: TextRenderOptions) -> tuple[str,
     mtime_text = ""
 
     if options.details in {"size", "size,mtime"} and node.size is not None:
-        size_text = _format_size(node.size, options.size_format)
+        size_text = format_size(node.size, options.size_format)
 
-    if options.details in {"mtime", "size,mtime"} and node.mtime is not None:
-        mtime_text = _format_mtime(node.mtime, options.time_format)
+    if options.details in {"mtime", "size,mtime"} and node.mtime_ns is not None:
+        mtime_text = format_mtime(node.mtime_ns, options.time_format)
 
     return size_text, mtime_text
 
 
-def _format_mtime(value: datetime, time_format: str) -> str:
-    return value.strftime(time_format)
-
-
-def _format_size(value: int, size_format: str) -> str:
-    base = 1024 if size_format == "binary" else 1000
-    units = (
-        ("B", "KiB", "MiB", "GiB", "TiB")
-        if base == 1024
-        else ("B", "KB", "MB", "GB", "TB")
-    )
-    size = float(value)
-    for unit in units:
-        if size < base or unit == units[-1]:
-            if unit == "B":
-                return f"{int(size)} B"
-            return f"{size:.1f} {unit}"
-        size /= base
-    return f"{int(value)} B"
-
-
 def _use_color(mode: str) -> bool:
     if mode == "always":
         return True
@@ -259,7 +232,7 @@ def _use_color(mode: str) -> bool:
     return sys.stdout.isatty()
 
 
-def _node_color(node: TreeNode) -> str | None:
+def _node_color(node: NodeView) -> str | None:
     if node.type == "directory":
         return _ANSI_DIRECTORY
 
@@ -0,0 +1,145 @@
+"""Persistent directory listings for incremental rescans.
+
+A `ScanCache` remembers each scanned directory's child names and kinds,
+keyed by the directory's `(st_dev, st_ino)` and validated by its
+`st_mtime_ns` and `st_ctime_ns`. Creating, deleting, or renaming a child
+updates its parent directory's mtime, so a directory whose stat still
+matches can replay its listing instead of calling `os.scandir`.
+
+The guarantee is deliberately narrow:
+
+- A directory's mtime only covers its direct children. Every directory is
+  still stat'ed on every run, and an unchanged parent says nothing about
+  the directories below it.
+- Writing to a file does not touch its directory, so file size and mtime
+  are never cached; they are read from a fresh `lstat` whenever needed.
+- A symlink's target can change without touching the directory holding the
+  link, so links are re-resolved on every replay.
+- Filesystems with coarse timestamps can change a directory twice within
+  one tick. Listings read within `_RACY_WINDOW_NS` of the directory's mtime
+  are not stored, so such a change always forces a rescan.
+- Filesystems that report no inode numbers, or whose device numbers change
+  between mounts, simply miss the cache.
+
+The file is the magic `b"P2MCACHE"`, a version byte, and a `marshal`-encoded
+dict. Only directories listed by the latest run are written back, so
+entries for deleted directories do not accumulate; a run restricted by
+`--max-depth` or ignore rules keeps only the part of the tree it visited.
+The file is local state to be trusted like the scanned tree itself.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+from pathlib import Path
+
+_MAGIC = b"P2MCACHE"
+_VERSION = 1
+# Widest directory timestamp granularity in common use (FAT's two seconds).
+_RACY_WINDOW_NS = 2_000_000_000
+
+# (st_dev, st_ino) -> (st_mtime_ns, st_ctime_ns, child names, child kinds).
+_Key = tuple[int, int]
+_Record = tuple[int, int, tuple[str, ...], bytes]
+
+
+class ScanCache:
+    """Directory listings reused across runs while their directory is unchanged.
+
+    `lookup` and `store` are called by the traversal's scanner, possibly
+    from several threads; `hits` and `misses` count lookups since loading.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = None if path is None else Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._previous: dict[_Key, _Record] = {}
+        self._current: dict[_Key, _Record] = {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> ScanCache:
+        """Read a cache file, starting empty if it is missing or outdated.
+
+        Raises `ValueError` for an existing file that is not a scan cache,
+        rather than later overwriting it.
+        """
+        cache = cls(path)
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            return cache
+        if not data.startswith(_MAGIC):
+            raise ValueError(f"not a path2map scan cache: {path}")
+        if data[len(_MAGIC) : len(_MAGIC) + 1] != bytes([_VERSION]):
+            return cache
+        try:
+            records = marshal.loads(data[len(_MAGIC) + 1 :])
+        except (EOFError, ValueError, TypeError):
+            # A truncated write only costs one cold run.
+            return cache
+        if isinstance(records, dict):
+            cache._previous = records
+        return cache
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def lookup(
+        self, stat_result: os.stat_result
+    ) -> tuple[tuple[str, ...], bytes] | None:
+        """Return the cached `(names, kinds)` of an unchanged directory."""
+        key = (stat_result.st_dev, stat_result.st_ino)
+        record = self._previous.get(key)
+        if (
+            record is None
+            or not stat_result.st_ino
+            or record[0] != stat_result.st_mtime_ns
+            or record[1] != stat_result.st_ctime_ns
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._current[key] = record
+        return record[2], record[3]
+
+    def store(
+        self,
+        stat_result: os.stat_result,
+        names: tuple[str, ...],
+        kinds: bytes,
+        *,
+        listed_at_ns: int,
+    ) -> None:
+        """Remember a listing read at `listed_at_ns`, after `stat_result`.
+
+        Directories modified too recently to rule out a same-tick change are
+        skipped and rescanned next time.
+        """
+        if not stat_result.st_ino:
+            return
+        if stat_result.st_mtime_ns >= listed_at_ns - _RACY_WINDOW_NS:
+            return
+        self._current[(stat_result.st_dev, stat_result.st_ino)] = (
+            stat_result.st_mtime_ns,
+            stat_result.st_ctime_ns,
+            names,
+            kinds,
+        )
+
+    def save(self, path: str | Path | None = None) -> None:
+        """Write the listings used or read by this run to `path`.
+
+        The file is replaced atomically, so an interrupted save leaves the
+        previous cache intact.
+        """
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise ValueError("scan cache has no path to save to")
+        temporary = target.with_name(target.name + ".tmp")
+        with open(temporary, "wb") as handle:
+            handle.write(_MAGIC + bytes([_VERSION]))
+            handle.write(marshal.dumps(self._current, 4))
+        os.replace(temporary, target)
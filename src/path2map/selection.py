@@ -0,0 +1,82 @@
+"""Fused ignore and include-filter selection over traversal records."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from path2map.filtering import FilterConfig, compile_filter_patterns
+from path2map.ignore import (
+    IgnoreConfig,
+    IgnoreMatcher,
+    load_ignore_matcher,
+    normalize_relative_path,
+)
+from path2map.patterns import PatternSet
+from path2map.traversal import TraversedEntry
+
+
+@dataclass(frozen=True)
+class SelectionStage:
+    """Ignore stages 2-4 followed by the include filter, in one pass.
+
+    Traversal calls `exclude` for every candidate before it is emitted or
+    scanned, so ignored directories are pruned. `select` then applies the
+    include filter to the surviving records in the same pass, keeping the
+    directories on the current path by depth so matches can retain them.
+    With `files_only`, directories never match on their own and are kept
+    only as ancestors of kept files (used when traversal already dropped
+    files by size or time).
+    """
+
+    ignore: IgnoreMatcher = field(default_factory=IgnoreMatcher)
+    filters: PatternSet = field(default_factory=PatternSet)
+    files_only: bool = False
+
+    def exclude(self, rel_path: str, is_dir: bool) -> bool:
+        """Return whether traversal should drop a candidate entry."""
+        return self.ignore.matches(rel_path, is_dir)
+
+    def select(self, entries: Iterable[TraversedEntry]) -> Iterator[TraversedEntry]:
+        """Yield preorder records kept by the include filter and its ancestors."""
+        if not self.filters and not self.files_only:
+            yield from entries
+            return
+
+        search = self.filters.search if self.filters else None
+        # Directories on the current path, indexed by depth - 1; the first
+        # `emitted` of them have already been yielded.
+        pending: list[TraversedEntry] = []
+        emitted = 0
+        for entry in entries:
+            del pending[entry.depth - 1 :]
+            emitted = min(emitted, len(pending))
+
+            if entry.is_dir and self.files_only:
+                matched = False
+            else:
+                matched = search is None or search(normalize_relative_path(entry.path))
+            if matched:
+                yield from pending[emitted:]
+                yield entry
+            if entry.is_dir:
+                pending.append(entry)
+            if matched:
+                emitted = len(pending)
+
+
+def load_selection_stage(
+    *,
+    scan_root: Path,
+    ignore_config: IgnoreConfig | None = None,
+    filter_config: FilterConfig | None = None,
+    files_only: bool = False,
+) -> SelectionStage:
+    """Load ignore rules and compile filters into a fused selection stage."""
+    filters = (filter_config or FilterConfig()).filters
+    return SelectionStage(
+        ignore=load_ignore_matcher(scan_root=scan_root, config=ignore_config),
+        filters=PatternSet(tuple(compile_filter_patterns(filters))),
+        files_only=files_only,
+    )
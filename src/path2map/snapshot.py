@@ -0,0 +1,607 @@
+"""Compact binary snapshots of scanned trees.
+
+A snapshot stores a tree in the columnar layout of `ColumnarTreeModel`, so
+reloading is a handful of buffer copies instead of a filesystem walk or a
+per-node decode, and `open_snapshot` can map the file and read only the
+nodes a query visits. The file is::
+
+    magic  b"P2MSNAP\\0"
+    varint version, node count, max_depth + 1 (0 = unlimited)
+    varint length + UTF-8 scan root
+    varint symlink count, then per link: varint node, varint length + UTF-8
+    columns, in `_COLUMNS` order: typecode byte, varint item count, zero
+        padding to an 8-byte boundary, then the items as fixed-width
+        little-endian values of the typecode's size (not varints)
+
+The `strings` column holds every interned name and extension as UTF-8
+separated by NUL bytes (which filenames cannot contain), with each string's
+start offset in `string_offsets`. Node columns hold parent indices, string
+ids, and metadata; metadata presence is packed into the `flags` bitfield.
+
+Nodes are numbered in preorder, so a subtree is the contiguous index range
+up to its `subtree_ends` entry. Child and sibling links are stored so a load
+copies them like any other column; depths follow from `parents` and are not
+stored: `read_snapshot` rebuilds them in one pass, and `SnapshotView`
+derives them per access.
+Each directory's children are listed by name in `sorted_children`, from
+`child_offsets[i]` to `child_offsets[i + 1]`, so paths resolve by binary
+search per level.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+import mmap
+from pathlib import Path
+import sys
+from types import TracebackType
+from typing import Callable, Iterator, Literal, Sequence, overload
+
+from path2map.columnar import (
+    _DIRECTORY,
+    _HAS_MTIME,
+    _HAS_SIZE,
+    _NO_NODE,
+    _SYMLINK,
+    _SYMLINK_CYCLE,
+    ColumnarColumns,
+    ColumnarNode,
+    ColumnarTreeModel,
+    columnar_tree_from_model,
+)
+from path2map.model import TreeView, _normalize_query
+from path2map.traversal import TraversedEntry
+
+_MAGIC = b"P2MSNAP\0"
+_VERSION = 3
+_ALIGNMENT = 8
+# Filenames come from `os.fsdecode`, so undecodable bytes are surrogates.
+_ENCODING_ERRORS = "surrogateescape"
+
+_Typecode = Literal["B", "i", "q"]
+# (name, typecode) in file order. Node columns match `ColumnarTreeModel`.
+_COLUMNS: tuple[tuple[str, _Typecode], ...] = (
+    ("strings", "B"),
+    ("string_offsets", "q"),
+    ("parents", "i"),
+    ("first_children", "i"),
+    ("next_siblings", "i"),
+    ("name_ids", "i"),
+    ("ext_ids", "i"),
+    ("flags", "B"),
+    ("sizes", "q"),
+    ("mtimes_ns", "q"),
+    ("subtree_ends", "i"),
+    ("child_offsets", "i"),
+    ("sorted_children", "i"),
+)
+# Columns holding exactly one item per node.
+_NODE_COLUMNS = frozenset(
+    ("parents", "first_children", "next_siblings", "name_ids", "ext_ids")
+    + ("flags", "sizes", "mtimes_ns", "subtree_ends")
+)
+
+
+@dataclass(frozen=True)
+class _Layout:
+    """Decoded header of a snapshot and the byte spans of its columns."""
+
+    node_count: int
+    max_depth: int | None
+    scan_root: str
+    symlink_targets: dict[int, str]
+    # name -> (typecode, byte offset, item count)
+    columns: dict[str, tuple[_Typecode, int, int]]
+
+
+def write_snapshot(model: TreeView, path: str | Path) -> None:
+    """Write `model` to `path` as a binary snapshot.
+
+    Object trees are converted to the columnar layout first; a
+    `ColumnarTreeModel` is written from its arrays directly unless appends
+    left its nodes out of preorder, in which case it is renumbered.
+    """
+    tree = (
+        model
+        if isinstance(model, ColumnarTreeModel)
+        else columnar_tree_from_model(model)
+    )
+    subtree_ends = _preorder_subtree_ends(tree)
+    if subtree_ends is None:
+        tree = columnar_tree_from_model(tree)
+        subtree_ends = _preorder_subtree_ends(tree)
+        assert subtree_ends is not None
+    child_offsets, sorted_children = _sorted_children(tree)
+
+    encoded = [text.encode("utf-8", _ENCODING_ERRORS) for text in tree.strings]
+    offsets = array("q", [0])
+    position = 0
+    for raw in encoded:
+        position += len(raw) + 1
+        offsets.append(position)
+    columns: dict[str, array[int] | bytes] = {
+        "strings": b"\0".join(encoded),
+        "string_offsets": offsets,
+        "parents": tree.parents,
+        "first_children": tree.first_children,
+        "next_siblings": tree.next_siblings,
+        "name_ids": tree.name_ids,
+        "ext_ids": tree.ext_ids,
+        "flags": tree.flags,
+        "sizes": tree.sizes,
+        "mtimes_ns": tree.mtimes_ns,
+        "subtree_ends": subtree_ends,
+        "child_offsets": child_offsets,
+        "sorted_children": sorted_children,
+    }
+
+    header = bytearray(_MAGIC)
+    _write_varint(header, _VERSION)
+    _write_varint(header, len(tree))
+    _write_varint(header, 0 if tree.max_depth is None else tree.max_depth + 1)
+    _write_text(header, tree.scan_root)
+    _write_varint(header, len(tree.symlink_targets))
+    for index, target in sorted(tree.symlink_targets.items()):
+        _write_varint(header, index)
+        _write_text(header, target)
+
+    with open(path, "wb") as handle:
+        written = handle.write(header)
+        for name, typecode in _COLUMNS:
+            data = columns[name]
+            prefix = bytearray(typecode.encode("ascii"))
+            _write_varint(prefix, len(data))
+            written += handle.write(prefix)
+            written += handle.write(bytes(-written % _ALIGNMENT))
+            if isinstance(data, bytes):
+                written += handle.write(data)
+                continue
+            if sys.byteorder == "big":
+                data = array(typecode, data)
+                data.byteswap()
+            written += handle.write(memoryview(data).cast("B"))
+
+
+def read_snapshot(path: str | Path) -> ColumnarTreeModel:
+    """Load a snapshot written by `write_snapshot` into a columnar tree."""
+    buffer = memoryview(Path(path).read_bytes())
+    layout = _read_layout(buffer)
+
+    def column(name: str) -> array[int]:
+        typecode, offset, count = layout.columns[name]
+        values = array(typecode)
+        values.frombytes(buffer[offset : offset + count * values.itemsize])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    _, offset, count = layout.columns["strings"]
+    blob = bytes(buffer[offset : offset + count])
+    string_count = layout.columns["string_offsets"][2] - 1
+    strings: list[str] = []
+    if string_count:
+        strings = blob.decode("utf-8", _ENCODING_ERRORS).split("\0")
+    if len(strings) != string_count:
+        raise ValueError("snapshot string table is corrupt")
+
+    parents = column("parents")
+    depths = _rebuild_depths(parents)
+    return ColumnarTreeModel(
+        scan_root=layout.scan_root,
+        max_depth=layout.max_depth,
+        strings=strings,
+        parents=parents,
+        first_children=column("first_children"),
+        next_siblings=column("next_siblings"),
+        depths=depths,
+        name_ids=column("name_ids"),
+        ext_ids=column("ext_ids"),
+        flags=column("flags"),
+        sizes=column("sizes"),
+        mtimes_ns=column("mtimes_ns"),
+        symlink_targets=layout.symlink_targets,
+        _string_ids=dict(zip(strings, range(len(strings)))),
+    )
+
+
+class SnapshotView(ColumnarColumns):
+    """A read-only `TreeView` over a memory-mapped snapshot.
+
+    Columns are views of the mapping and names are decoded on first use, so
+    opening is constant time and queries fault in only the pages holding
+    the nodes they visit. Close the view (or use it as a context manager)
+    once no node views are needed.
+    """
+
+    __slots__ = (
+        "scan_root",
+        "max_depth",
+        "strings",
+        "parents",
+        "first_children",
+        "next_siblings",
+        "depths",
+        "name_ids",
+        "ext_ids",
+        "flags",
+        "sizes",
+        "mtimes_ns",
+        "symlink_targets",
+        "subtree_ends",
+        "child_offsets",
+        "sorted_children",
+        "_mapping",
+        "_views",
+    )
+
+    def __init__(self, path: str | Path) -> None:
+        with open(path, "rb") as handle:
+            self._mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        try:
+            buffer = self._track(memoryview(self._mapping))
+            layout = _read_layout(buffer)
+        except BaseException:
+            self.close()
+            raise
+
+        def column(name: str) -> Sequence[int]:
+            typecode, offset, count = layout.columns[name]
+            span = buffer[offset : offset + count * array(typecode).itemsize]
+            if sys.byteorder == "big":
+                values = array(typecode, span.tobytes())
+                values.byteswap()
+                return values
+            return self._track(span.cast(typecode))
+
+        self.scan_root = layout.scan_root
+        self.max_depth = layout.max_depth
+        self.symlink_targets = layout.symlink_targets
+        _, offset, count = layout.columns["strings"]
+        self.strings: Sequence[str] = _MappedStrings(
+            self._track(buffer[offset : offset + count]), column("string_offsets")
+        )
+        self.parents = column("parents")
+        self.name_ids = column("name_ids")
+        self.ext_ids = column("ext_ids")
+        self.flags = column("flags")
+        self.sizes = column("sizes")
+        self.mtimes_ns = column("mtimes_ns")
+        self.subtree_ends = column("subtree_ends")
+        self.first_children = column("first_children")
+        self.next_siblings = column("next_siblings")
+        self.depths = _Depths(self.parents)
+        self.child_offsets = column("child_offsets")
+        self.sorted_children = column("sorted_children")
+
+    def __enter__(self) -> SnapshotView:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def find(self, path: str) -> ColumnarNode | None:
+        """Return the node at relative POSIX `path`, or `None` if absent."""
+        key = _normalize_query(path)
+        index: int | None = 0
+        if key != ".":
+            for name in key.split("/"):
+                assert index is not None
+                index = self.child_index(index, name)
+                if index is None:
+                    return None
+        assert index is not None
+        return ColumnarNode(self, index)
+
+    def child_index(self, parent: int, name: str) -> int | None:
+        """Return the index of `parent`'s child called `name`, if any."""
+        low = self.child_offsets[parent]
+        high = self.child_offsets[parent + 1]
+        children = self.sorted_children
+        strings = self.strings
+        name_ids = self.name_ids
+        position = bisect_left(
+            children, name, low, high, key=lambda child: strings[name_ids[child]]
+        )
+        if position < high and strings[name_ids[children[position]]] == name:
+            return children[position]
+        return None
+
+    def close(self) -> None:
+        """Release the column views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mapping.close()
+
+    def _track(self, view: memoryview) -> memoryview:
+        # Exported views must be released before the mapping can close.
+        self._views.append(view)
+        return view
+
+
+class _MappedStrings(Sequence[str]):
+    """The snapshot string table, decoding each entry on first access."""
+
+    __slots__ = ("_blob", "_offsets", "_decoded")
+
+    def __init__(self, blob: memoryview, offsets: Sequence[int]) -> None:
+        self._blob = blob
+        self._offsets = offsets
+        self._decoded: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(len(self)))]
+        text = self._decoded.get(index)
+        if text is None:
+            start = self._offsets[index]
+            # Each entry is followed by a NUL separator.
+            end = self._offsets[index + 1] - 1
+            text = bytes(self._blob[start:end]).decode("utf-8", _ENCODING_ERRORS)
+            self._decoded[index] = text
+        return text
+
+
+class _Depths(Sequence[int]):
+    """Node depths, counted along the parent chain."""
+
+    __slots__ = ("_parents",)
+
+    def __init__(self, parents: Sequence[int]) -> None:
+        self._parents = parents
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]: ...
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(len(self)))]
+        if not 0 <= index < len(self._parents):
+            raise IndexError("node index out of range")
+        depth = 0
+        parents = self._parents
+        while index > 0:
+            index = parents[index]
+            depth += 1
+        return depth
+
+
+def is_snapshot(path: str | Path) -> bool:
+    """Return whether the file at `path` starts with the snapshot magic."""
+    with open(path, "rb") as handle:
+        return handle.read(len(_MAGIC)) == _MAGIC
+
+
+def open_snapshot(path: str | Path) -> SnapshotView:
+    """Memory-map a snapshot for lazy, random-access reads."""
+    return SnapshotView(path)
+
+
+def iter_snapshot_entries(
+    view: SnapshotView,
+    *,
+    max_depth: int | None = None,
+    exclude: Callable[[str, bool], bool] | None = None,
+    descend: Callable[[str], bool] | None = None,
+    metadata: bool = True,
+) -> Iterator[TraversedEntry]:
+    """Yield a snapshot's nodes as traversal records, in preorder.
+
+    Mirrors the walker's pruning: excluded entries, directories at
+    `max_depth`, and directories `descend` rejects are not expanded, and
+    their subtrees are skipped by index without being read. With
+    `metadata=False` the size and mtime columns are not touched.
+    """
+    strings = view.strings
+    name_ids = view.name_ids
+    ext_ids = view.ext_ids
+    parents = view.parents
+    flags = view.flags
+    symlink_targets = view.symlink_targets
+    subtree_ends = view.subtree_ends
+    # Open directories on the current path and their path prefixes; a
+    # node's depth is the number of directories open above it.
+    open_dirs = [0]
+    prefixes = [""]
+    index = 1
+    count = len(view)
+    while index < count:
+        parent = parents[index]
+        while open_dirs[-1] != parent:
+            open_dirs.pop()
+            prefixes.pop()
+        depth = len(open_dirs)
+        name = strings[name_ids[index]]
+        path = prefixes[-1] + name
+        bits = flags[index]
+        is_dir = bool(bits & _DIRECTORY)
+        if exclude is not None and exclude(path, is_dir):
+            index = subtree_ends[index]
+            continue
+
+        size = mtime_ns = None
+        if metadata and not is_dir:
+            if bits & _HAS_SIZE:
+                size = view.sizes[index]
+            if bits & _HAS_MTIME:
+                mtime_ns = view.mtimes_ns[index]
+        yield TraversedEntry(
+            path,
+            name,
+            is_dir,
+            depth,
+            "" if is_dir else strings[ext_ids[index]],
+            is_symlink=bool(bits & _SYMLINK),
+            symlink_target=symlink_targets.get(index),
+            symlink_cycle=bool(bits & _SYMLINK_CYCLE),
+            size=size,
+            mtime_ns=mtime_ns,
+        )
+
+        if is_dir and (
+            (max_depth is not None and depth >= max_depth)
+            or (descend is not None and not descend(path))
+        ):
+            index = subtree_ends[index]
+            continue
+        if is_dir:
+            open_dirs.append(index)
+            prefixes.append(f"{path}/")
+        index += 1
+
+
+def _preorder_subtree_ends(tree: ColumnarTreeModel) -> array[int] | None:
+    """Return each node's subtree end index, or None if not in preorder."""
+    count = len(tree)
+    parents = tree.parents
+    # Appends always place children after their parent, so a reverse sweep
+    # propagates the furthest descendant up to every ancestor.
+    ends = array("i", range(1, count + 1))
+    for index in range(count - 1, 0, -1):
+        parent = parents[index]
+        if ends[index] > ends[parent]:
+            ends[parent] = ends[index]
+    # In preorder a first child directly follows its parent and each next
+    # sibling starts where the previous sibling's subtree ends.
+    first_children = tree.first_children
+    next_siblings = tree.next_siblings
+    for index in range(count):
+        child = first_children[index]
+        if child != _NO_NODE and child != index + 1:
+            return None
+        sibling = next_siblings[index]
+        if sibling != _NO_NODE and sibling != ends[index]:
+            return None
+    return ends
+
+
+def _rebuild_depths(parents: array[int]) -> array[int]:
+    """Return the depth column; parents always precede their children."""
+    depths = [0] * len(parents)
+    for index in range(1, len(parents)):
+        depths[index] = depths[parents[index]] + 1
+    return array("i", depths)
+
+
+def _sorted_children(tree: ColumnarTreeModel) -> tuple[array[int], array[int]]:
+    """Return per-node child offsets and children ordered by name."""
+    strings = tree.strings
+    name_ids = tree.name_ids
+    first_children = tree.first_children
+    next_siblings = tree.next_siblings
+    offsets = array("i")
+    ordered = array("i")
+    for index in range(len(tree)):
+        offsets.append(len(ordered))
+        child = first_children[index]
+        if child == _NO_NODE:
+            continue
+        named: list[tuple[str, int]] = []
+        while child != _NO_NODE:
+            named.append((strings[name_ids[child]], child))
+            child = next_siblings[child]
+        named.sort()
+        ordered.extend(child for _, child in named)
+    offsets.append(len(ordered))
+    return offsets, ordered
+
+
+def _read_layout(buffer: memoryview) -> _Layout:
+    if bytes(buffer[: len(_MAGIC)]) != _MAGIC:
+        raise ValueError("not a path2map snapshot")
+    offset = len(_MAGIC)
+    version, offset = _read_varint(buffer, offset)
+    if version != _VERSION:
+        raise ValueError(f"unsupported snapshot version: {version}")
+    node_count, offset = _read_varint(buffer, offset)
+    max_depth, offset = _read_varint(buffer, offset)
+    scan_root, offset = _read_text(buffer, offset)
+    link_count, offset = _read_varint(buffer, offset)
+    symlink_targets: dict[int, str] = {}
+    for _ in range(link_count):
+        index, offset = _read_varint(buffer, offset)
+        symlink_targets[index], offset = _read_text(buffer, offset)
+
+    columns: dict[str, tuple[_Typecode, int, int]] = {}
+    for name, typecode in _COLUMNS:
+        if offset >= len(buffer) or chr(buffer[offset]) != typecode:
+            raise ValueError(f"snapshot column {name!r} is corrupt")
+        count, offset = _read_varint(buffer, offset + 1)
+        offset += -offset % _ALIGNMENT
+        columns[name] = (typecode, offset, count)
+        offset += count * array(typecode).itemsize
+    if offset != len(buffer):
+        raise ValueError("snapshot is truncated or has trailing data")
+    for name in _NODE_COLUMNS:
+        if columns[name][2] != node_count:
+            raise ValueError(f"snapshot column {name!r} is corrupt")
+    if columns["child_offsets"][2] != node_count + 1 or columns["sorted_children"][
+        2
+    ] != max(node_count - 1, 0):
+        raise ValueError("snapshot directory index is corrupt")
+
+    return _Layout(
+        node_count=node_count,
+        max_depth=None if max_depth == 0 else max_depth - 1,
+        scan_root=scan_root,
+        symlink_targets=symlink_targets,
+        columns=columns,
+    )
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buffer: memoryview, offset: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(buffer):
+            raise ValueError("snapshot is truncated")
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _write_text(out: bytearray, text: str) -> None:
+    raw = text.encode("utf-8", _ENCODING_ERRORS)
+    _write_varint(out, len(raw))
+    out += raw
+
+
+def _read_text(buffer: memoryview, offset: int) -> tuple[str, int]:
+    length, offset = _read_varint(buffer, offset)
+    end = offset + length
+    if end > len(buffer):
+        raise ValueError("snapshot is truncated")
+    return bytes(buffer[offset:end]).decode("utf-8", _ENCODING_ERRORS), end
@@ -0,0 +1,267 @@
+"""Rebuild traversal records from previously written path2map outputs.
+
+JSON and CSV exports list every node with its path, type, and depth in
+preorder, so they can stand in for a filesystem walk. Symlink markers are
+not part of either format, and `mtime` values are parsed back with the time
+format they were written with.
+"""
+
+from __future__ import annotations
+
+import csv
+from datetime import datetime
+import json
+from pathlib import Path
+import re
+from typing import Any, Callable, Iterator, Literal, cast
+
+from path2map.snapshot import is_snapshot
+from path2map.timefmt import ns_from_datetime
+from path2map.traversal import TraversedEntry
+
+SourceFormat = Literal["snapshot", "json", "csv"]
+
+_CSV_HEADER = ["path", "name", "type", "ext", "depth", "size", "mtime"]
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_JSON_STRING = re.compile(r'"(?:[^"\\\x00-\x1f]|\\.)*"')
+_JSON_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+_JSON_LITERALS = {"true": True, "false": False, "null": None}
+
+
+def detect_source_format(path: str | Path) -> SourceFormat:
+    """Identify a saved snapshot, JSON export, or CSV export by its contents."""
+    if is_snapshot(path):
+        return "snapshot"
+    with open(path, "rb") as handle:
+        head = handle.read(len(",".join(_CSV_HEADER)) + 2).decode("utf-8", "replace")
+    if head.lstrip().startswith("{"):
+        return "json"
+    if head.partition("\n")[0].rstrip("\r") == ",".join(_CSV_HEADER):
+        return "csv"
+    raise ValueError(f"not a path2map snapshot, JSON, or CSV export: {path}")
+
+
+def read_export(
+    path: str | Path,
+    *,
+    source_format: Literal["json", "csv"],
+    time_format: str = "%Y-%m-%d %H:%M",
+    metadata: bool = True,
+) -> tuple[str, Iterator[TraversedEntry]]:
+    """Return the root name and preorder records of a JSON or CSV export.
+
+    With `metadata=False`, size and mtime columns are ignored.
+    """
+    if source_format == "json":
+        with open(path, encoding="utf-8") as handle:
+            text = handle.read()
+        try:
+            document = json.loads(text)
+        except RecursionError:
+            # The C decoder recurses per nesting level; trees deeper than the
+            # recursion limit are parsed with an explicit stack instead.
+            document = _load_nested_json(text)
+        if not isinstance(document, dict) or document.get("type") != "directory":
+            raise ValueError(f"not a path2map JSON export: {path}")
+        return str(document["name"]), _iter_json(document, time_format, metadata)
+
+    with open(path, encoding="utf-8", newline="") as handle:
+        rows = csv.reader(handle)
+        header = next(rows, None)
+        root = next(rows, None)
+    if header != _CSV_HEADER or root is None or root[0] != ".":
+        raise ValueError(f"not a path2map CSV export: {path}")
+    return root[1], _iter_csv(path, time_format, metadata)
+
+
+def prune_entries(
+    entries: Iterator[TraversedEntry],
+    *,
+    max_depth: int | None = None,
+    exclude: Callable[[str, bool], bool] | None = None,
+    descend: Callable[[str], bool] | None = None,
+) -> Iterator[TraversedEntry]:
+    """Apply the walker's pruning to a preorder record stream.
+
+    Excluded entries are dropped with everything below them; directories at
+    `max_depth` or rejected by `descend` are kept but not expanded.
+    """
+    # Depth of the directory whose remaining descendants are being skipped.
+    pruned_depth: int | None = None
+    for entry in entries:
+        if pruned_depth is not None:
+            if entry.depth > pruned_depth:
+                continue
+            pruned_depth = None
+        if exclude is not None and exclude(entry.path, entry.is_dir):
+            pruned_depth = entry.depth
+            continue
+        yield entry
+        if entry.is_dir and (
+            (max_depth is not None and entry.depth >= max_depth)
+            or (descend is not None and not descend(entry.path))
+        ):
+            pruned_depth = entry.depth
+
+
+def _iter_json(
+    document: dict[str, Any], time_format: str, metadata: bool
+) -> Iterator[TraversedEntry]:
+    stack = list(reversed(_json_children(document)))
+    while stack:
+        node = stack.pop()
+        try:
+            is_dir = node["type"] == "directory"
+            entry = TraversedEntry(
+                node["path"],
+                node["name"],
+                is_dir,
+                node["depth"],
+                "" if is_dir else node["ext"],
+                size=node.get("size") if metadata else None,
+                mtime_ns=(
+                    _parse_mtime(node.get("mtime"), time_format) if metadata else None
+                ),
+            )
+        except (KeyError, TypeError):
+            raise ValueError("malformed path2map JSON export") from None
+        yield entry
+        stack.extend(reversed(_json_children(node)))
+
+
+def _load_nested_json(text: str) -> Any:
+    """Parse JSON text like `json.loads`, to any nesting depth."""
+    skip = _skip_whitespace
+    # Open containers, and for objects the key awaiting its value.
+    containers: list[dict[str, Any] | list[Any]] = []
+    keys: list[str] = []
+    pos = skip(text, 0)
+
+    def key_at(pos: int) -> tuple[str, int]:
+        key, pos = _json_string(text, pos)
+        pos = skip(text, pos)
+        if text[pos : pos + 1] != ":":
+            raise _json_error("expected ':'", pos)
+        return key, skip(text, pos + 1)
+
+    while True:
+        value: Any
+        char = text[pos : pos + 1]
+        if char in "{[" and char:
+            pos = skip(text, pos + 1)
+            if text[pos : pos + 1] == ("}" if char == "{" else "]"):
+                value = {} if char == "{" else []
+                pos += 1
+            elif char == "{":
+                key, pos = key_at(pos)
+                containers.append({})
+                keys.append(key)
+                continue
+            else:
+                containers.append([])
+                keys.append("")
+                continue
+        elif char == '"':
+            value, pos = _json_string(text, pos)
+        else:
+            number = _JSON_NUMBER.match(text, pos)
+            if number is not None:
+                literal = number.group()
+                fraction, exponent = number.groups()
+                value = float(literal) if fraction or exponent else int(literal)
+                pos = number.end()
+            else:
+                word = next(
+                    (word for word in _JSON_LITERALS if text.startswith(word, pos)),
+                    None,
+                )
+                if word is None:
+                    raise _json_error("expected a value", pos)
+                value = _JSON_LITERALS[word]
+                pos += len(word)
+
+        # Store the value, closing every container it completes.
+        while True:
+            pos = skip(text, pos)
+            if not containers:
+                if pos != len(text):
+                    raise _json_error("extra data", pos)
+                return value
+            container = containers[-1]
+            if isinstance(container, dict):
+                container[keys[-1]] = value
+            else:
+                container.append(value)
+            char = text[pos : pos + 1]
+            if char == ",":
+                pos = skip(text, pos + 1)
+                if isinstance(container, dict):
+                    keys[-1], pos = key_at(pos)
+                break
+            if char != ("}" if isinstance(container, dict) else "]") or not char:
+                raise _json_error("expected ',' or a closing bracket", pos)
+            pos += 1
+            value = containers.pop()
+            keys.pop()
+
+
+def _json_string(text: str, pos: int) -> tuple[str, int]:
+    match = _JSON_STRING.match(text, pos)
+    if match is None:
+        raise _json_error("expected a string", pos)
+    # One C-level decode per string handles every escape sequence.
+    return json.loads(match.group()), match.end()
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    # The pattern also matches the empty string, so it always matches.
+    return cast("re.Match[str]", _JSON_WHITESPACE.match(text, pos)).end()
+
+
+def _json_error(message: str, pos: int) -> ValueError:
+    return ValueError(f"malformed path2map JSON export: {message} at offset {pos}")
+
+
+def _json_children(node: dict[str, Any]) -> list[dict[str, Any]]:
+    children = node.get("children", [])
+    if not isinstance(children, list):
+        raise ValueError("malformed path2map JSON export")
+    return children
+
+
+def _iter_csv(
+    path: str | Path, time_format: str, metadata: bool
+) -> Iterator[TraversedEntry]:
+    with open(path, encoding="utf-8", newline="") as handle:
+        rows = csv.reader(handle)
+        # Header and root rows were validated by `read_export`.
+        next(rows)
+        next(rows)
+        for row in rows:
+            try:
+                rel_path, name, node_type, ext, depth, size, mtime = row
+                is_dir = node_type == "directory"
+                entry = TraversedEntry(
+                    rel_path,
+                    name,
+                    is_dir,
+                    int(depth),
+                    ext,
+                    size=int(size) if metadata and size else None,
+                    mtime_ns=_parse_mtime(mtime, time_format) if metadata else None,
+                )
+            except ValueError as exc:
+                raise ValueError(f"malformed path2map CSV row {row!r}: {exc}") from None
+            yield entry
+
+
+def _parse_mtime(value: str | None, time_format: str) -> int | None:
+    if not value:
+        return None
+    try:
+        return ns_from_datetime(datetime.strptime(value, time_format))
+    except ValueError:
+        raise ValueError(
+            f"mtime {value!r} does not match time format {time_format!r}"
+        ) from None
@@ -0,0 +1,88 @@
+"""Nanosecond modification times and memoized formatting for renderers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import re
+
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_MINUTE = 60 * _NS_PER_SECOND
+# strftime directives (after optional platform flags such as `%-d`) whose
+# text can change within a minute, and within a second.
+_DIRECTIVE = re.compile(r"%[-#_^0]*([A-Za-z%+])")
+_SECOND_DIRECTIVES = frozenset("STXcrs+")
+_SUBSECOND_DIRECTIVES = frozenset("f")
+# Bounds formatter memory when timestamps are spread widely.
+_CACHE_LIMIT = 65536
+# 1973-01-01 UTC: from here on every tz database zone uses a whole-minute
+# UTC offset, so local minute and second boundaries align with epoch ones.
+_ALIGNED_SINCE_NS = 94_694_400 * _NS_PER_SECOND
+
+
+def ns_from_datetime(value: datetime) -> int:
+    """Convert a datetime to integer epoch nanoseconds without float loss."""
+    # Whole seconds round-trip exactly through `timestamp()`; microseconds
+    # are added separately.
+    seconds = int(value.replace(microsecond=0).timestamp())
+    return seconds * _NS_PER_SECOND + value.microsecond * 1000
+
+
+def datetime_from_ns(value: int) -> datetime:
+    """Convert epoch nanoseconds to a naive local datetime."""
+    seconds, remainder = divmod(value, _NS_PER_SECOND)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000)
+
+
+@dataclass(frozen=True)
+class MtimeFormatter:
+    """`strftime` over `st_mtime_ns` values, memoized per time bucket.
+
+    Every timestamp within one bucket formats to the same text, so each
+    bucket is formatted once: per minute unless `time_format` shows seconds
+    (per second) or fractions (not memoized). Buckets rely on the local UTC
+    offset being whole minutes, which holds for every zone since 1973;
+    earlier timestamps are formatted directly.
+    """
+
+    time_format: str
+    _bucket_ns: int = field(init=False, repr=False, compare=False)
+    _cache: dict[int, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        directives = set(_DIRECTIVE.findall(self.time_format))
+        if directives & _SUBSECOND_DIRECTIVES:
+            bucket_ns = 0
+        elif directives & _SECOND_DIRECTIVES:
+            bucket_ns = _NS_PER_SECOND
+        else:
+            bucket_ns = _NS_PER_MINUTE
+        object.__setattr__(self, "_bucket_ns", bucket_ns)
+        object.__setattr__(self, "_cache", {})
+
+    def format(self, mtime_ns: int) -> str:
+        """Return `mtime_ns` rendered with `time_format` in local time."""
+        bucket_ns = self._bucket_ns
+        if not bucket_ns or mtime_ns < _ALIGNED_SINCE_NS:
+            return datetime_from_ns(mtime_ns).strftime(self.time_format)
+
+        bucket = mtime_ns // bucket_ns
+        text = self._cache.get(bucket)
+        if text is None:
+            if len(self._cache) >= _CACHE_LIMIT:
+                self._cache.clear()
+            start = datetime.fromtimestamp(bucket * bucket_ns // _NS_PER_SECOND)
+            text = start.strftime(self.time_format)
+            self._cache[bucket] = text
+        return text
+
+
+_FORMATTERS: dict[str, MtimeFormatter] = {}
+
+
+def format_mtime(mtime_ns: int, time_format: str) -> str:
+    """Format `mtime_ns` with the shared memoized formatter for the format."""
+    formatter = _FORMATTERS.get(time_format)
+    if formatter is None:
+        formatter = _FORMATTERS.setdefault(time_format, MtimeFormatter(time_format))
+    return formatter.format(mtime_ns)
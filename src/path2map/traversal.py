@@ -2,31 +2,67 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime
 import os
 from pathlib import Path
-from typing import Callable, Iterable, Literal
+import time
+from typing import Callable, Iterable, Iterator, Literal, NamedTuple, cast
 
-from path2map.model import TreeModel, TreeNode
+from path2map.model import _LEAF_CHILDREN, TreeModel, TreeNode
+from path2map.scancache import ScanCache
+from path2map.timefmt import datetime_from_ns
+from path2map.util import gc_paused
 
 SymlinkMode = Literal["skip", "show", "follow"]
+WorkerMode = Literal["thread", "process"]
 SortKey = Callable[[os.DirEntry[str]], tuple[int, str, str]]
+ExcludePredicate = Callable[[str, bool], bool]
+DescendPredicate = Callable[[str], bool]
+FilePredicate = Callable[[os.stat_result], bool]
 
 
 @dataclass(frozen=True)
 class TraversalOptions:
-    """Options controlling traversal behavior."""
+    """Options controlling traversal behavior.
+
+    `exclude` is called with each entry's relative path and directory flag;
+    excluded entries are skipped and excluded directories are never scanned.
+    `descend` is called with a directory's relative path; when it returns
+    False the directory is still emitted but its contents are not scanned.
+    `file_predicate` is called with each file's `lstat` result, taken from the
+    `DirEntry` stat cache; files it rejects, or that cannot be stat'ed, are
+    skipped.
+
+    With `workers` > 1, subdirectory listings are prefetched on a thread pool
+    while entries are still emitted and cycle-checked in sequential preorder.
+    `worker_mode="process"` instead enumerates whole subtree shards in worker
+    processes; `exclude` and `sort_key` must then be picklable.
+
+    With a `cache`, directories whose stat matches a cached listing are not
+    rescanned; see `path2map.scancache` for what that does and does not
+    detect. The cache cannot be shared with worker processes.
+    """
 
     max_depth: int | None = None
     symlink_mode: SymlinkMode = "show"
     sort_key: SortKey | None = None
     collect_metadata: bool = False
+    exclude: ExcludePredicate | None = None
+    descend: DescendPredicate | None = None
+    file_predicate: FilePredicate | None = None
+    workers: int = 1
+    worker_mode: WorkerMode = "thread"
+    cache: ScanCache | None = None
 
 
-@dataclass(frozen=True)
-class TraversedEntry:
-    """A single enumerated filesystem entry."""
+class TraversedEntry(NamedTuple):
+    """A single enumerated filesystem entry.
+
+    Tuple-backed so the walker can allocate one cheaply per entry.
+    """
 
     path: str
     name: str
@@ -37,7 +73,21 @@ class TraversedEntry:
     symlink_target: str | None = None
     symlink_cycle: bool = False
     size: int | None = None
-    mtime: datetime | None = None
+    mtime_ns: int | None = None
+
+    @property
+    def mtime(self) -> datetime | None:
+        """Return the modification time as a local datetime, if known."""
+        return None if self.mtime_ns is None else datetime_from_ns(self.mtime_ns)
+
+
+# A directory listing item classified once: (entry, is_dir, is_symlink).
+_Listed = tuple["os.DirEntry[str] | _CachedDirEntry", bool, bool]
+# A prefetched directory's stat result, taken just before its listing.
+_StatListing = tuple[os.stat_result, list[_Listed]]
+
+# A subdirectory's (excluded, descends) verdict, decided while prefetching.
+_Verdict = tuple[bool, bool]
 
 
 def build_tree(
@@ -58,196 +108,807 @@ def enumerate_entries(
     """Enumerate filesystem entries without applying ignore/filter stages."""
     opts = options or TraversalOptions()
     scan_root = Path(directory).resolve()
+    return scan_root, list(iter_entries(scan_root, options=opts)), opts.max_depth
+
+
+def iter_entries(
+    directory: str | Path,
+    *,
+    options: TraversalOptions | None = None,
+) -> Iterator[TraversedEntry]:
+    """Lazily yield filesystem entries in deterministic preorder.
+
+    Memory held by the walk is proportional to the depth of the tree and the
+    width of the directories on the current path, not to the entry count.
+    """
+    opts = options or TraversalOptions()
+    scan_root = Path(directory).resolve()
 
     if opts.max_depth is not None and opts.max_depth < 0:
         raise ValueError("max_depth must be >= 0")
 
+    if opts.workers < 1:
+        raise ValueError("workers must be >= 1")
+
     if opts.max_depth == 0:
-        return scan_root, [], opts.max_depth
-
-    visited: set[tuple[int, int] | str] = {_directory_identity(scan_root)}
-    entries: list[TraversedEntry] = []
-    _walk_directory(
-        scan_root=scan_root,
-        current_dir=scan_root,
-        depth=1,
-        options=opts,
-        visited=visited,
-        out=entries,
+        return iter(())
+
+    if opts.workers > 1 and opts.worker_mode == "process":
+        if opts.cache is not None:
+            raise ValueError("a scan cache cannot be used with process workers")
+        return _enumerate_sharded(scan_root, opts)
+
+    return _iter_walk(scan_root, opts, root_stat=os.stat(scan_root))
+
+
+def _iter_walk(
+    scan_root: Path,
+    options: TraversalOptions,
+    *,
+    root_stat: os.stat_result,
+) -> Iterator[TraversedEntry]:
+    scanner = (
+        _ThreadedScanner(options.sort_key, options.cache, workers=options.workers)
+        if options.workers > 1
+        else _DirectoryScanner(options.sort_key, options.cache)
+    )
+    try:
+        yield from _walk_directory(
+            current_dir=str(scan_root),
+            prefix="",
+            depth=1,
+            options=options,
+            scanner=scanner,
+            visited={_directory_identity(scan_root, root_stat)},
+            current_stat=root_stat,
+        )
+    finally:
+        scanner.close()
+
+
+@dataclass
+class MetadataStats:
+    """Timing counters filled in by `attach_metadata`.
+
+    `stat_seconds` sums the duration of every individual `lstat`, which is
+    what a sequential pass would spend; `wait_seconds` is how long the entry
+    stream actually blocked on stat results.
+    """
+
+    files: int = 0
+    stat_seconds: float = 0.0
+    wait_seconds: float = 0.0
+
+    @property
+    def saved_seconds(self) -> float:
+        """Return the wall-clock stat time hidden by the prefetch."""
+        return max(0.0, self.stat_seconds - self.wait_seconds)
+
+
+def attach_metadata(
+    directory: str | Path,
+    entries: Iterable[TraversedEntry],
+    *,
+    workers: int = 1,
+    stats: MetadataStats | None = None,
+) -> Iterator[TraversedEntry]:
+    """Fill in file size and mtime for entries that reach the output.
+
+    Run after ignore and filter selection so stat calls scale with the output
+    rather than the scan; each surviving file costs one `lstat`. With
+    `workers` > 1, stat calls run on a bounded thread pool ahead of the
+    consumer while entries are still yielded in input order.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    root = str(Path(directory).resolve())
+    if workers == 1:
+        return _attach_sequential(root, entries, stats)
+    return _attach_prefetched(root, entries, workers, stats or MetadataStats())
+
+
+# Stat calls allowed in flight per worker; bounds how far the prefetch runs
+# ahead of the consumer.
+_STAT_PREFETCH_PER_WORKER = 16
+
+# (stat result, seconds the call took) and an entry awaiting its stat.
+_TimedStat = tuple[os.stat_result | None, float]
+_PendingStat = tuple[TraversedEntry, Future[_TimedStat] | None]
+
+
+def _attach_sequential(
+    root: str,
+    entries: Iterable[TraversedEntry],
+    stats: MetadataStats | None,
+) -> Iterator[TraversedEntry]:
+    for entry in entries:
+        if not _needs_metadata(entry):
+            yield entry
+            continue
+        path = os.path.join(root, entry.path)
+        if stats is None:
+            yield _with_metadata(entry, _lstat(path))
+            continue
+        stat_result, elapsed = _timed_lstat(path)
+        stats.files += 1
+        stats.stat_seconds += elapsed
+        stats.wait_seconds += elapsed
+        yield _with_metadata(entry, stat_result)
+
+
+def _attach_prefetched(
+    root: str,
+    entries: Iterable[TraversedEntry],
+    workers: int,
+    stats: MetadataStats,
+) -> Iterator[TraversedEntry]:
+    limit = workers * _STAT_PREFETCH_PER_WORKER
+    window: deque[_PendingStat] = deque()
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="path2map-stat"
+    )
+    try:
+        for entry in entries:
+            future = (
+                executor.submit(_timed_lstat, os.path.join(root, entry.path))
+                if _needs_metadata(entry)
+                else None
+            )
+            window.append((entry, future))
+            if len(window) > limit:
+                yield _resolve_pending_stat(window.popleft(), stats)
+        while window:
+            yield _resolve_pending_stat(window.popleft(), stats)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _resolve_pending_stat(
+    pending: _PendingStat, stats: MetadataStats
+) -> TraversedEntry:
+    entry, future = pending
+    if future is None:
+        return entry
+    start = time.perf_counter()
+    stat_result, elapsed = future.result()
+    stats.wait_seconds += time.perf_counter() - start
+    stats.files += 1
+    stats.stat_seconds += elapsed
+    return _with_metadata(entry, stat_result)
+
+
+def _needs_metadata(entry: TraversedEntry) -> bool:
+    return not entry.is_dir and entry.size is None and entry.mtime_ns is None
+
+
+def _with_metadata(
+    entry: TraversedEntry, stat_result: os.stat_result | None
+) -> TraversedEntry:
+    return entry._replace(
+        size=_entry_size(stat_result), mtime_ns=_entry_mtime(stat_result)
     )
-    return scan_root, entries, opts.max_depth
 
 
 def tree_from_entries(
     *,
     scan_root: Path,
-    entries: list[TraversedEntry],
+    entries: Iterable[TraversedEntry],
     max_depth: int | None,
+    validate: bool = False,
 ) -> TreeModel:
-    """Construct a logical tree model from enumerated entries."""
+    """Construct a logical tree model from enumerated entries.
+
+    Nodes are linked to their parents instead of storing full paths, and
+    repeated names and extensions share one string object. Entries are
+    trusted to be well formed, as traversal emits them, so nodes are created
+    without the per-node checks of the `TreeNode` constructors; pass
+    `validate=True` to run those checks and verify entry depths when
+    debugging another entry source.
+    """
+    if validate:
+        return _validated_tree_from_entries(
+            scan_root=scan_root, entries=entries, max_depth=max_depth
+        )
+
     root = TreeNode.directory(path=".", name=scan_root.name, depth=0)
-    nodes_by_path: dict[str, TreeNode] = {".": root}
+    with gc_paused():
+        _link_trusted_entries(root, entries)
+    return TreeModel(root=root, scan_root=str(scan_root), max_depth=max_depth)
+
+
+def _link_trusted_entries(root: TreeNode, entries: Iterable[TraversedEntry]) -> None:
+    # Only directories can be parents, so only they are looked up by path.
+    directories: dict[str, TreeNode] = {".": root}
+    strings: dict[str, str] = {}
+    intern = strings.setdefault
+    new_node = TreeNode.__new__
 
     for entry in entries:
+        parent = directories.get(entry.path.rpartition("/")[0] or ".")
+        if parent is None:
+            continue
+
+        # Slots are filled directly: a constructor call costs several times
+        # more than the assignments on multi-million-entry scans.
+        node = new_node(TreeNode)
+        node._path = None
+        node.name = intern(entry.name, entry.name)
+        node.depth = entry.depth
+        if entry.is_dir:
+            node.type = "directory"
+            node.ext = ""
+            node.children = []
+            node.size = None
+            node.mtime_ns = None
+            directories[entry.path] = node
+        else:
+            node.type = "file"
+            node.ext = intern(entry.ext, entry.ext)
+            node.children = _LEAF_CHILDREN
+            node.size = entry.size
+            node.mtime_ns = entry.mtime_ns
+        node.is_symlink = entry.is_symlink
+        node.symlink_target = entry.symlink_target
+        node.symlink_cycle = entry.symlink_cycle
+        node.parent = parent  # type: ignore[misc]
+        parent.children.append(node)
+
+
+def _validated_tree_from_entries(
+    *,
+    scan_root: Path,
+    entries: Iterable[TraversedEntry],
+    max_depth: int | None,
+) -> TreeModel:
+    root = TreeNode.directory(path=".", name=scan_root.name, depth=0)
+    directories: dict[str, TreeNode] = {".": root}
+
+    for entry in entries:
+        parent = directories.get(entry.path.rpartition("/")[0] or ".")
+        if parent is None:
+            continue
+        if entry.depth != parent.depth + 1:
+            raise ValueError(f"entry depth must follow its parent: {entry.path}")
+
         node: TreeNode
         if entry.is_dir:
             node = TreeNode.directory(
-                path=entry.path,
                 name=entry.name,
                 depth=entry.depth,
                 is_symlink=entry.is_symlink,
                 symlink_target=entry.symlink_target,
                 symlink_cycle=entry.symlink_cycle,
+                parent=parent,
             )
+            directories[entry.path] = node
         else:
             node = TreeNode.file(
-                path=entry.path,
                 name=entry.name,
                 depth=entry.depth,
                 ext=entry.ext,
                 size=entry.size,
-                mtime=entry.mtime,
+                mtime_ns=entry.mtime_ns,
                 is_symlink=entry.is_symlink,
                 symlink_target=entry.symlink_target,
                 symlink_cycle=entry.symlink_cycle,
+                parent=parent,
             )
-
-        parent_path = entry.path.rpartition("/")[0] or "."
-        parent = nodes_by_path.get(parent_path)
-        if parent is None:
-            continue
-
         parent.children.append(node)
-        nodes_by_path[entry.path] = node
 
     return TreeModel(root=root, scan_root=str(scan_root), max_depth=max_depth)
 
 
 def _walk_directory(
     *,
-    scan_root: Path,
-    current_dir: Path,
+    current_dir: str,
+    prefix: str,
     depth: int,
     options: TraversalOptions,
+    scanner: _DirectoryScanner,
     visited: set[tuple[int, int] | str],
-    out: list[TraversedEntry],
-) -> None:
-    if options.max_depth is not None and depth > options.max_depth:
+    shards: _ShardPool | None = None,
+    current_stat: os.stat_result | None = None,
+) -> Iterator[TraversedEntry]:
+    max_depth = options.max_depth
+    if max_depth is not None and depth > max_depth:
         return
 
-    for entry in _iter_entries(current_dir, options.sort_key):
-        is_symlink = entry.is_symlink()
-        path = Path(entry.path)
-        rel_path = path.relative_to(scan_root).as_posix()
+    follow = options.symlink_mode == "follow"
+    skip_symlinks = options.symlink_mode == "skip"
+    exclude = options.exclude
+    descend = options.descend
+    collect_metadata = options.collect_metadata
+    file_predicate = options.file_predicate
+
+    def children_of(
+        directory: str, prefix: str, depth: int, stat_result: os.stat_result | None
+    ) -> tuple[Iterator[_Listed], dict[str, _Verdict] | None]:
+        listing = scanner.listing(directory, stat_result)
+        if not scanner.prefetches or (max_depth is not None and depth >= max_depth):
+            return iter(listing), None
+        # Choosing what to prefetch already decides every subdirectory, so
+        # the verdicts are kept for the walker instead of asked again.
+        verdicts: dict[str, _Verdict] = {}
+        upcoming: list[str] = []
+        for entry, is_dir, is_symlink in listing:
+            if is_dir and not is_symlink:
+                rel_path = prefix + entry.name
+                excluded = exclude is not None and exclude(rel_path, True)
+                descends = not excluded and (descend is None or descend(rel_path))
+                verdicts[entry.name] = (excluded, descends)
+                if descends:
+                    upcoming.append(entry.path)
+        scanner.prefetch(upcoming)
+        return iter(listing), verdicts
+
+    # Explicit stack of (remaining children, their prefetch verdicts,
+    # relative path prefix, depth, identity to release) so arbitrarily deep
+    # trees never approach the interpreter recursion limit. Relative paths
+    # are built by string concatenation; no `Path` objects are created per
+    # entry.
+    stack: list[
+        tuple[
+            Iterator[_Listed],
+            dict[str, _Verdict] | None,
+            str,
+            int,
+            tuple[int, int] | str | None,
+        ]
+    ] = [(*children_of(current_dir, prefix, depth, current_stat), prefix, depth, None)]
+    while stack:
+        children, verdicts, prefix, depth, frame_identity = stack[-1]
+        listed = next(children, None)
+        if listed is None:
+            stack.pop()
+            if frame_identity is not None:
+                visited.remove(frame_identity)
+            continue
 
-        if is_symlink and options.symlink_mode == "skip":
+        entry, is_dir, is_symlink = listed
+        if is_symlink and skip_symlinks:
             continue
 
-        is_dir = entry.is_dir(follow_symlinks=False) or (
-            is_symlink and entry.is_dir(follow_symlinks=True)
-        )
+        name = entry.name
+        rel_path = prefix + name
+        verdict = None
+        if verdicts is not None and is_dir and not is_symlink:
+            verdict = verdicts[name]
+            if verdict[0]:
+                continue
+        elif exclude is not None and exclude(rel_path, is_dir):
+            continue
 
-        if is_dir:
-            symlink_target = _symlink_target(path) if is_symlink else None
-            symlink_cycle = False
+        if not is_dir:
+            size = mtime = None
+            if collect_metadata or file_predicate is not None:
+                stat_result = _dir_entry_stat(entry)
+                if file_predicate is not None and (
+                    stat_result is None or not file_predicate(stat_result)
+                ):
+                    continue
+                if collect_metadata:
+                    size = _entry_size(stat_result)
+                    mtime = _entry_mtime(stat_result)
+            yield TraversedEntry(
+                rel_path,
+                name,
+                False,
+                depth,
+                _suffix(name),
+                is_symlink,
+                _symlink_target(entry.path) if is_symlink else None,
+                False,
+                size,
+                mtime,
+            )
+            continue
 
-            should_traverse = not (is_symlink and options.symlink_mode != "follow")
-            if options.max_depth is not None and depth >= options.max_depth:
+        symlink_cycle = False
+        should_traverse = (
+            (not is_symlink or follow)
+            and (max_depth is None or depth < max_depth)
+            and (
+                verdict[1]
+                if verdict is not None
+                else descend is None or descend(rel_path)
+            )
+        )
+        if should_traverse:
+            traversal_path = os.path.realpath(entry.path) if is_symlink else entry.path
+            # The listing reuses this stat to validate a cached copy.
+            stat_result = scanner.stat(traversal_path)
+            identity = _directory_identity(traversal_path, stat_result)
+            if identity in visited:
+                symlink_cycle = is_symlink
                 should_traverse = False
+            else:
+                visited.add(identity)
+
+        yield TraversedEntry(
+            rel_path,
+            name,
+            True,
+            depth,
+            "",
+            is_symlink,
+            _symlink_target(entry.path) if is_symlink else None,
+            symlink_cycle,
+        )
 
-            if should_traverse:
-                traversal_path = path.resolve() if is_symlink else path
-                identity = _directory_identity(traversal_path)
-                if identity in visited:
-                    symlink_cycle = is_symlink
-                    should_traverse = False
-                else:
-                    visited.add(identity)
-
-            out.append(
-                TraversedEntry(
-                    path=rel_path,
-                    name=entry.name,
-                    is_dir=True,
-                    depth=depth,
-                    is_symlink=is_symlink,
-                    symlink_target=symlink_target,
-                    symlink_cycle=symlink_cycle,
-                )
+        if not should_traverse:
+            continue
+        if shards is not None and depth == shards.depth:
+            shards.submit(traversal_path, rel_path + "/", depth + 1, visited)
+            visited.remove(identity)
+            continue
+
+        child_prefix = rel_path + "/"
+        stack.append(
+            (
+                *children_of(traversal_path, child_prefix, depth + 1, stat_result),
+                child_prefix,
+                depth + 1,
+                identity,
             )
+        )
 
-            if should_traverse:
-                _walk_directory(
-                    scan_root=scan_root,
-                    current_dir=traversal_path,
-                    depth=depth + 1,
-                    options=options,
-                    visited=visited,
-                    out=out,
-                )
-                visited.remove(identity)
-            continue
 
-        out.append(
-            TraversedEntry(
-                path=rel_path,
-                name=entry.name,
-                is_dir=False,
-                depth=depth,
-                ext=path.suffix,
-                size=_entry_size(entry) if options.collect_metadata else None,
-                mtime=_entry_mtime(entry) if options.collect_metadata else None,
-                is_symlink=is_symlink,
-                symlink_target=_symlink_target(path) if is_symlink else None,
+def _enumerate_sharded(
+    scan_root: Path, options: TraversalOptions
+) -> Iterator[TraversedEntry]:
+    """Enumerate with subtree shards scanned in a process pool.
+
+    The calling process walks the top of the tree down to the shard depth and
+    stitches each shard's entries back in at the position its directory
+    occupies, so the result equals the sequential preorder.
+    """
+    shard_options = replace(options, workers=1)
+    top_level = [
+        entry
+        for entry, is_dir, is_symlink in _scan_directory(
+            str(scan_root), options.sort_key
+        )
+        if is_dir and not is_symlink
+    ]
+    # Too few top-level directories cannot keep every worker busy; cut one
+    # level deeper for a finer split.
+    depth = 1 if len(top_level) >= 2 * options.workers else 2
+    if options.max_depth is not None and options.max_depth <= depth:
+        yield from iter_entries(scan_root, options=shard_options)
+        return
+
+    with ProcessPoolExecutor(max_workers=options.workers) as executor:
+        entries: list[TraversedEntry] = []
+        shards = _ShardPool(
+            executor,
+            options=shard_options,
+            depth=depth,
+            out=entries,
+        )
+        entries.extend(
+            _walk_directory(
+                current_dir=str(scan_root),
+                prefix="",
+                depth=1,
+                options=shard_options,
+                scanner=_DirectoryScanner(options.sort_key),
+                visited={_directory_identity(scan_root, os.stat(scan_root))},
+                shards=shards,
             )
         )
+        yield from shards.stitch()
+
+
+class _ShardPool:
+    """Submits subtree shards to a process pool and splices their results."""
+
+    def __init__(
+        self,
+        executor: ProcessPoolExecutor,
+        *,
+        options: TraversalOptions,
+        depth: int,
+        out: list[TraversedEntry],
+    ) -> None:
+        self.depth = depth
+        self._executor = executor
+        self._options = options
+        # Entries walked in this process; shards are spliced in at the length
+        # `out` had when they were submitted.
+        self._out = out
+        self._pending: list[tuple[int, Future[list[TraversedEntry]]]] = []
+
+    def submit(
+        self,
+        directory: str,
+        prefix: str,
+        depth: int,
+        visited: set[tuple[int, int] | str],
+    ) -> None:
+        future = self._executor.submit(
+            _scan_shard,
+            directory,
+            prefix,
+            depth,
+            self._options,
+            frozenset(visited),
+        )
+        self._pending.append((len(self._out), future))
 
+    def stitch(self) -> Iterator[TraversedEntry]:
+        start = 0
+        for position, future in self._pending:
+            yield from self._out[start:position]
+            yield from future.result()
+            start = position
+        yield from self._out[start:]
 
-def _iter_entries(
-    directory: Path, sort_key: SortKey | None
-) -> Iterable[os.DirEntry[str]]:
-    with os.scandir(directory) as scanner:
-        entries = list(scanner)
 
-    if sort_key is None:
-        entries.sort(key=_default_sort_key)
-    else:
-        entries.sort(key=sort_key)
+def _scan_shard(
+    directory: str,
+    prefix: str,
+    depth: int,
+    options: TraversalOptions,
+    visited: frozenset[tuple[int, int] | str],
+) -> list[TraversedEntry]:
+    # Runs in a worker process.
+    return list(
+        _walk_directory(
+            current_dir=directory,
+            prefix=prefix,
+            depth=depth,
+            options=options,
+            scanner=_DirectoryScanner(options.sort_key),
+            visited=set(visited),
+        )
+    )
+
+
+class _DirectoryScanner:
+    """Sorted directory listings read on demand in the calling thread."""
+
+    def __init__(
+        self, sort_key: SortKey | None, cache: ScanCache | None = None
+    ) -> None:
+        self._sort_key = sort_key
+        self._cache = cache
+
+    # Whether `prefetch` acts on its hints, making it worth computing them.
+    prefetches = False
+
+    def stat(self, directory: str) -> os.stat_result:
+        """Return `directory`'s stat result, to pass back to `listing`."""
+        return os.stat(directory)
+
+    def listing(
+        self, directory: str, stat_result: os.stat_result | None = None
+    ) -> list[_Listed]:
+        return _scan_directory(directory, self._sort_key, self._cache, stat_result)
+
+    def prefetch(self, directories: Iterable[str]) -> None:
+        """Hint that `directories` will be listed soon (no-op when sequential)."""
+
+    def close(self) -> None:
+        """Release scanner resources."""
+
+
+class _ThreadedScanner(_DirectoryScanner):
+    """Scanner that lists upcoming sibling directories on a thread pool.
+
+    Only `os.scandir` and sorting run in worker threads. The walker consumes
+    listings in preorder on the calling thread, which keeps output order and
+    the `visited` cycle set single-threaded.
+    """
+
+    prefetches = True
+
+    def __init__(
+        self, sort_key: SortKey | None, cache: ScanCache | None, *, workers: int
+    ) -> None:
+        super().__init__(sort_key, cache)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="path2map-scan"
+        )
+        self._pending: dict[str, Future[_StatListing]] = {}
+
+    def stat(self, directory: str) -> os.stat_result:
+        future = self._pending.get(directory)
+        # A listing still queued behind other prefetches is cheaper to read
+        # inline than to wait for.
+        if future is None or future.cancel():
+            self._pending.pop(directory, None)
+            return super().stat(directory)
+        # A failed listing is raised by `listing`, after the directory's
+        # own entry, as in a sequential walk.
+        if future.exception() is not None:
+            return super().stat(directory)
+        return future.result()[0]
+
+    def listing(
+        self, directory: str, stat_result: os.stat_result | None = None
+    ) -> list[_Listed]:
+        future = self._pending.pop(directory, None)
+        if future is None or future.cancel():
+            return super().listing(directory, stat_result)
+        return future.result()[1]
+
+    def prefetch(self, directories: Iterable[str]) -> None:
+        for directory in directories:
+            if directory not in self._pending:
+                self._pending[directory] = self._executor.submit(
+                    _stat_and_scan, directory, self._sort_key, self._cache
+                )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
 
-    return entries
 
+def _stat_and_scan(
+    directory: str, sort_key: SortKey | None, cache: ScanCache | None
+) -> _StatListing:
+    stat_result = os.stat(directory)
+    return stat_result, _scan_directory(directory, sort_key, cache, stat_result)
 
-def _default_sort_key(entry: os.DirEntry[str]) -> tuple[int, str, str]:
+
+def _scan_directory(
+    directory: str,
+    sort_key: SortKey | None,
+    cache: ScanCache | None = None,
+    stat_result: os.stat_result | None = None,
+) -> list[_Listed]:
+    if cache is not None:
+        listed = _cached_listing(directory, cache, stat_result)
+    else:
+        listed = []
+        with os.scandir(directory) as scanner:
+            for entry in scanner:
+                # Classify once; sorting and the walker reuse the flags.
+                is_symlink = entry.is_symlink()
+                is_dir = entry.is_dir(follow_symlinks=False) or (
+                    is_symlink and entry.is_dir(follow_symlinks=True)
+                )
+                listed.append((entry, is_dir, is_symlink))
+        if sort_key is None:
+            listed.sort(key=_default_sort_key)
+
+    if sort_key is not None:
+        listed.sort(key=lambda item: sort_key(cast("os.DirEntry[str]", item[0])))
+
+    return listed
+
+
+# Bits of a cached child's kind byte.
+_KIND_DIR = 1
+_KIND_SYMLINK = 2
+
+
+def _cached_listing(
+    directory: str, cache: ScanCache, stat_result: os.stat_result | None = None
+) -> list[_Listed]:
+    """Return `directory`'s listing in default order, replayed when unchanged.
+
+    `stat_result`, when given, must have been taken just before this call.
+    """
+    # Stat before listing: a change made after the stat leaves the stored
+    # mtime stale, which forces a rescan next time rather than hiding it.
+    if stat_result is None:
+        stat_result = os.stat(directory)
+    cached = cache.lookup(stat_result)
+    if cached is None:
+        listed_at_ns = time.time_ns()
+        listed = _scan_directory(directory, None)
+        cache.store(
+            stat_result,
+            tuple(entry.name for entry, _, _ in listed),
+            bytes(
+                (_KIND_DIR if is_dir else 0) | (_KIND_SYMLINK if is_symlink else 0)
+                for _, is_dir, is_symlink in listed
+            ),
+            listed_at_ns=listed_at_ns,
+        )
+        return listed
+
+    listed = []
+    retargeted = False
+    # `DirEntry.path` is `os.path.join(directory, name)`; join once per listing.
+    prefix = os.path.join(directory, "")
+    for name, kind in zip(*cached):
+        is_dir = bool(kind & _KIND_DIR)
+        entry = _CachedDirEntry(prefix, name, is_dir)
+        if kind & _KIND_SYMLINK:
+            entry.is_link = True
+            # Only the link lives in this directory; its target may differ.
+            target_is_dir = os.path.isdir(entry.path)
+            retargeted = retargeted or target_is_dir != is_dir
+            entry.is_directory = is_dir = target_is_dir
+        listed.append((entry, is_dir, entry.is_link))
+    if retargeted:
+        listed.sort(key=_default_sort_key)
+    return listed
+
+
+class _CachedDirEntry:
+    """`os.DirEntry` stand-in for a child replayed from a `ScanCache`."""
+
+    __slots__ = ("name", "path", "is_directory", "is_link")
+
+    def __init__(self, prefix: str, name: str, is_directory: bool) -> None:
+        self.name = name
+        self.path = prefix + name
+        self.is_directory = is_directory
+        self.is_link = False
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        return self.is_directory and (follow_symlinks or not self.is_link)
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        if self.is_link and follow_symlinks:
+            return os.path.isfile(self.path)
+        return not self.is_directory and not self.is_link
+
+    def is_symlink(self) -> bool:
+        return self.is_link
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        return os.stat(self.path, follow_symlinks=follow_symlinks)
+
+
+def _default_sort_key(listed: _Listed) -> tuple[bool, str, str]:
     # Directory-first deterministic ordering, then case-insensitive name.
-    is_dir = entry.is_dir(follow_symlinks=False) or (
-        entry.is_symlink() and entry.is_dir(follow_symlinks=True)
-    )
-    return (0 if is_dir else 1, entry.name.casefold(), entry.name)
+    name = listed[0].name
+    return (not listed[1], name.casefold(), name)
+
 
+def _suffix(name: str) -> str:
+    # Same rule as `PurePath.suffix`, without building a path object.
+    index = name.rfind(".")
+    if 0 < index < len(name) - 1:
+        return name[index:]
+    return ""
 
-def _directory_identity(path: Path) -> tuple[int, int] | str:
-    stat_result = path.stat()
+
+def _directory_identity(
+    path: str | Path, stat_result: os.stat_result
+) -> tuple[int, int] | str:
     if stat_result.st_ino and stat_result.st_dev:
         return (stat_result.st_dev, stat_result.st_ino)
     return str(path)
 
 
-def _symlink_target(path: Path) -> str | None:
+def _symlink_target(path: str) -> str | None:
     try:
         return os.readlink(path)
     except OSError:
         return None
 
 
-def _entry_size(entry: os.DirEntry[str]) -> int | None:
+def _dir_entry_stat(
+    entry: os.DirEntry[str] | _CachedDirEntry,
+) -> os.stat_result | None:
     try:
-        return entry.stat(follow_symlinks=False).st_size
+        return entry.stat(follow_symlinks=False)
     except OSError:
         return None
 
 
-def _entry_mtime(entry: os.DirEntry[str]) -> datetime | None:
+def _lstat(path: str) -> os.stat_result | None:
     try:
-        return datetime.fromtimestamp(entry.stat(follow_symlinks=False).st_mtime)
+        return os.lstat(path)
     except OSError:
         return None
+
+
+def _timed_lstat(path: str) -> _TimedStat:
+    start = time.perf_counter()
+    stat_result = _lstat(path)
+    return stat_result, time.perf_counter() - start
+
+
+def _entry_size(stat_result: os.stat_result | None) -> int | None:
+    return None if stat_result is None else stat_result.st_size
+
+
+def _entry_mtime(stat_result: os.stat_result | None) -> int | None:
+    return None if stat_result is None else stat_result.st_mtime_ns
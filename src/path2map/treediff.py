@@ -0,0 +1,257 @@
+"""Structural diffs between two trees using Merkle subtree digests.
+
+Every node gets a digest over its own record (name, type, symlink target,
+and the size and mtime selected by `details`) and, for directories, the
+digests of its children in name order. Two subtrees with equal digests are
+identical, so the comparison walks both trees from the root and descends
+only where digests differ: after one linear hashing pass per tree, the
+work is proportional to the number of changed entries and the directories
+above them rather than to the size of the trees.
+
+The roots are compared by content only, so scans of differently named
+directories (``proj-1.0`` and ``proj-1.1``) diff cleanly. Trees read from
+JSON or CSV exports carry no symlink markers and only the mtime precision
+of their time format; `compare_symlinks` and `mtime_format` align the
+records of such trees with full-fidelity ones.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from hashlib import blake2b
+from typing import Callable, Iterator, Literal, NamedTuple
+
+from path2map.model import NodeType, NodeView, TreeView
+from path2map.timefmt import format_mtime
+from path2map.util import gc_paused
+
+ChangeKind = Literal["added", "removed", "modified"]
+
+_DIGEST_SIZE = 16
+
+
+@dataclass(frozen=True, slots=True)
+class TreeChange:
+    """One entry that differs between the old and new tree.
+
+    `type` is the entry's type in the tree it is present in (the new tree
+    for modifications). Sizes and mtimes are set only when requested by the
+    diff's `details`; an entry whose type changed is reported as removed
+    and then added.
+    """
+
+    change: ChangeKind
+    path: str
+    type: NodeType
+    old_size: int | None = None
+    new_size: int | None = None
+    old_mtime_ns: int | None = None
+    new_mtime_ns: int | None = None
+
+
+@dataclass
+class DiffStats:
+    """Counters filled in by `diff_trees`.
+
+    `hashed` counts nodes digested in both trees. `compared` counts node
+    pairs present in both trees that were visited; unchanged subtrees cost
+    one comparison regardless of their size.
+    """
+
+    hashed: int = 0
+    compared: int = 0
+
+
+def diff_trees(
+    old: TreeView,
+    new: TreeView,
+    *,
+    details: str = "none",
+    stats: DiffStats | None = None,
+    compare_symlinks: bool = True,
+    mtime_format: str | None = None,
+) -> list[TreeChange]:
+    """Return the entries added, removed, or modified from `old` to `new`.
+
+    Changes are listed in preorder with siblings in name order. `details`
+    (`none`, `size`, `mtime`, or `size,mtime`) selects which file metadata
+    counts as a modification. With `compare_symlinks=False`, symlink
+    markers and targets are ignored; with `mtime_format`, mtimes are equal
+    when they format to the same text.
+    """
+    include_size = details in {"size", "size,mtime"}
+    mtime_key: _MtimeKey | None = None
+    if details in {"mtime", "size,mtime"}:
+        mtime_key = _exact_mtime
+        if mtime_format is not None:
+            mtime_key = partial(_formatted_mtime, time_format=mtime_format)
+    fields = _RecordFields(include_size, mtime_key, compare_symlinks)
+    counters = stats if stats is not None else DiffStats()
+    return _diff_hashed(
+        _hash_tree(old.root, fields, counters),
+        _hash_tree(new.root, fields, counters),
+        fields,
+        counters,
+    )
+
+
+class _RecordFields(NamedTuple):
+    """Which node fields make up a record, and how mtimes are compared."""
+
+    size: bool
+    mtime: _MtimeKey | None
+    symlinks: bool
+
+
+_MtimeKey = Callable[[int | None], int | str | None]
+
+
+def _exact_mtime(mtime_ns: int | None) -> int | None:
+    return mtime_ns
+
+
+def _formatted_mtime(mtime_ns: int | None, time_format: str) -> str | None:
+    return None if mtime_ns is None else format_mtime(mtime_ns, time_format)
+
+
+def _diff_hashed(
+    old_root: _Hashed,
+    new_root: _Hashed,
+    fields: _RecordFields,
+    stats: DiffStats,
+) -> list[TreeChange]:
+    """Compare two digested trees, descending only where digests differ."""
+
+    def change(
+        kind: ChangeKind,
+        path: str,
+        before: NodeView | None,
+        after: NodeView | None,
+    ) -> TreeChange:
+        node = after if after is not None else before
+        assert node is not None
+        include_size = fields.size
+        include_mtime = fields.mtime is not None
+        return TreeChange(
+            kind,
+            path,
+            node.type,
+            old_size=before.size if before is not None and include_size else None,
+            new_size=after.size if after is not None and include_size else None,
+            old_mtime_ns=(
+                before.mtime_ns if before is not None and include_mtime else None
+            ),
+            new_mtime_ns=(
+                after.mtime_ns if after is not None and include_mtime else None
+            ),
+        )
+
+    changes: list[TreeChange] = []
+    # Work items in reverse preorder: (path, old subtree, new subtree), where
+    # a missing side marks a subtree that was added or removed wholesale.
+    stack: list[tuple[str, _Hashed | None, _Hashed | None]] = [("", old_root, new_root)]
+    while stack:
+        path, before, after = stack.pop()
+        if before is not None and after is not None:
+            stats.compared += 1
+            if before.digest == after.digest:
+                continue
+            if before.node.type != after.node.type:
+                # Reported as a removal then an addition of the whole subtree.
+                stack.append((path, None, after))
+                stack.append((path, before, None))
+                continue
+            old_record = _record(before.node, fields)
+            new_record = _record(after.node, fields)
+            if path and old_record != new_record:
+                changes.append(change("modified", path, before.node, after.node))
+        elif before is not None:
+            changes.append(change("removed", path, before.node, None))
+        elif after is not None:
+            changes.append(change("added", path, None, after.node))
+
+        old_children = before.children if before is not None else {}
+        new_children = after.children if after is not None else {}
+        prefix = f"{path}/" if path else ""
+        for name in sorted(old_children.keys() | new_children.keys(), reverse=True):
+            stack.append(
+                (prefix + name, old_children.get(name), new_children.get(name))
+            )
+    return changes
+
+
+class _Hashed(NamedTuple):
+    """A node with its subtree digest and its children keyed by name.
+
+    A leaf's digest is its record tuple itself, which is cheaper than hashing
+    it and compares the same way; directories carry a hex digest.
+    """
+
+    node: NodeView
+    digest: _Record | str
+    children: dict[str, _Hashed]
+
+
+# (name, type, is_symlink, symlink target, size, mtime), with fields left
+# out of the comparison set to None (False for is_symlink). mtime is in
+# nanoseconds, or formatted text when compared at a time format's precision.
+_Record = tuple[str, NodeType, bool, str | None, int | None, int | str | None]
+
+# Shared by every leaf; never mutated.
+_NO_CHILDREN: dict[str, _Hashed] = {}
+
+
+def _hash_tree(root: NodeView, fields: _RecordFields, stats: DiffStats) -> _Hashed:
+    """Digest every subtree below `root` in one postorder pass."""
+    # Open directories as (node, hashed children, children still to visit);
+    # an explicit stack keeps deep trees clear of the recursion limit.
+    levels: list[tuple[NodeView, dict[str, _Hashed], Iterator[NodeView]]] = [
+        (root, {}, iter(root.children))
+    ]
+    include_size, mtime_key, include_symlinks = fields
+    with gc_paused():
+        while True:
+            node, hashed, remaining = levels[-1]
+            for child in remaining:
+                if child.children:
+                    levels.append((child, {}, iter(child.children)))
+                    break
+                name = child.name
+                hashed[name] = _Hashed(
+                    child,
+                    (
+                        name,
+                        child.type,
+                        child.is_symlink if include_symlinks else False,
+                        child.symlink_target if include_symlinks else None,
+                        child.size if include_size else None,
+                        mtime_key(child.mtime_ns) if mtime_key is not None else None,
+                    ),
+                    _NO_CHILDREN,
+                )
+            else:
+                levels.pop()
+                stats.hashed += len(hashed) + 1
+                own = _record(node, fields)
+                if not levels:
+                    own = ("", *own[1:])
+                # `repr` spells strings unambiguously, with lone surrogates
+                # escaped, so equal text means equal records and digests.
+                text = repr([own, *(hashed[name].digest for name in sorted(hashed))])
+                digest = blake2b(text.encode(), digest_size=_DIGEST_SIZE).hexdigest()
+                entry = _Hashed(node, digest, hashed)
+                if not levels:
+                    return entry
+                levels[-1][1][node.name] = entry
+
+
+def _record(node: NodeView, fields: _RecordFields) -> _Record:
+    return (
+        node.name,
+        node.type,
+        node.is_symlink if fields.symlinks else False,
+        node.symlink_target if fields.symlinks else None,
+        node.size if fields.size else None,
+        fields.mtime(node.mtime_ns) if fields.mtime is not None else None,
+    )
@@ -0,0 +1,25 @@
+"""Small helpers shared by the tree builders."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+import gc
+from typing import Iterator
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Suspend cyclic garbage collection while building large structures.
+
+    Every tree node is a tracked container, so a large build repeatedly
+    triggers collections that rescan the growing tree without freeing
+    anything; they cost more than building the nodes. Collection is
+    re-enabled on exit only if it was enabled on entry.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
@@ -0,0 +1,22 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def scanned_dirs(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Record every directory traversal lists with `os.scandir`, in order."""
+    scanned: list[Path] = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        scanned.append(Path(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr("path2map.traversal.os.scandir", recording_scandir)
+    return scanned
@@ -6,6 +6,7 @@ from datetime import datetime
 from pathlib import Path
 
 from path2map import cli
+from path2map.timefmt import ns_from_datetime
 
 
 def _run_cli_capture(capsys, argv: list[str]) -> tuple[int, str]:
@@ -136,7 +137,7 @@ def test_cli_metadata_opt_in_collects_when_enabled(
     monkeypatch.setattr("path2map.traversal._entry_size", lambda _entry: 5)
     monkeypatch.setattr(
         "path2map.traversal._entry_mtime",
-        lambda _entry: datetime(2026, 1, 2, 3, 4),
+        lambda _entry: ns_from_datetime(datetime(2026, 1, 2, 3, 4)),
     )
 
     code, text = _run_cli_capture(
@@ -155,3 +156,20 @@ def test_cli_metadata_opt_in_collects_when_enabled(
 
     assert code == 0
     assert "file.txt (5 B, 2026-01-02)" in text
+
+
+def test_cli_verbose_reports_stat_timings(tmp_path: Path, capsys) -> None:
+    """`--verbose` reports stat work on stderr and leaves stdout unchanged."""
+    (tmp_path / "a.txt").write_text("a", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("b", encoding="utf-8")
+    args = ["--directory", str(tmp_path), "--details", "size"]
+
+    assert cli.main([*args, "--stat-workers", "2"]) == 0
+    quiet = capsys.readouterr()
+    assert cli.main([*args, "--stat-workers", "2", "--verbose"]) == 0
+    verbose = capsys.readouterr()
+
+    assert quiet.err == ""
+    assert verbose.out == quiet.out
+    assert verbose.err.startswith("stat: 2 files, ")
+    assert "saved by --stat-workers" in verbose.err
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+from datetime import datetime
+
+import pytest
+
 from path2map.cli import build_parser
 
 
@@ -11,13 +15,24 @@ def test_parser_defaults() -> None:
     args = parser.parse_args([])
 
     assert args.directory == "."
+    assert args.source is None
+    assert args.from_snapshot is None
     assert args.output is None
     assert args.stdout is False
+    assert args.save_snapshot is None
     assert args.max_depth is None
     assert args.follow_symlinks is False
     assert args.symlinks is None
+    assert args.workers == 1
+    assert args.worker_mode == "thread"
+    assert args.stat_workers == 1
+    assert args.verbose is False
+    assert args.cache is None
+    assert args.columnar is False
     assert args.ignore is None
     assert args.filter == []
+    assert args.min_size is None
+    assert args.older_than is None
     assert args.folders_only is False
     assert args.sort is False
     assert args.comments is False
@@ -38,20 +53,44 @@ def test_parser_accepts_full_flag_set() -> None:
         [
             "--directory",
             "project",
+            "--from",
+            "tree.json",
+            "--from-snapshot",
+            "old.p2m",
             "-o",
             "out.txt",
             "--stdout",
+            "--save-snapshot",
+            "scan.p2m",
             "-D",
             "2",
             "--follow-symlinks",
             "--symlinks",
             "follow",
+            "--workers",
+            "4",
+            "--worker-mode",
+            "process",
+            "--stat-workers",
+            "8",
+            "--verbose",
+            "--cache",
+            "scan.cache",
+            "--columnar",
             "-i",
             "^build/",
             "-F",
             "\\.py$",
             "-F",
             "^src/",
+            "--min-size",
+            "100M",
+            "--max-size",
+            "2GB",
+            "--newer-than",
+            "2025-01-01",
+            "--older-than",
+            "2026-01-01",
             "-f",
             "-s",
             "-c",
@@ -74,13 +113,26 @@ def test_parser_accepts_full_flag_set() -> None:
     )
 
     assert args.directory == "project"
+    assert args.source == "tree.json"
+    assert args.from_snapshot == "old.p2m"
     assert args.output == "out.txt"
     assert args.stdout is True
+    assert args.save_snapshot == "scan.p2m"
     assert args.max_depth == 2
     assert args.follow_symlinks is True
     assert args.symlinks == "follow"
+    assert args.workers == 4
+    assert args.worker_mode == "process"
+    assert args.stat_workers == 8
+    assert args.verbose is True
+    assert args.cache == "scan.cache"
+    assert args.columnar is True
     assert args.ignore == "^build/"
     assert args.filter == ["\\.py$", "^src/"]
+    assert args.min_size == 100 * 1024**2
+    assert args.max_size == 2_000_000_000
+    assert args.newer_than == datetime(2025, 1, 1)
+    assert args.older_than == datetime(2026, 1, 1)
     assert args.folders_only is True
     assert args.sort is True
     assert args.comments is True
@@ -92,3 +144,18 @@ def test_parser_accepts_full_flag_set() -> None:
     assert args.size_format == "decimal"
     assert args.details_style == "columns"
     assert args.type == "json"
+
+
+@pytest.mark.parametrize("flag", ["--workers", "--stat-workers"])
+@pytest.mark.parametrize("value", ["0", "-2"])
+def test_parser_rejects_non_positive_worker_counts(
+    flag: str, value: str, capsys
+) -> None:
+    """Worker counts below one are usage errors, not tracebacks."""
+    with pytest.raises(SystemExit) as exc_info:
+        build_parser().parse_args([flag, value])
+
+    assert exc_info.value.code == 2
+    assert f"argument {flag}: must be at least 1, got {value}" in (
+        capsys.readouterr().err
+    )
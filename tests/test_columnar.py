@@ -0,0 +1,117 @@
+"""Tests for the columnar array-backed tree model."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from path2map.columnar import (
+    ColumnarTreeModel,
+    columnar_tree_from_entries,
+    columnar_tree_from_model,
+)
+from path2map.render.csv import CsvRenderOptions, render_csv
+from path2map.render.html import HtmlRenderOptions, render_html
+from path2map.render.json import JsonRenderOptions, render_json
+from path2map.render.text import TextRenderOptions, render_text
+from path2map.timefmt import ns_from_datetime
+from path2map.traversal import TraversedEntry, tree_from_entries
+
+_MTIME_NS = ns_from_datetime(datetime(2026, 1, 2, 3, 4, 5, 678901))
+_ENTRIES = [
+    TraversedEntry("src", "src", True, 1),
+    TraversedEntry("src/app", "app", True, 2),
+    TraversedEntry("src/app/main.py", "main.py", False, 3, ".py", size=10),
+    TraversedEntry("src/readme.md", "readme.md", False, 2, ".md", mtime_ns=_MTIME_NS),
+    TraversedEntry("empty", "empty", True, 1),
+    TraversedEntry("link", "link", True, 1, is_symlink=True, symlink_target="src"),
+    TraversedEntry("orphan/file.txt", "file.txt", False, 2, ".txt"),
+    TraversedEntry("top.txt", "top.txt", False, 1, ".txt", size=0),
+]
+
+
+def _trees():
+    root = Path("/scans/project")
+    objects = tree_from_entries(scan_root=root, entries=_ENTRIES, max_depth=None)
+    columnar = columnar_tree_from_entries(
+        scan_root=root, entries=_ENTRIES, max_depth=None
+    )
+    return objects, columnar
+
+
+def test_columnar_nodes_match_object_nodes() -> None:
+    """Every node attribute matches the object model in the same preorder."""
+    objects, columnar = _trees()
+    fields = (
+        "path",
+        "name",
+        "type",
+        "depth",
+        "ext",
+        "size",
+        "mtime",
+        "is_symlink",
+        "symlink_target",
+        "symlink_cycle",
+    )
+
+    pairs = list(zip(objects.iter_preorder(), columnar.iter_preorder(), strict=True))
+
+    assert len(pairs) == len(columnar) == 8
+    for expected, actual in pairs:
+        for name in fields:
+            assert getattr(actual, name) == getattr(expected, name), name
+        assert [child.path for child in actual.children] == [
+            child.path for child in expected.children
+        ]
+
+
+def test_renderers_accept_columnar_model() -> None:
+    """All renderers produce identical output from either backing."""
+    objects, columnar = _trees()
+    text = TextRenderOptions(color="never", details="size,mtime", sort=True)
+
+    assert render_text(columnar, options=text) == render_text(objects, options=text)
+    assert render_json(
+        columnar, options=JsonRenderOptions(details="size,mtime")
+    ) == render_json(objects, options=JsonRenderOptions(details="size,mtime"))
+    assert render_csv(
+        columnar, options=CsvRenderOptions(details="mtime")
+    ) == render_csv(objects, options=CsvRenderOptions(details="mtime"))
+    assert render_html(
+        columnar, options=HtmlRenderOptions(comments=True)
+    ) == render_html(objects, options=HtmlRenderOptions(comments=True))
+
+
+def test_columnar_tree_from_model_round_trips() -> None:
+    """Copying an object model keeps names, paths, and metadata."""
+    objects, _ = _trees()
+
+    copied = columnar_tree_from_model(objects)
+
+    assert [node.path for node in copied.iter_preorder()] == [
+        node.path for node in objects.iter_preorder()
+    ]
+    assert copied.root.name == "project"
+
+
+def test_columnar_interns_repeated_names() -> None:
+    """Names shared by many nodes are stored once in the string table."""
+    tree = ColumnarTreeModel(scan_root="/scans/project")
+    for _ in range(3):
+        directory = tree.append(parent=0, name="pkg", is_dir=True)
+        tree.append(parent=directory, name="__init__.py", is_dir=False, ext=".py")
+
+    assert tree.strings.count("__init__.py") == 1
+    assert tree.path_of(6) == "pkg/__init__.py"
+
+
+def test_columnar_append_rejects_children_of_files() -> None:
+    """Files cannot become parents, mirroring `TreeNode` validation."""
+    tree = ColumnarTreeModel(scan_root="/scans/project")
+    file_index = tree.append(parent=0, name="a.txt", is_dir=False)
+
+    with pytest.raises(ValueError, match="file nodes cannot contain children"):
+        tree.append(parent=file_index, name="b.txt", is_dir=False)
@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
+from datetime import datetime
+import os
 from pathlib import Path
 
-from path2map.filtering import FilterConfig, filter_entries_with_ancestors
+import pytest
+
+from path2map.filtering import (
+    FilterConfig,
+    MetadataFilter,
+    compile_descend_predicate,
+    filter_entries_with_ancestors,
+    parse_size,
+    parse_time_threshold,
+)
 from path2map.ignore import IgnoreConfig, PathEntry, filter_ignored_entries
 
 
@@ -95,3 +106,93 @@ def test_non_matching_filter_returns_empty_set() -> None:
     )
 
     assert kept == []
+
+
+def test_ancestors_are_marked_through_shared_parent_chains() -> None:
+    """Every ancestor of every match is kept; unrelated directories are not."""
+    entries = [
+        PathEntry(path=".", is_dir=True),
+        PathEntry(path="a", is_dir=True),
+        PathEntry(path="a/b", is_dir=True),
+        PathEntry(path="a/b/one.py", is_dir=False),
+        PathEntry(path="a/b/two.py", is_dir=False),
+        PathEntry(path="a/c", is_dir=True),
+        PathEntry(path="a/c/d", is_dir=True),
+        PathEntry(path="a/c/d/three.py", is_dir=False),
+        PathEntry(path="a/empty", is_dir=True),
+        PathEntry(path="z.txt", is_dir=False),
+    ]
+
+    kept = filter_entries_with_ancestors(
+        entries, config=FilterConfig(filters=[r"\.py$"])
+    )
+
+    assert [entry.path for entry in kept] == [
+        ".",
+        "a",
+        "a/b",
+        "a/b/one.py",
+        "a/b/two.py",
+        "a/c",
+        "a/c/d",
+        "a/c/d/three.py",
+    ]
+
+
+def test_descend_predicate_follows_anchored_literal_prefixes() -> None:
+    """Only directories that can lead to an anchored prefix are descended."""
+    descend = compile_descend_predicate([r"^src/app/.*\.py$", r"^docs/v2\.?x"])
+
+    assert descend is not None
+    assert descend("src") is True
+    assert descend("src/app") is True
+    assert descend("src/app/deep") is True
+    assert descend("src/lib") is False
+    assert descend("docs") is True
+    assert descend("docs/v1") is False
+    assert descend("docs/v2x") is True
+    assert descend("assets") is False
+
+
+def test_descend_predicate_requires_every_filter_to_be_anchored() -> None:
+    """One unanchored, alternating or flagged filter disables pruning."""
+    assert compile_descend_predicate([]) is None
+    assert compile_descend_predicate([r"^src/", r"\.py$"]) is None
+    assert compile_descend_predicate([r"^src/|^docs/"]) is None
+    assert compile_descend_predicate([r"(?i)^src/"]) is None
+    assert compile_descend_predicate([r"^.*\.py$"]) is None
+
+
+def test_parse_size_units() -> None:
+    """Bare and `iB` units are binary; `KB`-style units are decimal."""
+    assert parse_size("512") == 512
+    assert parse_size("100M") == 100 * 1024**2
+    assert parse_size("1.5GiB") == int(1.5 * 1024**3)
+    assert parse_size("20MB") == 20_000_000
+    with pytest.raises(ValueError, match="invalid size"):
+        parse_size("10 parsecs")
+
+
+def test_parse_time_threshold_ages_and_dates() -> None:
+    """Ages count back from now; ISO dates are taken as given."""
+    now = datetime(2026, 7, 1, 12, 0)
+
+    assert parse_time_threshold("2d", now=now) == datetime(2026, 6, 29, 12, 0)
+    assert parse_time_threshold("6h", now=now) == datetime(2026, 7, 1, 6, 0)
+    assert parse_time_threshold("2026-01-02") == datetime(2026, 1, 2)
+    with pytest.raises(ValueError, match="invalid age or date"):
+        parse_time_threshold("soon")
+
+
+def test_metadata_filter_bounds_are_inclusive(tmp_path: Path) -> None:
+    """Size and mtime bounds accept values equal to the bound."""
+    target = tmp_path / "data.bin"
+    target.write_bytes(b"x" * 100)
+    os.utime(target, (datetime(2026, 1, 1).timestamp(),) * 2)
+    stat_result = os.lstat(target)
+
+    assert not MetadataFilter()
+    assert MetadataFilter(min_size=100, max_size=100).matches(stat_result)
+    assert not MetadataFilter(min_size=101).matches(stat_result)
+    assert MetadataFilter(older_than=datetime(2026, 1, 1)).matches(stat_result)
+    assert not MetadataFilter(newer_than=datetime(2026, 1, 2)).matches(stat_result)
@@ -4,7 +4,16 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from path2map.ignore import IgnoreConfig, PathEntry, filter_ignored_entries
+import pytest
+
+from path2map.ignore import (
+    IgnoreConfig,
+    IgnoreMatcher,
+    IgnoreRule,
+    PathEntry,
+    filter_ignored_entries,
+    should_ignore_entry,
+)
 
 
 def test_default_ignores_exclude_matching_paths() -> None:
@@ -115,3 +124,96 @@ def test_cli_ignore_supports_comma_separated_patterns(tmp_path: Path) -> None:
     )
 
     assert [entry.path for entry in kept] == ["src/main.txt"]
+
+
+def test_compiled_matcher_agrees_with_rule_by_rule_evaluation() -> None:
+    """Compiled rule runs reproduce per-rule matching and negation order."""
+    rules = [
+        IgnoreRule(pattern="*.log"),
+        IgnoreRule(pattern="tmp/"),
+        IgnoreRule(pattern="/gen/out/"),
+        IgnoreRule(pattern="docs/*.md"),
+        IgnoreRule(pattern="!keep.log", is_negation=True),
+        IgnoreRule(pattern="data/*.csv", is_negation=True),
+        IgnoreRule(pattern="c?che/"),
+        IgnoreRule(pattern="README"),
+        IgnoreRule(pattern="docs/keep.md", is_negation=True),
+    ]
+    matcher = IgnoreMatcher(p2mignore_rules=rules)
+    paths = [
+        ("app.log", False),
+        ("keep.log", False),
+        ("src/keep.log", False),
+        ("tmp", True),
+        ("tmp", False),
+        ("a/tmp/b.txt", False),
+        ("gen/out", False),
+        ("gen/out/x.c", False),
+        ("src/gen/out/x.c", False),
+        ("docs/guide.md", False),
+        ("docs/keep.md", False),
+        ("docs/sub/guide.md", False),
+        ("data/a.csv", False),
+        ("data/a.log", False),
+        ("cache", True),
+        ("cache/file", False),
+        ("cache", False),
+        ("pkg/README", False),
+        ("build/README", False),
+        ("src/main.py", False),
+    ]
+
+    for path, is_dir in paths:
+        expected = should_ignore_entry(
+            PathEntry(path=path, is_dir=is_dir),
+            use_default_ignores=True,
+            p2mignore_rules=rules,
+            cli_ignore_patterns=[],
+        )
+        assert matcher.matches(path, is_dir) is expected, path
+
+
+def test_settled_directories_skip_rule_evaluation_for_descendants(
+    monkeypatch,
+) -> None:
+    """Descendants of a definitively ignored directory are decided in O(1)."""
+    matcher = IgnoreMatcher(
+        p2mignore_rules=[
+            IgnoreRule(pattern="*.md"),
+            IgnoreRule(pattern="keep.md", is_negation=True),
+            IgnoreRule(pattern="vendor/"),
+        ]
+    )
+    assert matcher.matches("vendor", True) is True
+
+    calls: list[str] = []
+    original = IgnoreMatcher._child_state
+
+    def counting_child_state(self, parent, path):
+        calls.append(path)
+        return original(self, parent, path)
+
+    monkeypatch.setattr(IgnoreMatcher, "_child_state", counting_child_state)
+    monkeypatch.setattr(
+        "path2map.ignore._last_matching_run_ignores",
+        lambda *args: pytest.fail("settled descendants must not evaluate rules"),
+    )
+
+    assert matcher.matches("vendor/lib/keep.md", False) is True
+    assert matcher.matches("vendor/lib/deep/x.py", False) is True
+    assert calls == ["vendor", "vendor/lib", "vendor/lib/deep"]
+
+
+def test_deeper_negation_keeps_directory_unsettled() -> None:
+    """A later negation below an ignored directory can still re-include paths."""
+    matcher = IgnoreMatcher(
+        p2mignore_rules=[
+            IgnoreRule(pattern="vendor/"),
+            IgnoreRule(pattern="vendor/keep/", is_negation=True),
+        ]
+    )
+
+    assert matcher.matches("vendor", True) is True
+    assert matcher.matches("vendor/other/a.py", False) is True
+    assert matcher.matches("vendor/keep", True) is False
+    assert matcher.matches("vendor/keep/a.py", False) is False
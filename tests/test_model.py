@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import asdict
 from datetime import datetime
 
 import pytest
@@ -88,3 +89,137 @@ def test_tree_model_preorder_is_deterministic() -> None:
         "root/a.py",
         "root/b.py",
     ]
+
+
+def test_node_path_is_derived_from_parent_chain() -> None:
+    """Nodes linked to a parent build their path from ancestor names."""
+    root = TreeNode.directory(path=".", name="project", depth=0)
+    src = TreeNode.directory(name="src", depth=1, parent=root)
+    main = TreeNode.file(name="main.py", depth=2, ext=".py", parent=src)
+    root.children.append(src)
+    src.children.append(main)
+
+    assert src.path == "src"
+    assert main.path == "src/main.py"
+    assert list(TreeModel(root=root, scan_root="project").iter_preorder_paths()) == [
+        (root, "."),
+        (src, "src"),
+        (main, "src/main.py"),
+    ]
+
+
+def test_nodes_compare_and_repr_by_derived_path() -> None:
+    """Stored and derived paths compare alike; `asdict` ignores the parent."""
+    root = TreeNode.directory(path=".", name="project", depth=0)
+    linked = TreeNode.file(name="main.py", depth=1, ext=".py", parent=root)
+    root.children.append(linked)
+    explicit = TreeNode.file(path="main.py", name="main.py", depth=1, ext=".py")
+
+    assert linked == explicit
+    assert linked != TreeNode.file(path="other/main.py", name="main.py", depth=1)
+    assert repr(linked).startswith("TreeNode(path='main.py', name='main.py', ")
+    assert "parent" not in repr(linked)
+
+    as_dict = asdict(root)
+    assert "parent" not in as_dict
+    assert as_dict["children"][0]["name"] == "main.py"
+
+
+def test_node_requires_path_or_parent() -> None:
+    """A node must carry an explicit path unless it has a parent link."""
+    with pytest.raises(ValueError, match="path is required"):
+        TreeNode.file(name="orphan.txt", depth=1)
+
+
+def test_file_node_children_reject_appends() -> None:
+    """The shared empty children list of file nodes cannot be mutated."""
+    leaf = TreeNode.file(path="a.txt", name="a.txt", depth=1)
+    other = TreeNode.file(path="b.txt", name="b.txt", depth=1)
+
+    with pytest.raises(ValueError, match="file nodes cannot contain children"):
+        leaf.children.append(other)
+    assert leaf.children == []
+    assert other.children == []
+
+
+def _indexed_model() -> TreeModel:
+    root = TreeNode.directory(path=".", name="repo", depth=0)
+    services = TreeNode.directory(name="services", depth=1, parent=root)
+    billing = TreeNode.directory(name="billing", depth=2, parent=services)
+    billing.children.append(
+        TreeNode.file(name="app.py", depth=3, ext=".py", size=4, parent=billing)
+    )
+    services.children.extend(
+        [billing, TreeNode.file(name="billing-notes.md", depth=2, parent=services)]
+    )
+    root.children.append(services)
+    return TreeModel(root=root, scan_root="/work/repo", max_depth=4)
+
+
+def test_model_index_finds_paths_and_children() -> None:
+    """Path and child-name lookups resolve without walking the tree."""
+    model = _indexed_model()
+    services = model.root.children[0]
+
+    assert model.find("services/billing/app.py") is services.children[0].children[0]
+    assert model.find("./services/billing/") is services.children[0]
+    assert model.find(".") is model.root
+    assert model.find("services/missing") is None
+    assert model.child(services, "billing") is services.children[0]
+    assert model.child(services, "missing") is None
+    # The cache is keyed by path, so an equal-path node resolves the same.
+    twin = TreeNode.directory(name="services", depth=1, parent=model.root)
+    assert model.child(twin, "billing") is services.children[0]
+
+
+def test_model_index_answers_prefix_and_range_queries() -> None:
+    """Sorted paths support prefix and half-open range queries."""
+    model = _indexed_model()
+
+    assert model.paths_with_prefix("services/billing/") == ["services/billing/app.py"]
+    assert model.paths_with_prefix("services/billing") == [
+        "services/billing",
+        "services/billing-notes.md",
+        "services/billing/app.py",
+    ]
+    assert model.paths_between("services/b", "services/c") == [
+        "services/billing",
+        "services/billing-notes.md",
+        "services/billing/app.py",
+    ]
+    assert len(model.paths_with_prefix("")) == 5
+    # No successor code point exists past U+10FFFF.
+    assert model.paths_with_prefix("services/\U0010ffff") == []
+
+
+def test_model_subtree_rebases_paths_and_depths() -> None:
+    """A subtree becomes a standalone tree rooted at the chosen directory."""
+    model = _indexed_model()
+
+    subtree = model.subtree("services/billing")
+
+    assert [(node.path, node.depth) for node in subtree.iter_preorder()] == [
+        (".", 0),
+        ("app.py", 1),
+    ]
+    assert subtree.root.name == "billing"
+    assert subtree.root.children[0].size == 4
+    assert subtree.max_depth == 2
+    assert subtree.scan_root.replace("\\", "/") == "/work/repo/services/billing"
+    with pytest.raises(ValueError, match="subtree root must be a directory"):
+        model.subtree("services/billing/app.py")
+    with pytest.raises(ValueError, match="path is not in the tree"):
+        model.subtree("nope")
+
+
+def test_model_index_rebuilds_after_clear() -> None:
+    """Mutations become visible to queries once the index is cleared."""
+    model = _indexed_model()
+    assert model.find("new.txt") is None
+
+    model.root.children.append(
+        TreeNode.file(name="new.txt", depth=1, parent=model.root)
+    )
+    model.clear_index()
+
+    assert model.find("new.txt") is model.root.children[-1]
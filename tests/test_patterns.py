@@ -0,0 +1,43 @@
+"""Tests for combined regex matching of repeated pattern values."""
+
+from __future__ import annotations
+
+import re
+
+from path2map.patterns import PatternSet
+
+
+def _pattern_set(*values: str) -> PatternSet:
+    return PatternSet(tuple(re.compile(value) for value in values))
+
+
+def test_combined_search_matches_any_semantics() -> None:
+    """A combined set matches exactly when some pattern would match alone."""
+    texts = ["src/main.py", "docs/index.md", "x/aa/y", "readme", "src/main.pyc", ""]
+    combinable = (r"\.py$", r"^docs/", r"/a+/", r"x$")
+    # Backreferences and inline global flags fall back to separate searches.
+    separate = (r"\.py$", r"(a)\1", r"(?i)README")
+
+    for values in (combinable, separate):
+        patterns = _pattern_set(*values)
+        expected = [any(re.search(value, text) for value in values) for text in texts]
+
+        assert [patterns.search(text) for text in texts] == expected
+        assert patterns.search_many(texts) == expected
+
+
+def test_search_many_keeps_matches_within_their_own_line() -> None:
+    """Bulk scans never let a match spill across joined paths."""
+    patterns = _pattern_set(r"a[^x]*b", r"^c$")
+    texts = ["xa", "bx", "c", "cab", "ab"]
+
+    assert patterns.search_many(texts) == [False, False, True, True, True]
+
+
+def test_empty_pattern_set_matches_nothing() -> None:
+    """Without patterns the set is falsy and never matches."""
+    patterns = PatternSet()
+
+    assert not patterns
+    assert patterns.search("anything") is False
+    assert patterns.search_many(["a", "b"]) == [False, False]
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
-from path2map.pipeline import PipelineOptions, build_logical_tree
+from path2map.pipeline import (
+    PipelineOptions,
+    build_logical_tree,
+    iter_logical_entries,
+)
 
 
 def _paths_in_preorder(model) -> list[str]:
@@ -80,3 +85,137 @@ def test_pipeline_supports_symlinks_option_over_follow_flag(tmp_path: Path) -> N
 
     # symlinks="show" prevents traversal through link even if follow flag is true.
     assert _paths_in_preorder(model) == [".", "real", "real/inside.py"]
+
+
+def test_pipeline_never_scans_ignored_directories(
+    tmp_path: Path, scanned_dirs: list[Path]
+) -> None:
+    """Directories excluded by any ignore stage are pruned during traversal."""
+    for name in (".git", "node_modules", "vendor", "generated", "src"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "file.txt").write_text("x", encoding="utf-8")
+    (tmp_path / ".p2mignore").write_text("vendor/\n", encoding="utf-8")
+
+    model = build_logical_tree(
+        PipelineOptions(directory=str(tmp_path), cli_ignore="^generated$")
+    )
+
+    assert _paths_in_preorder(model) == [
+        ".",
+        "src",
+        "src/file.txt",
+        ".p2mignore",
+    ]
+    assert sorted(path.name for path in scanned_dirs) == sorted([tmp_path.name, "src"])
+
+
+def test_pipeline_anchored_filters_prune_unrelated_directories(
+    tmp_path: Path, scanned_dirs: list[Path]
+) -> None:
+    """Literal `^` filter prefixes skip scanning directories outside them."""
+    for directory in ("src/app/core", "src/lib", "docs", "assets"):
+        (tmp_path / directory).mkdir(parents=True)
+        (tmp_path / directory / "mod.py").write_text("x", encoding="utf-8")
+
+    model = build_logical_tree(
+        PipelineOptions(directory=str(tmp_path), filters=[r"^src/app/.*\.py$"])
+    )
+
+    assert _paths_in_preorder(model) == [
+        ".",
+        "src",
+        "src/app",
+        "src/app/core",
+        "src/app/core/mod.py",
+    ]
+    scanned = sorted(path.relative_to(tmp_path).as_posix() for path in scanned_dirs)
+    assert scanned == [".", "src", "src/app", "src/app/core"]
+
+
+def test_pipeline_process_workers_apply_ignore_rules(tmp_path: Path) -> None:
+    """Ignore pruning is carried into process-pool shards."""
+    for top in ("app", "lib", "node_modules"):
+        (tmp_path / top / "pkg").mkdir(parents=True)
+        (tmp_path / top / "pkg" / "main.py").write_text("x", encoding="utf-8")
+        (tmp_path / top / "pkg" / "notes.md").write_text("x", encoding="utf-8")
+
+    options = {"directory": str(tmp_path), "cli_ignore": r"\.md$"}
+    sequential = build_logical_tree(PipelineOptions(**options))
+    sharded = build_logical_tree(
+        PipelineOptions(**options, workers=2, worker_mode="process")
+    )
+
+    assert _paths_in_preorder(sharded) == _paths_in_preorder(sequential)
+    assert "node_modules" not in _paths_in_preorder(sharded)
+
+
+def test_iter_logical_entries_streams_the_logical_tree(tmp_path: Path) -> None:
+    """The lazy pipeline yields exactly the non-root nodes of the tree."""
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "sub" / "main.py").write_text("x", encoding="utf-8")
+    (tmp_path / "pkg" / "notes.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.py").write_text("x", encoding="utf-8")
+
+    options = PipelineOptions(directory=str(tmp_path), filters=[r"\.py$"])
+
+    streamed = [entry.path for entry in iter_logical_entries(options)]
+
+    assert streamed == ["pkg", "pkg/sub", "pkg/sub/main.py"]
+    assert ["."] + streamed == _paths_in_preorder(build_logical_tree(options))
+
+
+def test_pipeline_stats_only_selected_files(tmp_path: Path, monkeypatch) -> None:
+    """Metadata is collected with one stat per file that survives selection."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("hello", encoding="utf-8")
+    (tmp_path / "src" / "notes.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "skip.py").write_text("x", encoding="utf-8")
+
+    root = tmp_path.resolve()
+    stat_calls: list[str] = []
+
+    def _recording_lstat(path: str) -> os.stat_result:
+        stat_calls.append(Path(path).relative_to(root).as_posix())
+        return os.lstat(path)
+
+    monkeypatch.setattr("path2map.traversal._lstat", _recording_lstat)
+
+    entries = list(
+        iter_logical_entries(
+            PipelineOptions(
+                directory=str(tmp_path),
+                cli_ignore=r"^skip",
+                filters=[r"\.py$"],
+                details="size,mtime",
+            )
+        )
+    )
+
+    assert stat_calls == ["src/main.py"]
+    main = next(entry for entry in entries if entry.path == "src/main.py")
+    assert main.size == 5
+    assert main.mtime is not None
+
+
+def test_pipeline_size_bounds_keep_only_matching_files(tmp_path: Path) -> None:
+    """Size-filtered files are dropped and directories remain only as ancestors."""
+    (tmp_path / "big").mkdir()
+    (tmp_path / "big" / "blob.bin").write_bytes(b"x" * 2048)
+    (tmp_path / "big" / "small.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "small").mkdir()
+    (tmp_path / "small" / "note.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "empty").mkdir()
+
+    options = PipelineOptions(
+        directory=str(tmp_path), min_size=1024, details="size", filters=[r"\.bin$"]
+    )
+    entries = list(iter_logical_entries(options))
+
+    assert [entry.path for entry in entries] == ["big", "big/blob.bin"]
+    assert entries[1].size == 2048
+    assert _paths_in_preorder(build_logical_tree(options)) == [
+        ".",
+        "big",
+        "big/blob.bin",
+    ]
@@ -61,3 +61,18 @@ def test_render_html_supports_details_and_escaping() -> None:
 
     assert "&lt;src&gt;" in rendered
     assert "main.py (10 B, 2026-01-02)" in rendered
+
+
+def test_render_html_handles_trees_deeper_than_recursion_limit() -> None:
+    """Nested lists are emitted with an explicit stack."""
+    root = TreeNode.directory(path=".", name="root", depth=0)
+    parent = root
+    for level in range(1, 1201):
+        child = TreeNode.directory(path="d", name="d", depth=level)
+        parent.children.append(child)
+        parent = child
+
+    rendered = render_html(TreeModel(root=root, scan_root="/tmp/root"))
+
+    assert rendered.count("<ul>") == 1200
+    assert " " * 6 * 1200 + '  <li><span class="node">d</span></li>' in rendered
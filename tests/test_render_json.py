@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from datetime import datetime
 import json
+from pathlib import Path
 
+from path2map import cli
 from path2map.model import TreeModel, TreeNode
 from path2map.render.json import JsonRenderOptions, render_json
 
@@ -61,3 +63,61 @@ def test_render_json_is_deterministic() -> None:
     second = render_json(model, options=JsonRenderOptions(details="size,mtime"))
 
     assert first == second
+
+
+def test_render_json_matches_json_dumps_of_nested_form() -> None:
+    """Streaming output is byte-identical to json.dumps(indent=2)."""
+    model = _fixture_model()
+    model.root.children[0].children.append(
+        TreeNode.file(path="src/ünï.txt", name="ünï.txt", depth=2, ext=".txt")
+    )
+
+    def _nested(node: TreeNode) -> dict[str, object]:
+        return {
+            "path": node.path,
+            "name": node.name,
+            "type": node.type,
+            "ext": node.ext,
+            "depth": node.depth,
+            "children": [_nested(child) for child in node.children],
+            "size": node.size,
+            "mtime": node.mtime.strftime("%Y") if node.mtime else None,
+        }
+
+    rendered = render_json(
+        model, options=JsonRenderOptions(details="size,mtime", time_format="%Y")
+    )
+
+    assert rendered == json.dumps(_nested(model.root), indent=2)
+
+
+def test_render_json_handles_trees_deeper_than_recursion_limit() -> None:
+    """Deep trees render without recursing per level."""
+    root = TreeNode.directory(path=".", name="root", depth=0)
+    parent = root
+    for level in range(1, 1201):
+        child = TreeNode.directory(path="d", name="d", depth=level)
+        parent.children.append(child)
+        parent = child
+
+    rendered = render_json(TreeModel(root=root, scan_root="/tmp/root"))
+
+    assert rendered.count('"name": "d"') == 1200
+    assert " " * (4 * 1200 + 2) + '"children": []' in rendered
+    assert rendered.endswith("\n}")
+
+
+def test_deep_json_export_round_trips_through_from(tmp_path: Path, capsys) -> None:
+    """Exports nested past the recursion limit are read back with `--from`."""
+    root = TreeNode.directory(path=".", name="root", depth=0)
+    parent = root
+    for level in range(1, 1501):
+        child = TreeNode.directory(name="d", depth=level, parent=parent)
+        parent.children.append(child)
+        parent = child
+    rendered = render_json(TreeModel(root=root, scan_root="/tmp/root"))
+    export = tmp_path / "deep.json"
+    export.write_text(rendered, encoding="utf-8")
+
+    assert cli.main(["--from", str(export), "-t", "json"]) == 0
+    assert capsys.readouterr().out == rendered + "\n"
@@ -112,3 +112,22 @@ def test_render_text_emojis_and_details() -> None:
     # readme has no metadata populated, so detail suffix is omitted.
     assert "📄 readme.md" in text
     assert "readme.md (" not in text
+
+
+def _chain_model(depth: int) -> TreeModel:
+    root = TreeNode.directory(path=".", name="root", depth=0)
+    parent = root
+    for level in range(1, depth + 1):
+        child = TreeNode.directory(path=f"{parent.path}/d", name="d", depth=level)
+        parent.children.append(child)
+        parent = child
+    return TreeModel(root=root, scan_root="/tmp/root")
+
+
+def test_render_text_handles_trees_deeper_than_recursion_limit() -> None:
+    """Rendering uses an explicit stack, so depth is not bounded by recursion."""
+    text = render_text(_chain_model(1200), options=TextRenderOptions(color="never"))
+
+    lines = text.splitlines()
+    assert len(lines) == 1201
+    assert lines[-1] == " " * 4 * 1199 + "└── d"
@@ -0,0 +1,141 @@
+"""Tests for the persistent directory listing cache."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import time
+
+import pytest
+
+from path2map import cli
+from path2map.scancache import ScanCache
+from path2map.traversal import TraversalOptions, iter_entries
+
+_HOUR_NS = 3_600_000_000_000
+
+
+def _make_tree(root: Path) -> list[Path]:
+    (root / "src" / "app").mkdir(parents=True)
+    (root / "docs").mkdir()
+    (root / "src" / "app" / "main.py").write_text("x", encoding="utf-8")
+    (root / "docs" / "index.md").write_text("x", encoding="utf-8")
+    (root / "README").write_text("x", encoding="utf-8")
+    directories = [root, root / "src", root / "src" / "app", root / "docs"]
+    _backdate(*directories)
+    return directories
+
+
+def _backdate(*directories: Path) -> None:
+    # Listings read right after a change are not cached; age them past that.
+    past = time.time_ns() - _HOUR_NS
+    for directory in directories:
+        os.utime(directory, ns=(past, past))
+
+
+def _walk(root: Path, cache: ScanCache) -> list[str]:
+    options = TraversalOptions(cache=cache, collect_metadata=True)
+    return [
+        f"{entry.path}:{entry.size}" for entry in iter_entries(root, options=options)
+    ]
+
+
+def test_warm_cache_replays_listings_without_scandir(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Unchanged directories are replayed; file metadata is still read fresh."""
+    root = tmp_path / "tree"
+    directories = _make_tree(root)
+    cache_path = tmp_path / "scan.cache"
+    cold = ScanCache.load(cache_path)
+    expected = _walk(root, cold)
+    cold.save()
+    assert len(cold) == len(directories)
+
+    (root / "README").write_text("longer", encoding="utf-8")
+    monkeypatch.setattr(os, "scandir", None)
+    warm = ScanCache.load(cache_path)
+    replayed = _walk(root, warm)
+
+    assert warm.hits == len(directories)
+    assert replayed == [item.replace("README:1", "README:6") for item in expected]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_warm_cache_stats_each_directory_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+) -> None:
+    """The stat that detects cycles also validates the cached listing."""
+    root = tmp_path / "tree"
+    directories = {str(path) for path in _make_tree(root)}
+    cache_path = tmp_path / "scan.cache"
+    cold = ScanCache.load(cache_path)
+    _walk(root, cold)
+    cold.save()
+
+    real_stat = os.stat
+    stat_calls: list[str] = []
+
+    def recording_stat(path, *args, **kwargs):
+        if str(path) in directories:
+            stat_calls.append(str(path))
+        return real_stat(path, *args, **kwargs)
+
+    warm = ScanCache.load(cache_path)
+    options = TraversalOptions(cache=warm, workers=workers)
+    # The root is resolved and stat'ed up front, before the walk starts.
+    entries = iter_entries(root, options=options)
+    monkeypatch.setattr(os, "stat", recording_stat)
+    list(entries)
+
+    assert warm.hits == len(directories)
+    assert sorted(stat_calls) == sorted(directories - {str(root)})
+
+
+def test_changed_directories_are_rescanned(tmp_path: Path) -> None:
+    """Adding a child invalidates only its directory; recent changes are not kept."""
+    root = tmp_path / "tree"
+    _make_tree(root)
+    cache_path = tmp_path / "scan.cache"
+    cold = ScanCache.load(cache_path)
+    _walk(root, cold)
+    cold.save()
+
+    (root / "src" / "app" / "new.py").write_text("x", encoding="utf-8")
+    warm = ScanCache.load(cache_path)
+    paths = _walk(root, warm)
+
+    assert "src/app/new.py:1" in paths
+    assert (warm.hits, warm.misses) == (3, 1)
+    # `src/app` changed moments ago, so a same-tick change could still follow.
+    assert len(warm) == 3
+
+
+def test_load_rejects_foreign_files_and_discards_outdated_ones(tmp_path: Path) -> None:
+    """Unrelated files are never overwritten; unreadable caches start empty."""
+    foreign = tmp_path / "notes.txt"
+    foreign.write_text("hello", encoding="utf-8")
+    with pytest.raises(ValueError, match="not a path2map scan cache"):
+        ScanCache.load(foreign)
+
+    stale = tmp_path / "scan.cache"
+    stale.write_bytes(b"P2MCACHE\x00garbage")
+    assert ScanCache.load(stale).lookup(os.stat(tmp_path)) is None
+
+
+def test_cli_cache_matches_uncached_output(tmp_path: Path, capsys) -> None:
+    """`--cache` writes the cache file and leaves output unchanged."""
+    root = tmp_path / "tree"
+    _make_tree(root)
+    cache_path = tmp_path / "scan.cache"
+    args = ["--directory", str(root), "-t", "csv", "--details", "size"]
+
+    cli.main(args)
+    expected = capsys.readouterr().out
+    for _ in range(2):
+        assert cli.main([*args, "--cache", str(cache_path)]) == 0
+        assert capsys.readouterr().out == expected
+    assert len(ScanCache.load(cache_path)._previous) == 4
+
+    with pytest.raises(SystemExit):
+        cli.main(["--from", str(tmp_path / "tree.json"), "--cache", str(cache_path)])
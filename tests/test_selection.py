@@ -0,0 +1,73 @@
+"""Tests for the fused ignore and include-filter selection stage."""
+
+from __future__ import annotations
+
+import re
+
+from path2map.filtering import FilterConfig, filter_entries_with_ancestors
+from path2map.ignore import IgnoreMatcher, IgnoreRule, PathEntry
+from path2map.patterns import PatternSet
+from path2map.selection import SelectionStage
+from path2map.traversal import TraversedEntry
+
+
+def _records(paths: list[tuple[str, bool]]) -> list[TraversedEntry]:
+    return [
+        TraversedEntry(
+            path=path,
+            name=path.rsplit("/", 1)[-1],
+            is_dir=is_dir,
+            depth=path.count("/") + 1,
+        )
+        for path, is_dir in paths
+    ]
+
+
+def test_select_matches_list_filter_with_ancestors() -> None:
+    """Streaming selection keeps the same preorder records as list filtering."""
+    records = _records(
+        [
+            ("docs", True),
+            ("docs/guide.md", False),
+            ("src", True),
+            ("src/app", True),
+            ("src/app/main.py", False),
+            ("src/app/util.txt", False),
+            ("src/empty", True),
+            ("src/lib.py", False),
+            ("top.py", False),
+        ]
+    )
+    filters = [r"\.py$", r"^docs$"]
+    stage = SelectionStage(
+        filters=PatternSet(tuple(re.compile(value) for value in filters))
+    )
+
+    expected = filter_entries_with_ancestors(
+        [PathEntry(path=record.path, is_dir=record.is_dir) for record in records],
+        config=FilterConfig(filters=filters),
+    )
+
+    assert [record.path for record in stage.select(records)] == [
+        entry.path for entry in expected
+    ]
+
+
+def test_select_passes_through_without_filters() -> None:
+    """Without include filters, every record is yielded unchanged."""
+    records = _records([("a", True), ("a/b.txt", False)])
+
+    assert list(SelectionStage().select(records)) == records
+
+
+def test_exclude_delegates_to_ignore_matcher() -> None:
+    """`exclude` answers with the configured ignore matcher's decision."""
+    stage = SelectionStage(
+        ignore=IgnoreMatcher(
+            use_default_ignores=False,
+            p2mignore_rules=[IgnoreRule(pattern="*.log")],
+        )
+    )
+
+    assert stage.exclude("build/out.log", False)
+    assert not stage.exclude("build/out.txt", False)
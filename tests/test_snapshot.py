@@ -0,0 +1,174 @@
+"""Tests for binary tree snapshots."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from path2map import cli
+from path2map.columnar import columnar_tree_from_entries
+from path2map.render.json import JsonRenderOptions, render_json
+from path2map.render.text import TextRenderOptions, render_text
+from path2map.snapshot import (
+    iter_snapshot_entries,
+    open_snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+from path2map.traversal import TraversedEntry, tree_from_entries
+
+_ENTRIES = [
+    TraversedEntry("src", "src", True, 1),
+    TraversedEntry("src/main.py", "main.py", False, 2, ".py", size=10, mtime_ns=7),
+    TraversedEntry("src/caf\udce9.txt", "caf\udce9.txt", False, 2, ".txt", size=0),
+    TraversedEntry("link", "link", True, 1, is_symlink=True, symlink_target="src"),
+    TraversedEntry("README", "README", False, 1),
+]
+
+
+def test_snapshot_round_trips_object_and_columnar_trees(tmp_path: Path) -> None:
+    """Reloaded snapshots render exactly like the tree that was saved."""
+    objects = tree_from_entries(scan_root=Path("/p"), entries=_ENTRIES, max_depth=3)
+    columnar = columnar_tree_from_entries(
+        scan_root=Path("/p"), entries=_ENTRIES, max_depth=3
+    )
+    options = JsonRenderOptions(details="size,mtime")
+
+    for model in (objects, columnar):
+        target = tmp_path / "scan.p2m"
+        write_snapshot(model, target)
+        loaded = read_snapshot(target)
+
+        assert render_json(loaded, options=options) == render_json(
+            objects, options=options
+        )
+        assert loaded.max_depth == 3
+        assert loaded.scan_root == objects.scan_root
+        assert loaded.node(4).symlink_target == "src"
+        assert target.stat().st_size < len(render_json(objects, options=options))
+        # Links and depths are not stored; they are rebuilt on load.
+        for name in ("first_children", "next_siblings", "depths"):
+            assert list(getattr(loaded, name)) == list(getattr(columnar, name))
+
+    # A loaded tree stays appendable.
+    loaded.append(parent=1, name="new.py", is_dir=False, ext=".py")
+    assert loaded.path_of(len(loaded) - 1) == "src/new.py"
+    assert loaded.node(1).children[-1].name == "new.py"
+
+
+def test_read_snapshot_rejects_foreign_and_truncated_files(tmp_path: Path) -> None:
+    """Files that are not complete snapshots raise `ValueError`."""
+    foreign = tmp_path / "tree.json"
+    foreign.write_text("{}", encoding="utf-8")
+    with pytest.raises(ValueError, match="not a path2map snapshot"):
+        read_snapshot(foreign)
+
+    target = tmp_path / "scan.p2m"
+    write_snapshot(
+        tree_from_entries(scan_root=Path("/p"), entries=_ENTRIES, max_depth=None),
+        target,
+    )
+    target.write_bytes(target.read_bytes()[:-3])
+    with pytest.raises(ValueError, match="truncated"):
+        read_snapshot(target)
+
+
+def test_cli_save_snapshot_writes_reloadable_tree(tmp_path: Path, capsys) -> None:
+    """`--save-snapshot` stores the rendered scan alongside normal output."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("x", encoding="utf-8")
+    target = tmp_path / "scan.p2m"
+
+    code = cli.main(
+        ["--directory", str(tmp_path / "pkg"), "--save-snapshot", str(target)]
+    )
+    printed = capsys.readouterr().out
+
+    options = TextRenderOptions(color="never")
+    assert code == 0
+    assert render_text(read_snapshot(target), options=options) + "\n" == printed
+
+
+def test_mapped_view_renders_and_finds_paths(tmp_path: Path) -> None:
+    """The memory-mapped view matches the saved tree and resolves paths."""
+    objects = tree_from_entries(scan_root=Path("/p"), entries=_ENTRIES, max_depth=None)
+    target = tmp_path / "scan.p2m"
+    write_snapshot(objects, target)
+    options = JsonRenderOptions(details="size,mtime")
+
+    with open_snapshot(target) as view:
+        assert render_json(view, options=options) == render_json(
+            objects, options=options
+        )
+        found = view.find("src/main.py")
+        assert found is not None and found.size == 10
+        assert view.find("./src/") == view.node(1)
+        assert view.find("src/missing.py") is None
+        assert view.find(".") == view.root
+        columnar = columnar_tree_from_entries(
+            scan_root=Path("/p"), entries=_ENTRIES, max_depth=None
+        )
+        for name in ("first_children", "next_siblings", "depths"):
+            assert list(getattr(view, name)) == list(getattr(columnar, name))
+
+
+def test_snapshot_entries_skip_pruned_subtrees(tmp_path: Path) -> None:
+    """Excluded and undescended directories are skipped without visiting."""
+    target = tmp_path / "scan.p2m"
+    write_snapshot(
+        tree_from_entries(scan_root=Path("/p"), entries=_ENTRIES, max_depth=None),
+        target,
+    )
+    seen: list[str] = []
+
+    def exclude(path: str, is_dir: bool) -> bool:
+        seen.append(path)
+        return path == "src"
+
+    with open_snapshot(target) as view:
+        kept = [entry.path for entry in iter_snapshot_entries(view, exclude=exclude)]
+        shallow = list(iter_snapshot_entries(view, max_depth=1, metadata=False))
+
+    assert kept == ["link", "README"]
+    assert seen == ["src", "link", "README"]
+    assert [entry.path for entry in shallow] == ["src", "link", "README"]
+
+
+def test_snapshot_renumbers_trees_appended_out_of_preorder(tmp_path: Path) -> None:
+    """Trees whose appends broke preorder are renumbered when saved."""
+    tree = columnar_tree_from_entries(
+        scan_root=Path("/p"), entries=_ENTRIES, max_depth=None
+    )
+    tree.append(parent=1, name="late.py", is_dir=False, ext=".py")
+    target = tmp_path / "scan.p2m"
+    write_snapshot(tree, target)
+
+    with open_snapshot(target) as view:
+        assert [node.path for node in view.iter_preorder()] == [
+            node.path for node in tree.iter_preorder()
+        ]
+        assert view.find("src/late.py") == view.node(4)
+
+
+def test_cli_from_snapshot_applies_filters(tmp_path: Path, capsys) -> None:
+    """Rendering a snapshot with filters matches filtering a fresh scan."""
+    root = tmp_path / "pkg"
+    (root / "src").mkdir(parents=True)
+    (root / "docs").mkdir()
+    (root / "src" / "a.py").write_text("x", encoding="utf-8")
+    (root / "src" / "b.txt").write_text("x", encoding="utf-8")
+    (root / "docs" / "c.py").write_text("x", encoding="utf-8")
+    target = tmp_path / "scan.p2m"
+    cli.main(["--directory", str(root), "--save-snapshot", str(target)])
+    capsys.readouterr()
+
+    filters = ["--filter", "^src/.*\\.py$", "-t", "csv"]
+    cli.main(["--directory", str(root), *filters])
+    scanned = capsys.readouterr().out
+    code = cli.main(["--from-snapshot", str(target), *filters])
+    loaded = capsys.readouterr().out
+
+    assert code == 0
+    assert loaded == scanned
+    assert "docs" not in loaded
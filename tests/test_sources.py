@@ -0,0 +1,128 @@
+"""Tests for rebuilding trees from saved path2map outputs."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from path2map import cli
+from path2map.render.csv import CsvRenderOptions, render_csv
+from path2map.render.json import JsonRenderOptions, render_json
+from path2map.snapshot import write_snapshot
+from path2map.sources import detect_source_format, prune_entries, read_export
+from path2map.timefmt import ns_from_datetime
+from path2map.traversal import TraversedEntry, tree_from_entries
+
+_MTIME_NS = ns_from_datetime(datetime(2026, 1, 2, 3, 4))
+_ENTRIES = [
+    TraversedEntry("src", "src", True, 1),
+    TraversedEntry("src/app", "app", True, 2),
+    TraversedEntry("src/app/main.py", "main.py", False, 3, ".py", size=10),
+    TraversedEntry("src/a,b.txt", "a,b.txt", False, 2, ".txt", mtime_ns=_MTIME_NS),
+    TraversedEntry("README", "README", False, 1, size=0),
+]
+
+
+def _write_exports(tmp_path: Path) -> list[Path]:
+    model = tree_from_entries(
+        scan_root=Path("/p/proj"), entries=_ENTRIES, max_depth=None
+    )
+    json_path = tmp_path / "tree.json"
+    json_path.write_text(
+        render_json(model, options=JsonRenderOptions(details="size,mtime")),
+        encoding="utf-8",
+    )
+    csv_path = tmp_path / "tree.csv"
+    csv_path.write_text(
+        render_csv(model, options=CsvRenderOptions(details="size,mtime")),
+        encoding="utf-8",
+    )
+    snapshot_path = tmp_path / "tree.p2m"
+    write_snapshot(model, snapshot_path)
+    return [json_path, csv_path, snapshot_path]
+
+
+def test_exports_round_trip_to_entries(tmp_path: Path) -> None:
+    """JSON and CSV exports yield the records they were rendered from."""
+    json_path, csv_path, snapshot_path = _write_exports(tmp_path)
+
+    assert detect_source_format(json_path) == "json"
+    assert detect_source_format(csv_path) == "csv"
+    assert detect_source_format(snapshot_path) == "snapshot"
+    for path, source_format in ((json_path, "json"), (csv_path, "csv")):
+        root_name, entries = read_export(path, source_format=source_format)
+        assert root_name == "proj"
+        assert list(entries) == _ENTRIES
+        _, bare = read_export(path, source_format=source_format, metadata=False)
+        assert all(e.size is None and e.mtime_ns is None for e in bare)
+
+
+def test_prune_entries_mirrors_walker_pruning() -> None:
+    """Excluded subtrees vanish; depth-limited directories stay unexpanded."""
+    kept = prune_entries(
+        iter(_ENTRIES), max_depth=2, exclude=lambda path, is_dir: path == "README"
+    )
+    assert [entry.path for entry in kept] == ["src", "src/app", "src/a,b.txt"]
+
+    dropped = prune_entries(iter(_ENTRIES), exclude=lambda path, is_dir: path == "src")
+    assert [entry.path for entry in dropped] == ["README"]
+
+
+def test_unrecognized_sources_and_mismatched_time_formats_fail(tmp_path: Path) -> None:
+    """Foreign files and mtimes written with another format raise `ValueError`."""
+    foreign = tmp_path / "notes.txt"
+    foreign.write_text("hello\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="not a path2map snapshot, JSON, or CSV"):
+        detect_source_format(foreign)
+
+    json_path = _write_exports(tmp_path)[0]
+    _, entries = read_export(json_path, source_format="json", time_format="%Y")
+    with pytest.raises(ValueError, match="does not match time format"):
+        list(entries)
+
+
+def test_cli_from_renders_each_source_like_a_scan(tmp_path: Path, capsys) -> None:
+    """`--from` output matches rendering the original scan directly."""
+    root = tmp_path / "proj"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "a.py").write_text("x", encoding="utf-8")
+    (root / "notes.md").write_text("x", encoding="utf-8")
+    saved = tmp_path / "saved"
+    saved.mkdir()
+    for output_type in ("json", "csv"):
+        cli.main(
+            [
+                "--directory",
+                str(root),
+                "-t",
+                output_type,
+                "-o",
+                str(saved / output_type),
+            ]
+        )
+    cli.main(["--directory", str(root), "--save-snapshot", str(saved / "tree.p2m")])
+    capsys.readouterr()
+
+    view = ["-t", "text", "--color", "never", "--filter", "\\.py$"]
+    cli.main(["--directory", str(root), *view])
+    expected = capsys.readouterr().out
+    for source in ("json", "csv", "tree.p2m"):
+        assert cli.main(["--from", str(saved / source), *view]) == 0
+        assert capsys.readouterr().out == expected
+
+
+def test_cli_from_validates_export_records(tmp_path: Path) -> None:
+    """Records whose depth does not follow their parent are rejected."""
+    export = tmp_path / "tree.csv"
+    export.write_text(
+        "path,name,type,ext,depth,size,mtime\n"
+        ".,proj,directory,,0,,\n"
+        "src,src,directory,,1,,\n"
+        "src/a.py,a.py,file,.py,7,,\n",
+        encoding="utf-8",
+    )
+    for extra in ([], ["--columnar"]):
+        with pytest.raises(ValueError, match="depth must follow its parent"):
+            cli.main(["--from", str(export), *extra])
@@ -0,0 +1,50 @@
+"""Tests for nanosecond mtime conversion and memoized formatting."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from path2map.timefmt import (
+    MtimeFormatter,
+    datetime_from_ns,
+    format_mtime,
+    ns_from_datetime,
+)
+
+_BASE = datetime(2026, 1, 2, 3, 4, 5, 678901)
+
+
+def test_ns_conversion_round_trips_microseconds() -> None:
+    """Datetimes survive conversion to nanoseconds and back unchanged."""
+    mtime_ns = ns_from_datetime(_BASE)
+
+    assert mtime_ns % 1000 == 0
+    assert datetime_from_ns(mtime_ns) == _BASE
+    assert datetime_from_ns(mtime_ns + 999) == _BASE
+
+
+def test_memoized_output_matches_strftime() -> None:
+    """Cached text equals direct `strftime` for every supported precision."""
+    base_ns = ns_from_datetime(_BASE)
+    offsets = [0, 1, 999_999_999, 1_000_000_000, 59_000_000_000, 3_600_000_000_123]
+    for time_format in ("%Y-%m-%d %H:%M", "%H:%M:%S", "%c", "%S.%f", "%s", "%%S"):
+        formatter = MtimeFormatter(time_format)
+        for offset in offsets:
+            value = base_ns + offset
+            expected = datetime_from_ns(value).strftime(time_format)
+            assert formatter.format(value) == expected, (time_format, offset)
+            assert format_mtime(value, time_format) == expected
+
+
+def test_formatter_buckets_follow_directive_precision() -> None:
+    """Minute formats share one cache entry; fractional formats skip caching."""
+    base_ns = ns_from_datetime(_BASE.replace(second=0, microsecond=0))
+    minutes = MtimeFormatter("%Y-%m-%d %H:%M")
+    fractions = MtimeFormatter("%H:%M:%S.%f")
+
+    for second in range(60):
+        minutes.format(base_ns + second * 1_000_000_000)
+        fractions.format(base_ns + second * 1_000_000_000)
+
+    assert len(minutes._cache) == 1
+    assert not fractions._cache
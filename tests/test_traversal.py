@@ -2,9 +2,23 @@
 
 from __future__ import annotations
 
+import gc
+import inspect
+import sys
 from pathlib import Path
 
-from path2map.traversal import TraversalOptions, build_tree
+import pytest
+
+from path2map.traversal import (
+    MetadataStats,
+    TraversalOptions,
+    attach_metadata,
+    build_tree,
+    TraversedEntry,
+    enumerate_entries,
+    iter_entries,
+    tree_from_entries,
+)
 
 
 def _all_paths(root) -> list[str]:
@@ -65,6 +79,29 @@ def test_follow_symlinks_cycle_safe(tmp_path: Path) -> None:
     assert loop_node.children == []
 
 
+def test_followed_symlink_children_keep_link_relative_paths(
+    tmp_path: Path,
+) -> None:
+    """Entries under a followed link are reported beneath the link itself."""
+    outside = tmp_path / "outside"
+    (outside / "pkg").mkdir(parents=True)
+    (outside / "pkg" / "mod.py").write_text("x", encoding="utf-8")
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "ext").symlink_to(outside, target_is_directory=True)
+
+    entries = enumerate_entries(root, options=TraversalOptions(symlink_mode="follow"))[
+        1
+    ]
+
+    assert [(entry.path, entry.depth) for entry in entries] == [
+        ("ext", 1),
+        ("ext/pkg", 2),
+        ("ext/pkg/mod.py", 3),
+    ]
+    assert entries[2].ext == ".py"
+
+
 def test_default_order_is_directory_first_then_name(tmp_path: Path) -> None:
     """Traversal ordering is deterministic by default."""
     (tmp_path / "zeta.txt").write_text("x", encoding="utf-8")
@@ -111,3 +148,241 @@ def test_relative_paths_and_depth_are_tracked(tmp_path: Path) -> None:
     file_node = next(child for child in src_node.children if child.name == "main.py")
     assert src_node.depth == 1
     assert file_node.depth == 2
+
+
+def test_exclude_predicate_prunes_directories(
+    tmp_path: Path, scanned_dirs: list[Path]
+) -> None:
+    """Excluded directories are skipped without being scanned."""
+    (tmp_path / "keep").mkdir()
+    (tmp_path / "keep" / "a.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "skip").mkdir()
+    (tmp_path / "skip" / "b.txt").write_text("x", encoding="utf-8")
+
+    model = build_tree(
+        tmp_path,
+        options=TraversalOptions(exclude=lambda path, _is_dir: path == "skip"),
+    )
+
+    assert _all_paths(model.root) == [".", "keep", "keep/a.txt"]
+    assert tmp_path / "skip" not in scanned_dirs
+
+
+def test_threaded_scan_matches_sequential_preorder(tmp_path: Path) -> None:
+    """workers > 1 yields exactly the sequential preorder."""
+    for top in ("a", "B", "c"):
+        for sub in ("x", "Y", "z"):
+            nested = tmp_path / top / sub
+            nested.mkdir(parents=True)
+            (nested / "file.txt").write_text("x", encoding="utf-8")
+        (tmp_path / top / "leaf.md").write_text("x", encoding="utf-8")
+
+    sequential = enumerate_entries(tmp_path)[1]
+    threaded = enumerate_entries(tmp_path, options=TraversalOptions(workers=4))[1]
+
+    assert threaded == sequential
+    assert len(threaded) == 3 + 9 + 9 + 3
+
+
+def test_threaded_scan_asks_each_predicate_once_per_path(tmp_path: Path) -> None:
+    """Prefetching reuses its `exclude` and `descend` verdicts in the walk."""
+    for top in ("a", "b", "skip"):
+        (tmp_path / top / "sub").mkdir(parents=True)
+        (tmp_path / top / "file.txt").write_text("x", encoding="utf-8")
+
+    def run(workers: int) -> tuple[list[str], list[str], list[str]]:
+        excluded: list[str] = []
+        descended: list[str] = []
+
+        def exclude(path: str, _is_dir: bool) -> bool:
+            excluded.append(path)
+            return path == "skip"
+
+        def descend(path: str) -> bool:
+            descended.append(path)
+            return path != "b"
+
+        options = TraversalOptions(exclude=exclude, descend=descend, workers=workers)
+        paths = [entry.path for entry in iter_entries(tmp_path, options=options)]
+        return paths, sorted(excluded), sorted(descended)
+
+    sequential = run(1)
+    assert run(3) == sequential
+    assert sequential[2] == ["a", "a/sub", "b"]
+
+
+def test_threaded_scan_keeps_cycle_detection(tmp_path: Path) -> None:
+    """Symlink cycles are still detected when scanning with worker threads."""
+    real_dir = tmp_path / "dir"
+    (real_dir / "nested").mkdir(parents=True)
+    (real_dir / "nested" / "loop").symlink_to(real_dir, target_is_directory=True)
+
+    options = TraversalOptions(symlink_mode="follow", workers=3)
+    entries = enumerate_entries(tmp_path, options=options)[1]
+
+    loop = next(entry for entry in entries if entry.name == "loop")
+    assert loop.symlink_cycle is True
+    assert [entry.path for entry in entries] == ["dir", "dir/nested", "dir/nested/loop"]
+
+
+def test_iter_entries_scans_lazily(tmp_path: Path, scanned_dirs: list[Path]) -> None:
+    """Directories are only listed once the consumer reaches them."""
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "file.txt").write_text("x", encoding="utf-8")
+
+    entries = iter_entries(tmp_path)
+    assert scanned_dirs == []
+
+    assert next(entries).path == "a"
+    assert tmp_path / "c" not in scanned_dirs
+
+    rest = [entry.path for entry in entries]
+    assert rest == ["a/file.txt", "b", "b/file.txt", "c", "c/file.txt"]
+    assert list(iter_entries(tmp_path)) == enumerate_entries(tmp_path)[1]
+
+
+def test_workers_must_be_positive(tmp_path: Path) -> None:
+    """A worker count below one is rejected."""
+    with pytest.raises(ValueError, match="workers must be >= 1"):
+        enumerate_entries(tmp_path, options=TraversalOptions(workers=0))
+
+
+def test_parallel_metadata_matches_sequential_order(tmp_path: Path) -> None:
+    """Prefetched stat results are attached in the original entry order."""
+    for index in range(40):
+        (tmp_path / f"d{index % 3}").mkdir(exist_ok=True)
+        (tmp_path / f"d{index % 3}" / f"f{index:02d}.txt").write_text(
+            "x" * index, encoding="utf-8"
+        )
+    entries = list(iter_entries(tmp_path))
+    stats = MetadataStats()
+
+    sequential = list(attach_metadata(tmp_path, entries))
+    prefetched = list(attach_metadata(tmp_path, entries, workers=4, stats=stats))
+
+    assert prefetched == sequential
+    assert all(
+        entry.size == int(entry.name[1:3]) for entry in prefetched if not entry.is_dir
+    )
+    assert stats.files == 40
+    assert stats.saved_seconds >= 0.0
+
+
+def test_metadata_workers_must_be_positive(tmp_path: Path) -> None:
+    """A stat worker count below one is rejected eagerly."""
+    with pytest.raises(ValueError, match="workers must be >= 1"):
+        attach_metadata(tmp_path, [], workers=0)
+
+
+def test_process_shards_match_sequential_preorder(tmp_path: Path) -> None:
+    """Process-sharded enumeration stitches shards back into preorder."""
+    for top in ("a", "b"):
+        for sub in ("x", "y", "z"):
+            nested = tmp_path / top / sub / "deep"
+            nested.mkdir(parents=True)
+            (nested / "file.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "root.txt").write_text("x", encoding="utf-8")
+    (tmp_path / "a" / "link").symlink_to(tmp_path / "a", target_is_directory=True)
+
+    for mode in ("show", "follow"):
+        sequential = enumerate_entries(
+            tmp_path, options=TraversalOptions(symlink_mode=mode)
+        )[1]
+        sharded = enumerate_entries(
+            tmp_path,
+            options=TraversalOptions(
+                symlink_mode=mode, workers=2, worker_mode="process"
+            ),
+        )[1]
+
+        assert sharded == sequential
+
+
+def test_traversal_handles_trees_deeper_than_recursion_limit(tmp_path: Path) -> None:
+    """The walker keeps an explicit stack instead of recursing per level."""
+    depth = 300
+    chain = tmp_path.joinpath(*(["d"] * depth))
+    chain.mkdir(parents=True)
+
+    original_limit = sys.getrecursionlimit()
+    # Leave headroom for the current call stack but not for one frame per level.
+    sys.setrecursionlimit(len(inspect.stack()) + 100)
+    try:
+        entries = enumerate_entries(tmp_path)[1]
+    finally:
+        sys.setrecursionlimit(original_limit)
+
+    assert len(entries) == depth
+    assert entries[-1].depth == depth
+
+
+def test_tree_from_entries_links_parents_and_shares_strings() -> None:
+    """Built nodes derive paths from parents and share repeated names."""
+
+    def _fresh(text: str) -> str:
+        # A distinct string object per entry, as traversal would produce.
+        return "".join(list(text))
+
+    entries = [
+        TraversedEntry("a", "a", True, 1),
+        TraversedEntry("a/__init__.py", _fresh("__init__.py"), False, 2, _fresh(".py")),
+        TraversedEntry("b", "b", True, 1),
+        TraversedEntry("b/__init__.py", _fresh("__init__.py"), False, 2, _fresh(".py")),
+        TraversedEntry("missing/x.py", "x.py", False, 2, ".py"),
+    ]
+
+    model = tree_from_entries(scan_root=Path("/p"), entries=entries, max_depth=None)
+    first, second = (child.children[0] for child in model.root.children)
+
+    assert [node.path for node in model.iter_preorder()] == [
+        ".",
+        "a",
+        "a/__init__.py",
+        "b",
+        "b/__init__.py",
+    ]
+    assert first.parent is model.root.children[0]
+    assert first.name is second.name
+    assert first.ext is second.ext
+
+
+def test_trusted_tree_matches_validated_tree() -> None:
+    """The unchecked builder produces the same tree as the validating one."""
+    entries = [
+        TraversedEntry("a", "a", True, 1, is_symlink=True, symlink_target="b"),
+        TraversedEntry("a/x.py", "x.py", False, 2, ".py", size=3, mtime_ns=7),
+        TraversedEntry("b", "b", True, 1),
+        TraversedEntry("missing/y.py", "y.py", False, 2, ".py"),
+        TraversedEntry("z.txt", "z.txt", False, 1, ".txt"),
+    ]
+
+    trusted = tree_from_entries(scan_root=Path("/p"), entries=entries, max_depth=2)
+    validated = tree_from_entries(
+        scan_root=Path("/p"), entries=entries, max_depth=2, validate=True
+    )
+
+    assert trusted == validated
+    assert gc.isenabled()
+    assert [node.path for node in trusted.iter_preorder()] == [
+        ".",
+        "a",
+        "a/x.py",
+        "b",
+        "z.txt",
+    ]
+    with pytest.raises(ValueError, match="file nodes cannot contain children"):
+        trusted.root.children[2].children.append(trusted.root)
+
+
+def test_validated_tree_rejects_inconsistent_depths() -> None:
+    """Validation mode reports entries whose depth skips a level."""
+    entries = [
+        TraversedEntry("a", "a", True, 1),
+        TraversedEntry("a/x.py", "x.py", False, 3, ".py"),
+    ]
+
+    with pytest.raises(ValueError, match="entry depth must follow its parent"):
+        tree_from_entries(
+            scan_root=Path("/p"), entries=entries, max_depth=None, validate=True
+        )
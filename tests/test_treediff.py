@@ -0,0 +1,174 @@
+"""Tests for Merkle tree diffs and their renderers."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from path2map import cli
+from path2map.columnar import columnar_tree_from_entries
+from path2map.render.diff import (
+    DiffRenderOptions,
+    render_diff_csv,
+    render_diff_json,
+    render_diff_text,
+)
+from path2map.traversal import TraversedEntry, tree_from_entries
+from path2map.treediff import DiffStats, TreeChange, diff_trees
+
+_OLD = [
+    TraversedEntry("docs", "docs", True, 1),
+    TraversedEntry("docs/guide.md", "guide.md", False, 2, ".md", size=5),
+    TraversedEntry("src", "src", True, 1),
+    TraversedEntry("src/main.py", "main.py", False, 2, ".py", size=10),
+    TraversedEntry("src/old.py", "old.py", False, 2, ".py", size=1),
+    TraversedEntry("build", "build", False, 1, size=0),
+]
+_NEW = [
+    TraversedEntry("docs", "docs", True, 1),
+    TraversedEntry("docs/guide.md", "guide.md", False, 2, ".md", size=5),
+    TraversedEntry("src", "src", True, 1),
+    TraversedEntry("src/main.py", "main.py", False, 2, ".py", size=12),
+    TraversedEntry("src/new.py", "new.py", False, 2, ".py", size=3),
+    TraversedEntry("build", "build", True, 1),
+    TraversedEntry("build/out.o", "out.o", False, 2, ".o", size=7),
+]
+
+
+def test_diff_reports_changes_and_skips_identical_subtrees() -> None:
+    """Only differing subtrees are descended; type changes replace the entry."""
+    old = tree_from_entries(scan_root=Path("/a/v1"), entries=_OLD, max_depth=None)
+    new = columnar_tree_from_entries(
+        scan_root=Path("/b/v2"), entries=_NEW, max_depth=None
+    )
+    stats = DiffStats()
+
+    changes = diff_trees(old, new, details="size", stats=stats)
+
+    assert changes == [
+        TreeChange("removed", "build", "file", old_size=0),
+        TreeChange("added", "build", "directory"),
+        TreeChange("added", "build/out.o", "file", new_size=7),
+        TreeChange("modified", "src/main.py", "file", old_size=10, new_size=12),
+        TreeChange("added", "src/new.py", "file", new_size=3),
+        TreeChange("removed", "src/old.py", "file", old_size=1),
+    ]
+    # root, build, docs (identical, not descended), src, src/main.py
+    assert stats.compared == 5
+    assert [change.path for change in diff_trees(old, new)] == [
+        "build",
+        "build",
+        "build/out.o",
+        "src/new.py",
+        "src/old.py",
+    ]
+    assert diff_trees(old, old, details="size,mtime") == []
+
+
+def test_diff_renderers_emit_text_json_and_csv() -> None:
+    """Each format lists the changes with the selected details."""
+    changes = [
+        TreeChange("added", "src", "directory"),
+        TreeChange("modified", "a.py", "file", old_size=10, new_size=2048),
+        TreeChange("removed", "b,c.txt", "file", old_size=1),
+    ]
+    options = DiffRenderOptions(details="size")
+
+    assert render_diff_text(changes, options=options) == (
+        "+ src/\n"
+        "~ a.py (size 10 B -> 2.0 KiB)\n"
+        "- b,c.txt\n"
+        "1 added, 1 removed, 1 modified"
+    )
+    document = json.loads(render_diff_json(changes, options=options))
+    assert document["summary"] == {"added": 1, "removed": 1, "modified": 1}
+    assert document["changes"][1] == {
+        "change": "modified",
+        "path": "a.py",
+        "type": "file",
+        "old_size": 10,
+        "new_size": 2048,
+    }
+    assert render_diff_csv(changes, options=options).splitlines() == [
+        "change,path,type,old_size,new_size,old_mtime,new_mtime",
+        "added,src,directory,,,,",
+        "modified,a.py,file,10,2048,,",
+        'removed,"b,c.txt",file,1,,,',
+    ]
+
+
+def test_cli_diff_compares_directories_and_snapshots(tmp_path: Path, capsys) -> None:
+    """`path2map diff` accepts scans and saved trees in any combination."""
+    root = tmp_path / "proj"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "a.py").write_text("x", encoding="utf-8")
+    snapshot = tmp_path / "before.p2m"
+    cli.main(["--directory", str(root), "--save-snapshot", str(snapshot)])
+    capsys.readouterr()
+
+    assert cli.main(["diff", str(snapshot), str(root), "--exit-code"]) == 0
+    assert capsys.readouterr().out == "0 added, 0 removed, 0 modified\n"
+
+    (root / "src" / "b.py").write_text("x", encoding="utf-8")
+    (root / "src" / "a.py").unlink()
+    assert cli.main(["diff", str(snapshot), str(root), "--exit-code"]) == 1
+    assert capsys.readouterr().out == (
+        "- src/a.py\n+ src/b.py\n1 added, 1 removed, 0 modified\n"
+    )
+
+    with pytest.raises(SystemExit):
+        cli.main(["diff", str(snapshot), str(tmp_path / "missing")])
+
+
+def test_cli_diff_ignores_working_directory_p2mignore_for_exports(
+    tmp_path: Path, capsys, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Exports are compared without the current directory's `.p2mignore`."""
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "a.py").write_text("x", encoding="utf-8")
+    before = tmp_path / "before.json"
+    cli.main(["--directory", str(root), "-t", "json", "-o", str(before)])
+    (root / "b.py").write_text("x", encoding="utf-8")
+    after = tmp_path / "after.json"
+    cli.main(["--directory", str(root), "-t", "json", "-o", str(after)])
+    capsys.readouterr()
+
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    (elsewhere / ".p2mignore").write_text("*.py\n", encoding="utf-8")
+    monkeypatch.chdir(elsewhere)
+
+    assert cli.main(["diff", str(before), str(after)]) == 0
+    assert capsys.readouterr().out == "+ b.py\n1 added, 0 removed, 0 modified\n"
+
+
+def test_cli_diff_export_against_its_unchanged_source(tmp_path: Path, capsys) -> None:
+    """Exports lack symlink markers and sub-minute mtimes; neither is a change."""
+    root = tmp_path / "proj"
+    (root / "dir").mkdir(parents=True)
+    (root / "dir" / "file.txt").write_text("x", encoding="utf-8")
+    (root / "linkdir").symlink_to(root / "dir", target_is_directory=True)
+    (root / "linkfile").symlink_to(root / "dir" / "file.txt")
+    (root / "dir" / "loop").symlink_to(root, target_is_directory=True)
+    snapshot = tmp_path / "scan.p2m"
+    details = ["--details", "size,mtime"]
+    cli.main(["--directory", str(root), *details, "--save-snapshot", str(snapshot)])
+    for output_type in ("json", "csv"):
+        cli.main(
+            ["--directory", str(root), *details, "-t", output_type]
+            + ["-o", str(tmp_path / f"scan.{output_type}")]
+        )
+    capsys.readouterr()
+
+    for export in ("scan.json", "scan.csv"):
+        for other in (root, snapshot):
+            argv = ["diff", str(tmp_path / export), str(other), *details]
+            assert cli.main([*argv, "--exit-code"]) == 0
+            assert capsys.readouterr().out == "0 added, 0 removed, 0 modified\n"
+
+    (root / "dir" / "file.txt").write_text("longer", encoding="utf-8")
+    assert cli.main(["diff", str(tmp_path / "scan.json"), str(root), *details]) == 0
+    assert capsys.readouterr().out.startswith("~ dir/file.txt (size 1 B -> 6 B")